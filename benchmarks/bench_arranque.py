@@ -0,0 +1,49 @@
+# Tiempo de arranque: desde que se lanza el proceso hasta que aparece la primera
+# línea de show, para un programa trivial. Es lo que domina cuando se ejecutan
+# miles de scripts cortos. Se mide sin caché (hay que analizar el programa) y
+# con la caché de programas analizados ya cargada (no se importa PLY).
+#
+#   python benchmarks/bench_arranque.py
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 20
+
+# Como en un uso normal, los módulos se compilan una vez y quedan en __pycache__
+ENVIRONMENT = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+
+
+def first_line_time(command):
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, cwd=ROOT, env=ENVIRONMENT)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return elapsed
+
+
+def measure(command):
+    # La primera ejecución escribe la caché de programas y los .pyc: no se cuenta
+    first_line_time(command)
+    times = [first_line_time(command) for _ in range(REPEATS)]
+    return min(times), statistics.median(times)
+
+
+with tempfile.TemporaryDirectory() as directory:
+    script = os.path.join(directory, 'hola.txt')
+    with open(script, 'w', encoding='utf-8') as file:
+        file.write('show("hola");\n')
+    cases = {
+        'python vacío': [sys.executable, '-c', 'print("hola")'],
+        'sin caché': [sys.executable, 'main.py', script, '--no-cache'],
+        'con caché': [sys.executable, 'main.py', script],
+    }
+    for name, command in cases.items():
+        best, median = measure(command)
+        print(f"{name:<13} mínimo {best * 1000:6.1f} ms  mediana {median * 1000:6.1f} ms")
@@ -0,0 +1,49 @@
+# Ejecuta cientos de programas independientes a la vez en un pool de hilos, cada
+# uno con su propio Interpreter, y verifica que las salidas no se mezclen.
+#
+#   python benchmarks/bench_concurrencia.py [PROGRAMAS] [HILOS]
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+PROGRAMS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+THREADS = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+
+def source(job):
+    # Cada programa usa los mismos nombres de variables y funciones con otros valores
+    return f"""
+mission escala(a) {{
+    answer a * {job};
+}}
+total = 0;
+for (i=0; i<200; i=i+1;) {{
+    total = total + escala(i);
+}}
+input(nombre);
+show(nombre, total);
+"""
+
+
+def run(job):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, input=io.StringIO(f"job{job}\n"))
+    interpreter.execute(source(job), 'vm' if job % 2 else 'tree')
+    return output.getvalue()
+
+
+start = time.perf_counter()
+with ThreadPoolExecutor(THREADS) as pool:
+    outputs = list(pool.map(run, range(PROGRAMS)))
+elapsed = time.perf_counter() - start
+
+for job, output in enumerate(outputs):
+    expected = f"job{job} {19900 * job}\n"
+    assert output == expected, f"salida inesperada en el programa {job}: {output!r}"
+print(f"{PROGRAMS} programas en {THREADS} hilos: {elapsed:.3f}s, sin salidas mezcladas")
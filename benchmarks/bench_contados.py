@@ -0,0 +1,49 @@
+# Bucles contados: for (i = 0; i < N; i = i + 1) con N = 10 millones, como
+# ForLoop (condición y actualización evaluadas como nodos en cada vuelta) y
+# como el CountedLoop que arma el optimizador (la variable recorre un range).
+# Los dos programas son el mismo árbol optimizado; en el primero el bucle
+# vuelve a ser un ForLoop.
+#
+#   python benchmarks/bench_contados.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from parser import CountedLoop, ForLoop, walk
+
+N = 10000000
+
+CODE = f"""
+suma = 0;
+for (i = 0; i < {N}; i = i + 1;) {{
+    suma = suma + i;
+}}
+show(suma, i);
+"""
+
+
+def run(engine, counted):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    program = interpreter.parse(CODE)
+    loops = [node for statement in program.statements for node in walk(statement)
+             if isinstance(node, CountedLoop)]
+    assert loops, "El optimizador no armó el bucle contado"
+    if not counted:
+        for loop in loops:
+            loop.__class__ = ForLoop
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    return time.perf_counter() - start, output.getvalue()
+
+
+for engine in ('tree', 'vm', 'py'):
+    loop_time, loop_output = run(engine, counted=False)
+    counted_time, counted_output = run(engine, counted=True)
+    assert loop_output == counted_output, "Las salidas no coinciden"
+    print(f"{N} vueltas  {engine:<4} ForLoop {loop_time:.2f}s  CountedLoop {counted_time:.2f}s  "
+          f"x{loop_time / counted_time:.1f}")
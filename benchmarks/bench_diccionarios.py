@@ -0,0 +1,69 @@
+# Diccionarios: buscar N claves de texto entre N pares (clave, valor). Con dos
+# listas paralelas cada búsqueda recorre las claves con pick hasta encontrarla
+# (N*N/2 comparaciones); con un diccionario cada búsqueda es un pick en la tabla
+# hash.
+#
+#   python benchmarks/bench_diccionarios.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from vectores import numeric_list
+
+N = 600
+
+PROGRAMS = {
+    'listas': """
+suma = 0;
+j = 0;
+while (j < n) {
+    buscada = pedidas.pick(j);
+    i = 0;
+    while (claves.pick(i) != buscada) { i = i + 1; }
+    suma = suma + valores.pick(i);
+    j = j + 1;
+}
+show(suma);
+""",
+    'diccionario': """
+suma = 0;
+j = 0;
+while (j < n) {
+    suma = suma + tabla.pick(pedidas.pick(j));
+    j = j + 1;
+}
+show(suma);
+""",
+}
+
+
+def run(code, engine):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    times = []
+    for _ in range(3):
+        output = io.StringIO()
+        interpreter = Interpreter(output=output)
+        # Los datos se cargan desde Python: armarlos con insert mediría el bucle
+        keys = [f"clave{i}" for i in range(N)]
+        interpreter.variables['n'] = N
+        interpreter.variables['claves'] = numeric_list(keys)
+        interpreter.variables['valores'] = numeric_list(list(range(N)))
+        interpreter.variables['pedidas'] = numeric_list(keys[::-1])
+        interpreter.variables['tabla'] = dict(zip(keys, range(N)))
+        program = interpreter.parse(code)
+        start = time.perf_counter()
+        interpreter.run(program, engine)
+        times.append(time.perf_counter() - start)
+    return min(times), output.getvalue()
+
+
+for engine in ('tree', 'vm', 'py'):
+    scan_time, scan_output = run(PROGRAMS['listas'], engine)
+    table_time, table_output = run(PROGRAMS['diccionario'], engine)
+    assert scan_output == table_output, "Las salidas no coinciden"
+    print(f"{N} claves  {engine:<4} listas {scan_time:.3f}s  diccionario {table_time:.4f}s  "
+          f"x{scan_time / table_time:.0f}")
@@ -0,0 +1,49 @@
+# Costo de llamar una función en un bucle según cuántas globales estén vivas.
+# Con frames el costo por llamada depende de los parámetros, no de las globales.
+#
+#   python benchmarks/bench_frames.py [LLAMADAS]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+def program(globals_count, calls):
+    setup = ''.join(f"g{i} = {i};\n" for i in range(globals_count))
+    loop = f"""
+mission suma(a, b) {{
+    answer a + b;
+}}
+total = 0;
+for (i=0; i<{calls}; i=i+1;) {{
+    total = suma(total, i);
+}}
+show(total);
+"""
+    return setup + (loop if calls else '')
+
+
+def run(code, engine, repeat=3):
+    program_ = Interpreter().parse(code)
+    best = None
+    for _ in range(repeat):
+        interpreter = Interpreter(output=io.StringIO())
+        start = time.perf_counter()
+        interpreter.run(program_, engine)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+for engine in ('tree', 'vm'):
+    for globals_count in (10, 10000):
+        # Se descuenta el tiempo de crear las globales para medir solo las llamadas
+        elapsed = run(program(globals_count, CALLS), engine) - run(program(globals_count, 0), engine)
+        print(f"{engine:<5} {globals_count:>6} globales  {CALLS} llamadas  "
+              f"{elapsed:.3f}s  ({elapsed / CALLS * 1e6:.2f} us/llamada)")
@@ -0,0 +1,77 @@
+# Lexer: tokens por segundo del lexer de PLY (una función de regla por ID,
+# NUMBER, STRING y salto de línea) y de FastLexer (una expresión regular
+# recorrida con finditer) sobre fuentes de varios megabytes, y el análisis
+# completo con cada uno. Verifica además que los dos den los mismos tokens.
+#
+#   python benchmarks/bench_lexer.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexico import get_lexer, get_ply_lexer
+from parser import parse
+
+SIZES = (1, 4)  # megabytes
+
+BLOCK = """// función {k}
+mission f{k}(a, b) {{
+    c = a * {k} + b-1;
+    if (c >= {k} && c != 0) {{ c = c - {k}; }} else {{ c = c + 1.5; }}
+    nombre = "valor {k}";
+    l = [1, 2, {k}];
+    answer c;
+}}
+x{k} = f{k}({k}, {k}) + l.size();
+"""
+
+
+def source(megabytes):
+    blocks = []
+    total = 0
+    k = 0
+    while total < megabytes * 1024 * 1024:
+        block = BLOCK.format(k=k)
+        blocks.append(block)
+        total += len(block)
+        k += 1
+    return ''.join(blocks)
+
+
+def tokens(lexer, code):
+    lexer = lexer.clone()
+    lexer.output = io.StringIO()
+    lexer.lineno = 1
+    lexer.input(code)
+    return [(token.type, token.value, token.lineno) for token in iter(lexer.token, None)]
+
+
+def best(function, *args):
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def full_parse(lexer, code):
+    lexer = lexer.clone()
+    lexer.output = io.StringIO()
+    return parse(code, lexer)
+
+
+for megabytes in SIZES:
+    code = source(megabytes)
+    ply_time, ply_tokens = best(tokens, get_ply_lexer(), code)
+    fast_time, fast_tokens = best(tokens, get_lexer(), code)
+    assert ply_tokens == fast_tokens, "Los lexers no dan los mismos tokens"
+    count = len(fast_tokens)
+    print(f"{megabytes} MB, {count} tokens  lex: PLY {ply_time:.2f}s ({count / ply_time / 1e6:.2f} M tokens/s)  "
+          f"FastLexer {fast_time:.2f}s ({count / fast_time / 1e6:.2f} M tokens/s)  x{ply_time / fast_time:.1f}")
+    ply_parse, _ = best(full_parse, get_ply_lexer(), code)
+    fast_parse, _ = best(full_parse, get_lexer(), code)
+    print(f"{'':>{len(str(megabytes)) + len(str(count)) + 12}}análisis completo: PLY {ply_parse:.2f}s  "
+          f"FastLexer {fast_parse:.2f}s  x{ply_parse / fast_parse:.2f}")
@@ -0,0 +1,60 @@
+# Memoización automática de funciones puras: fib y combinatoria recursivos, que
+# repiten argumentos, y una función barata llamada siempre con argumentos
+# distintos, donde la caché se desactiva sola después de unos fallos.
+#
+#   python benchmarks/bench_memo.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+PROGRAMS = {
+    'fib(24)': """
+mission fib(n) {
+    if (n < 2) { answer n; }
+    answer fib(n - 1) + fib(n - 2);
+}
+show(fib(24));
+""",
+    'comb(20, 10)': """
+mission comb(n, k) {
+    if (k == 0) { answer 1; }
+    if (k == n) { answer 1; }
+    answer comb(n - 1, k - 1) + comb(n - 1, k);
+}
+show(comb(20, 10));
+""",
+    'sin repetidos': """
+mission duplicar(a) { answer 2 * a; }
+suma = 0;
+for (i = 0; i < 50000; i = i + 1;) {
+    suma = suma + duplicar(i);
+}
+show(suma);
+""",
+}
+
+
+def run(code, engine, memoize):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, memoize=memoize)
+    program = interpreter.parse(code)
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    elapsed = time.perf_counter() - start
+    hits = sum(stats[0] for stats in interpreter.memo_stats().values())
+    misses = sum(stats[1] for stats in interpreter.memo_stats().values())
+    return elapsed, output.getvalue(), hits, misses
+
+
+for name, code in PROGRAMS.items():
+    for engine in ('tree', 'vm', 'py'):
+        plain_time, plain_output, _, _ = run(code, engine, False)
+        memo_time, memo_output, hits, misses = run(code, engine, True)
+        assert plain_output == memo_output, f"Las salidas de '{name}' no coinciden"
+        print(f"{name:<14} {engine:<4} sin memo {plain_time:.3f}s  con memo {memo_time:.4f}s  "
+              f"x{plain_time / memo_time:.1f}  ({hits} aciertos, {misses} fallos)")
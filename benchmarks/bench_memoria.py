@@ -0,0 +1,140 @@
+# Memoria de un programa de 1 millón de nodos (el programa generado de
+# regresion.py), como árbol de objetos y como árbol plano (plano.py). Cada
+# medición corre en un proceso aparte, para que el máximo de RSS sea solo suyo:
+#
+#   arbol          analizar y quedarse con el árbol
+#   carga-arbol    leer el árbol de objetos guardado con pickle (como la caché)
+#   carga-plano    leer el árbol plano guardado con pickle
+#   plano-objetos  leer el árbol plano y armar los objetos para ejecutarlo
+#
+# Se informa el máximo de RSS y lo que queda ocupado al final, los dos sin contar
+# lo que ocupa el proceso antes de empezar (Python y los módulos del intérprete).
+# Lo que se libera no siempre vuelve al sistema operativo: el RSS al final puede
+# incluir memoria que el proceso ya no usa.
+#
+#   python benchmarks/bench_memoria.py
+#   python benchmarks/bench_memoria.py --compare ../otra-copia   # 'arbol' con otro código
+import argparse
+import gc
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NODES = 1000000
+MODES = ('arbol', 'carga-arbol', 'carga-plano', 'plano-objetos')
+
+
+def rss(field):
+    # En KB. VmHWM es el máximo de este proceso (ru_maxrss conserva el del proceso
+    # padre después de exec)
+    with open('/proc/self/status') as file:
+        for line in file:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def current_rss():
+    return rss('VmRSS')
+
+
+def peak_rss():
+    return rss('VmHWM')
+
+
+def count_nodes(program):
+    from parser import walk
+    roots = list(program.statements) + list(program.functions.values())
+    return sum(1 for root in roots for _ in walk(root))
+
+
+def program_code(root):
+    sys.path.insert(0, os.path.join(root, 'benchmarks'))
+    from regresion import generated_program
+    # Unos 36 nodos por función generada
+    return generated_program(NODES // 36)
+
+
+def measure(mode, root, directory):
+    # Corre en el proceso hijo: devuelve las mediciones de un modo
+    sys.path.insert(0, root)
+    from parser import get_parser, parse
+    code = program_code(root)
+    if mode != 'arbol':
+        import plano  # noqa: F401  (que el import no cuente en la medición)
+    get_parser()
+    gc.collect()
+    base = current_rss()
+    start = time.perf_counter()
+    if mode == 'arbol':
+        result = parse(code)
+        nodes = count_nodes(result)
+    else:
+        name = 'arbol.pickle' if mode == 'carga-arbol' else 'plano.pickle'
+        with open(os.path.join(directory, name), 'rb') as file:
+            result = pickle.load(file)
+        if mode == 'plano-objetos':
+            result = result.program()
+        nodes = len(result) if mode == 'carga-plano' else count_nodes(result)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    return {'nodes': nodes, 'seconds': elapsed, 'peak': peak_rss() - base, 'retained': current_rss() - base}
+
+
+def prepare(directory):
+    # Guarda el árbol de objetos y el plano para los modos que los leen
+    sys.path.insert(0, ROOT)
+    from parser import parse
+    from plano import FlatTree
+    program = parse(program_code(ROOT))
+    with open(os.path.join(directory, 'arbol.pickle'), 'wb') as file:
+        pickle.dump(program, file, protocol=pickle.HIGHEST_PROTOCOL)
+    start = time.perf_counter()
+    flat = FlatTree(program)
+    elapsed = time.perf_counter() - start
+    with open(os.path.join(directory, 'plano.pickle'), 'wb') as file:
+        pickle.dump(flat, file, protocol=pickle.HIGHEST_PROTOCOL)
+    return elapsed
+
+
+def child(mode, root, directory):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode,
+                             '--root', root, '--directory', directory],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Memoria de un programa de 1 millón de nodos')
+    arguments.add_argument('--compare', metavar='DIRECTORIO',
+                           help="medir también el modo 'arbol' con el código de otra copia del repositorio")
+    arguments.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    arguments.add_argument('--root', default=ROOT, help=argparse.SUPPRESS)
+    arguments.add_argument('--directory', help=argparse.SUPPRESS)
+    args = arguments.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.root, args.directory)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"aplanar el árbol: {prepare(directory):.2f}s")
+        rows = [(mode, child(mode, ROOT, directory)) for mode in MODES]
+        if args.compare:
+            rows.append((f"arbol ({args.compare})", child('arbol', os.path.abspath(args.compare), directory)))
+        for name in ('arbol.pickle', 'plano.pickle'):
+            print(f"{name:<14} {os.path.getsize(os.path.join(directory, name)) // 1024 // 1024} MB en disco")
+    print(f"{'':<16} {'nodos':>9} {'tiempo':>8} {'RSS máximo':>11} {'RSS al final':>13} {'por nodo':>9}")
+    for name, row in rows:
+        print(f"{name:<16} {row['nodes']:>9} {row['seconds']:>7.2f}s {row['peak'] // 1024:>8} MB "
+              f"{row['retained'] // 1024:>10} MB {row['retained'] * 1024 / row['nodes']:>7.0f} B")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# import de una biblioteca de 500 funciones: lo que cuesta la primera vez que
+# se analiza, cuando otro proceso ya la guardó en __cache__ (sin MODULES) y
+# cuando ya está en la caché del proceso. Compara con pegar la biblioteca en el
+# programa, que la vuelve a analizar cada vez. Sin optimizar: solo se mide
+# cargar las funciones.
+#
+#   python benchmarks/bench_modulos.py
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import modulos
+from interprete import Interpreter
+
+FUNCTIONS = 500
+
+LIBRARY = ''.join(f"""
+mission f{k}(x, y) {{
+    total = 0;
+    i = 0;
+    while (i < y) {{
+        if (i % 2 == 0) {{ total = total + x * i; }} else {{ total = total - {k}; }}
+        i = i + 1;
+    }}
+    answer total;
+}}
+""" for k in range(FUNCTIONS))
+
+PROGRAM = 'show(f7(2, 10));\n'
+
+
+def measure(code, directory, prepare=None):
+    # El mejor de cinco, para que el ruido no tape diferencias chicas
+    times = []
+    for _ in range(5):
+        if prepare is not None:
+            prepare()
+        interpreter = Interpreter(output=io.StringIO(), optimize=False)
+        start = time.perf_counter()
+        program = interpreter.parse(code, directory)
+        times.append(time.perf_counter() - start)
+        assert len(program.functions) == FUNCTIONS
+    return min(times)
+
+
+def forget():
+    # Otro proceso: nada en MODULES, la biblioteca en __cache__
+    modulos.MODULES.clear()
+
+
+def cold():
+    forget()
+    shutil.rmtree(os.path.join(directory, '__cache__'), ignore_errors=True)
+
+
+directory = tempfile.mkdtemp()
+try:
+    with open(os.path.join(directory, 'biblioteca.txt'), 'w', encoding='utf-8') as file:
+        file.write(LIBRARY)
+    importing = 'import "biblioteca.txt";\n' + PROGRAM
+    pasted = measure(LIBRARY + PROGRAM, directory)
+    first = measure(importing, directory, cold)
+    disk = measure(importing, directory, forget)
+    process = measure(importing, directory)
+    print(f"{FUNCTIONS} funciones")
+    print(f"pegadas en el programa    {pasted * 1000:8.2f} ms")
+    print(f"import, primera vez       {first * 1000:8.2f} ms")
+    print(f"import, desde __cache__   {disk * 1000:8.2f} ms  x{pasted / disk:.1f}")
+    print(f"import, ya en el proceso  {process * 1000:8.2f} ms  x{pasted / process:.1f}")
+finally:
+    shutil.rmtree(directory)
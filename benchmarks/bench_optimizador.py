@@ -0,0 +1,73 @@
+# Compara cada motor con y sin el optimizador del árbol sobre bucles con
+# constantes, ramas muertas, menos unario e invariantes.
+#
+#   python benchmarks/bench_optimizador.py [N]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+PROGRAMS = {
+    'constantes': f"""
+suma = 0;
+for (i=0; i<{N}; i=i+1;) {{
+    suma = suma + 2 * 3 + 1 - 60 / 10;
+}}
+show(suma);
+""",
+    'if(true)': f"""
+suma = 0;
+for (i=0; i<{N}; i=i+1;) {{
+    if (true) {{ suma = suma + i; }} else {{ suma = suma - i; }}
+    if (1 > 2) {{ suma = 0; }}
+}}
+show(suma);
+""",
+    'menos unario': f"""
+suma = 0;
+for (i=0; i<{N}; i=i+1;) {{
+    suma = suma + -i;
+}}
+show(suma);
+""",
+    'invariantes': f"""
+a = 3;
+b = 7;
+l = [1, 2, 3, 4];
+suma = 0;
+i = 0;
+while (i < (l.size() * {N // 4})) {{
+    suma = suma + a * b - a;
+    i = i + 1;
+}}
+show(suma);
+""",
+}
+
+
+def run(code, engine, optimize):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    times = []
+    for _ in range(3):
+        output = io.StringIO()
+        interpreter = Interpreter(output=output, optimize=optimize)
+        program = interpreter.parse(code)
+        start = time.perf_counter()
+        interpreter.run(program, engine)
+        times.append(time.perf_counter() - start)
+    return min(times), output.getvalue()
+
+
+for name, code in PROGRAMS.items():
+    for engine in ('tree', 'vm', 'py'):
+        plain_time, plain_output = run(code, engine, False)
+        optimized_time, optimized_output = run(code, engine, True)
+        assert plain_output == optimized_output, f"Las salidas de '{name}' no coinciden"
+        print(f"{name:<13} {engine:<4} sin optimizar {plain_time:.3f}s  optimizado {optimized_time:.3f}s  "
+              f"x{plain_time / optimized_time:.2f}")
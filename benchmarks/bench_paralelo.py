@@ -0,0 +1,61 @@
+# map con una función pura y cara (cuenta los divisores de cada número) sobre
+# 5.000 elementos, en los tres motores: en el mismo proceso (--workers 1) y
+# repartido entre procesos (uno por núcleo, y al menos 2 para medir el costo de
+# repartir aunque haya un solo núcleo). El tiempo incluye arrancar los procesos,
+# que se hace una vez por ejecución. Con un solo núcleo el pool no puede ganar:
+# solo muestra cuánto cuesta mandar los tramos y traer los resultados.
+#
+#   python benchmarks/bench_paralelo.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from vectores import numeric_list
+
+SIZE = 5_000
+
+CODE = """
+mission divisores(x) {
+    cuenta = 0;
+    d = 1;
+    while (d * d <= x) {
+        if (x % d == 0) { cuenta = cuenta + 2; }
+        d = d + 1;
+    }
+    answer cuenta;
+}
+total = numeros.map(divisores).sum();
+"""
+
+
+def run(engine, workers):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    return min(measure(engine, workers) for _ in range(3))
+
+
+def measure(engine, workers):
+    # Sin memoización: cada número se calcula, no se busca en la caché
+    interpreter = Interpreter(output=io.StringIO(), memoize=False, workers=workers)
+    # Los datos se cargan desde Python, como en los otros benchmarks
+    interpreter.variables['numeros'] = numeric_list(list(range(100_000, 100_000 + SIZE)))
+    program = interpreter.parse(CODE)
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    elapsed = time.perf_counter() - start
+    results.setdefault(engine, interpreter.variables['total'])
+    assert interpreter.variables['total'] == results[engine]
+    return elapsed
+
+
+results = {}
+workers = max(os.cpu_count() or 1, 2)
+print(f"{os.cpu_count()} núcleos, {SIZE} elementos")
+for engine in ('tree', 'vm', 'py'):
+    sequential = run(engine, 1)
+    parallel = run(engine, workers)
+    print(f"{engine:<4} 1 proceso {sequential:.3f}s  {workers} procesos {parallel:.3f}s  "
+          f"x{sequential / parallel:.2f}")
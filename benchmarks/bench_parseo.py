@@ -0,0 +1,88 @@
+# Escalamiento del análisis: tiempo por sentencia (y por elemento de una lista
+# literal y por argumento de show) para programas generados cada vez más
+# grandes. Con tiempo lineal el costo por elemento no crece con el tamaño (lo
+# poco que crece es el recolector de basura de Python, que recorre más objetos).
+#
+# Después, un programa de N sentencias con show ejecutado normalmente (analizar
+# todo y después ejecutar) y en modo streaming (Interpreter.stream): cuánto
+# tarda en aparecer la primera salida, el tiempo total y la memoria máxima.
+#
+#   python benchmarks/bench_parseo.py
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from lexico import get_lexer
+from parser import parse
+
+SIZES = (10000, 20000, 40000, 80000)
+STREAMED = 80000
+
+
+def statements(n):
+    return ''.join(f"x{i % 100} = {i} * 2 + x{(i + 1) % 100};\n" for i in range(n))
+
+
+def list_literal(n):
+    return "l = [" + ', '.join(str(i) for i in range(n)) + "];\n"
+
+
+def show_arguments(n):
+    return "show(" + ', '.join(str(i) for i in range(n)) + ");\n"
+
+
+def parse_time(code):
+    lexer = get_lexer().clone()
+    lexer.output = io.StringIO()
+    start = time.perf_counter()
+    parse(code, lexer)
+    return time.perf_counter() - start
+
+
+class FirstOutput:
+    # Destino de show que anota cuándo llegó la primera salida
+    def __init__(self):
+        self.first = None
+
+    def write(self, *values):
+        if self.first is None:
+            self.first = time.perf_counter()
+
+    def flush(self):
+        pass
+
+
+def run(code, streaming, memory=False):
+    sink = FirstOutput()
+    interpreter = Interpreter(sink=sink)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if streaming:
+        interpreter.stream(code)
+    else:
+        interpreter.run(interpreter.parse(code))
+    end = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1] if memory else 0
+    if memory:
+        tracemalloc.stop()
+    return sink.first - start, end - start, peak
+
+
+print(f"{'tamaño':>8} {'sentencias':>16} {'lista literal':>16} {'argumentos de show':>20}  (µs por elemento)")
+for n in SIZES:
+    times = [parse_time(generate(n)) / n * 1e6 for generate in (statements, list_literal, show_arguments)]
+    print(f"{n:>8} {times[0]:>16.1f} {times[1]:>16.1f} {times[2]:>20.1f}")
+
+code = ''.join(f"x = {i} * 2;\nshow(x);\n" for i in range(STREAMED // 2))
+print(f"\n{STREAMED} sentencias con show:")
+for name, streaming in (('normal', False), ('streaming', True)):
+    first, total, _ = run(code, streaming)
+    _, _, peak = run(code, streaming, memory=True)
+    print(f"  {name:<10} primera salida {first * 1000:>8.1f} ms  total {total:.2f}s  "
+          f"memoria máxima {peak // 1024} KB")
@@ -0,0 +1,48 @@
+# Costo del perfil (main.py --profile): el mismo programa con el motor del árbol
+# sin medir y midiendo. Sin perfil los nodos son los de siempre, así que el
+# tiempo sin medir es el del intérprete sin cambios.
+#
+#   python benchmarks/bench_perfil.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from profilador import Profiler
+
+CODE = """
+mission cuadrado(x) {
+    answer x * x;
+}
+suma = 0;
+i = 0;
+while (i < 20000) {
+    suma = suma + cuadrado(i % 100) - i;
+    i = i + 1;
+}
+show(suma);
+"""
+
+
+def run(profile):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    times = []
+    for _ in range(3):
+        output = io.StringIO()
+        interpreter = Interpreter(output=output, memoize=False)
+        if profile:
+            interpreter.profiler = Profiler()
+        program = interpreter.parse(CODE)
+        start = time.perf_counter()
+        interpreter.run(program)
+        times.append(time.perf_counter() - start)
+    return min(times), output.getvalue()
+
+
+plain_time, plain_output = run(False)
+profiled_time, profiled_output = run(True)
+assert plain_output == profiled_output, "Las salidas no coinciden"
+print(f"sin perfil {plain_time:.3f}s  con perfil {profiled_time:.3f}s  x{profiled_time / plain_time:.1f}")
@@ -0,0 +1,55 @@
+# Recursión de profundidad N (por defecto 100k) con y sin llamada de cola. La VM
+# usa su propia pila de llamadas; el árbol y el motor py usan la de Python y
+# llegan a su límite mucho antes.
+#
+#   python benchmarks/bench_recursion.py [N]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+PROGRAMS = {
+    # answer n + suma(n - 1): la pila crece hasta N frames
+    'suma': f"""
+mission suma(n) {{
+    if (n == 0) {{ answer 0; }}
+    answer n + suma(n - 1);
+}}
+show(suma({N}));
+""",
+    # answer cuenta(...): llamada de cola, el frame se reutiliza
+    'cola': f"""
+mission cuenta(n, total) {{
+    if (n == 0) {{ answer total; }}
+    answer cuenta(n - 1, total + n);
+}}
+show(cuenta({N}, 0));
+""",
+}
+
+
+def run(code, engine):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    program = interpreter.parse(code)
+    start = time.perf_counter()
+    try:
+        interpreter.run(program, engine)
+    except RecursionError:
+        return None, None
+    return time.perf_counter() - start, output.getvalue().strip()
+
+
+for name, code in PROGRAMS.items():
+    for engine in ('tree', 'py', 'vm'):
+        elapsed, output = run(code, engine)
+        if elapsed is None:
+            print(f"{name:<6} {engine:<4} N={N}  RecursionError")
+        else:
+            print(f"{name:<6} {engine:<4} N={N}  {elapsed:.3f}s  {elapsed / N * 1e6:.2f} µs/llamada  resultado {output}")
@@ -0,0 +1,42 @@
+# Costo de un bucle con un millón de show, escribiendo línea por línea (como el
+# print() de antes sobre una terminal) o con el buffer de OutputSink.
+#
+#   python benchmarks/bench_salida.py [SHOWS]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from salida import OutputSink
+
+SHOWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+PROGRAM = f"""
+i = 0;
+while (i < {SHOWS}) {{
+    show(i);
+    i = i + 1;
+}}
+"""
+
+
+def measure(engine, buffer_size):
+    # Con buffering=1 el archivo se vacía en cada línea, igual que stdout en una terminal
+    with open(os.devnull, 'w', buffering=1) as stream:
+        interpreter = Interpreter(sink=OutputSink(stream, buffer_size))
+        program = interpreter.parse(PROGRAM)
+        if engine == 'vm':
+            program.compile()
+        start = time.perf_counter()
+        interpreter.run(program, engine)
+        return time.perf_counter() - start
+
+
+print(f"{SHOWS} show")
+for engine in ('tree', 'vm'):
+    unbuffered = measure(engine, 0)
+    buffered = measure(engine, OutputSink().buffer_size)
+    print(f"{engine:5s} línea por línea {unbuffered:6.2f}s   con buffer {buffered:6.2f}s   "
+          f"{unbuffered / buffered:4.1f}x")
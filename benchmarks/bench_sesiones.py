@@ -0,0 +1,104 @@
+# Muchas sesiones a la vez con el planificador de asyncio (planificador.py). Cada
+# sesión hace cuentas en un bucle, pide dos líneas de entrada (que un "usuario"
+# escribe con unos milisegundos de demora) y muestra el resultado; una de cada
+# cien es un while (true) que se corta por el límite de pasos. Por cantidad de
+# sesiones: tiempo total, sesiones por segundo, memoria máxima del proceso y la
+# mayor demora del bucle de eventos (cuánto tarda en despertarse una tarea que
+# duerme 1 ms: cuánto puede tener que esperar su turno una sesión; con todas las
+# sesiones listas a la vez es una vuelta completa de turnos, y analizar un
+# programa es un turno).
+#
+# Después, 1000 sesiones con tramos de distinto tamaño: tramos cortos reparten
+# mejor el turno y tramos largos cambian menos de tarea.
+#
+#   python benchmarks/bench_sesiones.py
+import asyncio
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from planificador import Session, run_sessions
+
+SIZES = (100, 1000, 5000)
+SLICES = (100, 1000, 10000)
+MAX_STEPS = 100000
+
+CODE = """
+show("nombre?");
+input(nombre);
+suma = 0;
+for (i = 0; i < 500; i = i + 1;) {
+    if (i % 3 == 0) { suma = suma + i; }
+}
+show("número?");
+input(n);
+show(nombre, suma, n);
+"""
+
+RUNAWAY = "x = 0; while (true) { x = x + 1; }"
+
+
+def user(lines):
+    # La fuente de la entrada de una sesión: cada línea llega después de una demora
+    lines = iter(lines)
+
+    async def read():
+        await asyncio.sleep(random.uniform(0.001, 0.01))
+        return next(lines, None)
+    return read
+
+
+async def probe(stop, delays):
+    # Demora del bucle de eventos: lo que se pasa de 1 ms una tarea que duerme 1 ms
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def run(count, slice_steps):
+    sessions = []
+    for k in range(count):
+        code = RUNAWAY if k % 100 == 99 else CODE
+        sessions.append(Session(code, input=user([f"usuario{k}", str(k)]), slice_steps=slice_steps,
+                                max_steps=MAX_STEPS))
+    stop = asyncio.Event()
+    delays = []
+    watcher = asyncio.create_task(probe(stop, delays))
+    start = time.perf_counter()
+    await run_sessions(sessions)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await watcher
+    for k, session in enumerate(sessions):
+        if k % 100 == 99:
+            assert session.error and 'pasos' in session.error, session.error
+        else:
+            assert session.error is None, session.error
+            assert session.output.getvalue().endswith(f"usuario{k} 41583 {k}\n"), session.output.getvalue()
+    return elapsed, max(delays, default=0.0)
+
+
+def peak_rss():
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+
+random.seed(0)
+# Las tablas del parser se cargan una vez, antes de medir
+Interpreter().parse('x = 0;')
+
+for count in SIZES:
+    elapsed, delay = asyncio.run(run(count, 1000))
+    print(f"{count:>6} sesiones  {elapsed:.2f}s  {count / elapsed:>7.0f} sesiones/s  "
+          f"memoria máxima {peak_rss()} MB  demora máxima del bucle {delay * 1000:.1f} ms")
+
+for slice_steps in SLICES:
+    elapsed, delay = asyncio.run(run(1000, slice_steps))
+    print(f"tramos de {slice_steps:>5} pasos  1000 sesiones  {elapsed:.2f}s  "
+          f"demora máxima del bucle {delay * 1000:.1f} ms")
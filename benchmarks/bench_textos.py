@@ -0,0 +1,69 @@
+# Textos armados en un bucle: un reporte de 100 KB, 1 MB y 10 MB hecho con
+# s = s + "> " + linea, en los tres motores. Con Rope (textos.py) cada vuelta
+# cuesta lo mismo; con el + común (los Concat vuelven a ser BinOp) cada vuelta
+# copia el texto entero y el tiempo crece con el cuadrado del largo, así que
+# solo se mide hasta 1 MB.
+#
+#   python benchmarks/bench_textos.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from parser import BinOp, Concat, walk
+from vectores import numeric_list
+
+SIZES = (100_000, 1_000_000, 10_000_000)
+PLAIN_LIMIT = 1_000_000
+WIDTH = 100  # largo de cada línea, con "> " y el salto
+
+CODE = """
+reporte = "";
+i = 0;
+while (i < n) {
+    reporte = reporte + "> " + lineas.pick(i % 10);
+    i = i + 1;
+}
+show(reporte.size());
+"""
+
+
+def plain(program):
+    for root in [*program.statements, *program.functions.values()]:
+        for node in walk(root):
+            if type(node) is Concat:
+                node.__class__ = BinOp
+
+
+def run(size, engine, ropes):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    return min(measure(size, engine, ropes) for _ in range(3))
+
+
+def measure(size, engine, ropes):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    # Los datos se cargan desde Python: el lenguaje no convierte números a texto
+    interpreter.variables['n'] = size // WIDTH
+    interpreter.variables['lineas'] = numeric_list([str(k) * (WIDTH - 3) + '\n' for k in range(10)])
+    program = interpreter.parse(CODE)
+    if not ropes:
+        plain(program)
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    elapsed = time.perf_counter() - start
+    assert len(interpreter.variables['reporte']) == size
+    return elapsed
+
+
+for engine in ('tree', 'vm', 'py'):
+    for size in SIZES:
+        rope_time = run(size, engine, ropes=True)
+        line = f"{engine:<4} {size / 1e6:>5.1f} MB  rope {rope_time:.3f}s"
+        if size <= PLAIN_LIMIT:
+            plain_time = run(size, engine, ropes=False)
+            line += f"  + común {plain_time:.3f}s  x{plain_time / rope_time:.1f}"
+        print(line)
@@ -0,0 +1,86 @@
+# Motor del árbol con y sin los nodos especializados por el análisis de tipos
+# (tipos.py): los programas de benchmarks/programas más un while con globales y
+# una función recursiva con enteros. Los dos árboles son el mismo programa
+# optimizado; en el primero los nodos especializados vuelven a su clase general.
+# También, lo que tarda el análisis sobre el programa generado de regresion.py.
+#
+#   python benchmarks/bench_tipos.py
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from interprete import Interpreter
+from parser import SPECIALIZED, parse, walk
+from regresion import generated_program
+from tipos import TypeInference
+
+REPEAT = 5
+
+PROGRAMS = {
+    'while': """
+suma = 0;
+i = 0;
+while (i < 300000) {
+    if (i % 3 == 0) { suma = suma + i; } else { suma = suma - 1; }
+    i = i + 1;
+}
+show(suma);
+""",
+    'recursión': """
+mission fib(n) {
+    if (n < 2) { answer n; }
+    answer fib(n - 1) + fib(n - 2);
+}
+show(fib(22));
+""",
+}
+
+for name in sorted(os.listdir(os.path.join(ROOT, 'benchmarks', 'programas'))):
+    with open(os.path.join(ROOT, 'benchmarks', 'programas', name), encoding='utf-8') as file:
+        PROGRAMS[name[:-4]] = file.read()
+
+
+def general(program):
+    # Devuelve los nodos especializados a su clase general
+    count = 0
+    for root in [*program.statements, *program.functions.values()]:
+        for node in walk(root):
+            if type(node) in SPECIALIZED:
+                node.__class__ = SPECIALIZED[type(node)]
+                count += 1
+    return count
+
+
+def run(code, specialized):
+    best = None
+    for _ in range(REPEAT):
+        output = io.StringIO()
+        # Sin memoizar: fib tiene que hacer todas sus llamadas
+        interpreter = Interpreter(output=output, memoize=False)
+        program = interpreter.parse(code)
+        count = 0 if specialized else general(program)
+        start = time.perf_counter()
+        interpreter.run(program)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count, output.getvalue()
+
+
+print(f"{'':<12} {'general':>9} {'especializado':>14} {'nodos':>6}")
+for name, code in PROGRAMS.items():
+    general_time, count, general_output = run(code, specialized=False)
+    specialized_time, _, specialized_output = run(code, specialized=True)
+    assert general_output == specialized_output, f"{name}: las salidas no coinciden"
+    print(f"{name:<12} {general_time:>8.3f}s {specialized_time:>13.3f}s {count:>6}  "
+          f"x{general_time / specialized_time:.2f}")
+
+program = parse(generated_program(2000))
+start = time.perf_counter()
+TypeInference(program).run()
+nodes = sum(1 for root in [*program.statements, *program.functions.values()] for _ in walk(root))
+print(f"análisis de tipos de {nodes} nodos: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,71 @@
+# Compara los tres motores (árbol, bytecode y traducción a Python) sobre bucles,
+# llamadas recursivas y listas. El tiempo del motor py incluye generar y
+# compilar el módulo.
+#
+#   python benchmarks/bench_transpilador.py [N]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+PROGRAMS = {
+    'while sin show': f"""
+x = {N};
+suma = 0;
+while(x>0){{
+    x = x - 1;
+    suma = suma + x * 2;
+}}
+show(suma);
+""",
+    'for con show': f"""
+for (i=0; i<{N}; i=i+1;) {{
+    show(i);
+}}
+""",
+    'fib': """
+mission fib(n) {
+    if (n < 2) { answer n; }
+    answer fib(n - 1) + fib(n - 2);
+}
+show(fib(22));
+""",
+    'listas': f"""
+l = [0];
+for (i=1; i<{N}; i=i+1;) {{
+    l.insert(i);
+}}
+suma = 0;
+n = l.size();
+for (i=0; i<n; i=i+1;) {{
+    v = l.pick(i);
+    suma = suma + v;
+}}
+show(suma);
+""",
+}
+
+
+def run(code, engine):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    program = interpreter.parse(code)
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    return time.perf_counter() - start, output.getvalue()
+
+
+for name, code in PROGRAMS.items():
+    times = {}
+    outputs = {}
+    for engine in ('tree', 'vm', 'py'):
+        times[engine], outputs[engine] = run(code, engine)
+    assert outputs['tree'] == outputs['vm'] == outputs['py'], f"Las salidas de '{name}' no coinciden"
+    print(f"{name:<15} tree {times['tree']:.3f}s  vm {times['vm']:.3f}s  py {times['py']:.3f}s  "
+          f"speedup py x{times['tree'] / times['py']:.1f}")
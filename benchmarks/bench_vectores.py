@@ -0,0 +1,65 @@
+# Listas numéricas: el mismo cálculo sobre N enteros con un bucle while que
+# recorre la lista elemento a elemento, y con operaciones en bloque
+# (lista * 2 + 1, sum, max) que hacen una sola llamada nativa cada una.
+#
+#   python benchmarks/bench_vectores.py
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from vectores import numeric_list
+
+N = 200000
+
+PROGRAMS = {
+    'bucle': """
+suma = 0;
+maximo = 0;
+cuenta = 0;
+i = 0;
+n = datos.size();
+while (i < n) {
+    x = datos.pick(i) * 2 + 1;
+    suma = suma + x;
+    if (x > maximo) { maximo = x; }
+    if (x > 1000) { cuenta = cuenta + 1; }
+    i = i + 1;
+}
+show(suma, maximo, cuenta);
+""",
+    'en bloque': """
+doble = datos * 2 + 1;
+show(doble.sum(), doble.max(), (doble > 1000).sum());
+""",
+}
+
+
+def run(code, engine):
+    # El mejor de tres, para que el ruido no tape diferencias chicas
+    times = []
+    for _ in range(3):
+        output = io.StringIO()
+        interpreter = Interpreter(output=output)
+        # Los datos se cargan desde Python: armarlos con insert mediría el bucle
+        interpreter.variables['datos'] = numeric_list(list(range(N)))
+        program = interpreter.parse(code)
+        start = time.perf_counter()
+        interpreter.run(program, engine)
+        times.append(time.perf_counter() - start)
+    return min(times), output.getvalue()
+
+
+for engine in ('tree', 'vm', 'py'):
+    loop_time, loop_output = run(PROGRAMS['bucle'], engine)
+    bulk_time, bulk_output = run(PROGRAMS['en bloque'], engine)
+    assert loop_output == bulk_output, "Las salidas no coinciden"
+    print(f"{N} enteros  {engine:<4} bucle {loop_time:.3f}s  en bloque {bulk_time:.4f}s  "
+          f"x{loop_time / bulk_time:.1f}")
+
+values = list(range(N))
+print(f"memoria de la lista: {sys.getsizeof(values) + sum(map(sys.getsizeof, values))} bytes como lista, "
+      f"{sys.getsizeof(numeric_list(values))} como array")
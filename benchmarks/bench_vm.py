@@ -0,0 +1,55 @@
+# Compara el recorrido del árbol con la máquina virtual de bytecode sobre los
+# bucles while/for de input.txt, escalados a N iteraciones.
+#
+#   python benchmarks/bench_vm.py [N]
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+PROGRAMS = {
+    'while': f"""
+x = {N};
+while(x>0){{
+    x = x - 1;
+    show("x tiene un valor de: ", x);
+}}
+""",
+    'for': f"""
+for (i=0; i<{N}; i=i+1;) {{
+    show(i);
+}}
+""",
+    # El mismo while sin show: mide solo el costo de interpretar el bucle
+    'while sin show': f"""
+x = {N};
+suma = 0;
+while(x>0){{
+    x = x - 1;
+    suma = suma + x * 2;
+}}
+show(suma);
+""",
+}
+
+
+def run(code, engine):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    program = interpreter.parse(code)
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    return time.perf_counter() - start, output.getvalue()
+
+
+for name, code in PROGRAMS.items():
+    tree_time, tree_output = run(code, 'tree')
+    vm_time, vm_output = run(code, 'vm')
+    assert tree_output == vm_output, f"Las salidas de '{name}' no coinciden"
+    print(f"{name:<15} N={N}  tree {tree_time:.3f}s  vm {vm_time:.3f}s  speedup x{tree_time / vm_time:.2f}")
@@ -0,0 +1,218 @@
+# Banco de programas del lenguaje con seguimiento de regresiones. Corre cada
+# programa de benchmarks/programas (y unos programas grandes generados, para medir
+# el parser) varias veces y reporta por separado el tiempo de cada etapa:
+#
+#   lex        solo separar en tokens
+#   parse      el análisis completo, menos el tiempo de lex
+#   optimize   el optimizador del árbol
+#   compile    bytecode (vm) o módulo de Python (py); 0 con el árbol
+#   execute    la ejecución
+#
+# más la memoria máxima de analizar y ejecutar, medida con tracemalloc en una
+# corrida aparte para no inflar los tiempos.
+#
+#   python benchmarks/regresion.py --output resultados.json
+#   python benchmarks/regresion.py --baseline base.json          # compara
+#   python benchmarks/regresion.py --baseline base.json --update # guarda
+#
+# Con --baseline termina con código 1 si alguna etapa tarda (o usa memoria) más
+# que la base por encima de --threshold. Por defecto sin memoización: fib
+# mediría la caché y no el costo de las llamadas.
+import argparse
+import copy
+import gc
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interprete import Interpreter
+from parser import get_lexer, get_parser, parse
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'programas')
+
+PHASES = ('lex', 'parse', 'optimize', 'compile', 'execute')
+
+# Por debajo de esto las diferencias son ruido y no cuentan como regresión
+MIN_TIME = 0.005
+MIN_MEMORY = 256 * 1024
+
+
+def generated_program(functions):
+    # Un programa largo y variado: funciones con if, asignaciones y llamadas
+    lines = []
+    for k in range(functions):
+        lines.append(f"mission f{k}(a, b) {{")
+        lines.append(f"    c = a * {k} + b;")
+        lines.append(f"    if (c > {k}) {{ c = c - {k}; }} else {{ c = c + 1; }}")
+        lines.append(f"    answer c;")
+        lines.append(f"}}")
+        lines.append(f"x{k} = f{k}({k}, {k + 1}) + {k} * 2;")
+    lines.append("show(" + " + ".join(f"x{k}" for k in range(0, functions, max(1, functions // 10))) + ");")
+    return '\n'.join(lines) + '\n'
+
+
+def corpus():
+    programs = {}
+    for path in sorted(glob.glob(os.path.join(PROGRAMS_DIR, '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as file:
+            programs[os.path.splitext(os.path.basename(path))[0]] = file.read()
+    programs['generado_500'] = generated_program(500)
+    programs['generado_2000'] = generated_program(2000)
+    return programs
+
+
+def run_once(code, engine, optimize, memoize):
+    times = {}
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, optimize=optimize, memoize=memoize)
+    lexer = get_lexer().clone()
+    lexer.output = output
+    parser = copy.copy(get_parser())
+    # La basura de la corrida anterior no se junta durante esta
+    gc.collect()
+
+    start = time.perf_counter()
+    lexer.input(code)
+    for _ in iter(lexer.token, None):
+        pass
+    times['lex'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = parse(code, lexer, parser)
+    times['parse'] = max(0.0, time.perf_counter() - start - times['lex'])
+    if program is None or program.syntax_errors:
+        raise ValueError(f"errores de sintaxis: {output.getvalue().strip()}")
+
+    start = time.perf_counter()
+    if optimize:
+        program.optimize()
+    times['optimize'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if engine == 'vm':
+        program.compile()
+    elif engine == 'py':
+        program.transpile()
+    times['compile'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreter.run(program, engine)
+    interpreter.sink.flush()
+    times['execute'] = time.perf_counter() - start
+    return times, output.getvalue()
+
+
+def peak_memory(code, engine, optimize, memoize):
+    tracemalloc.start()
+    try:
+        interpreter = Interpreter(output=io.StringIO(), optimize=optimize, memoize=memoize)
+        interpreter.run(interpreter.parse(code), engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(code, engine, repeat, optimize, memoize):
+    runs = []
+    expected = None
+    for _ in range(repeat):
+        times, output = run_once(code, engine, optimize, memoize)
+        if expected is None:
+            expected = output
+        elif output != expected:
+            raise ValueError("la salida cambió entre corridas")
+        runs.append(times)
+    result = {phase: {'min': min(run[phase] for run in runs),
+                      'median': statistics.median(run[phase] for run in runs)}
+              for phase in PHASES}
+    result['peak_memory'] = peak_memory(code, engine, optimize, memoize)
+    return result
+
+
+def regressions(results, baseline, threshold):
+    found = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for phase in PHASES:
+            before, after = base[phase]['min'], result[phase]['min']
+            if before >= MIN_TIME and after > before * (1 + threshold):
+                found.append((key, phase, f"{before * 1000:.1f} ms", f"{after * 1000:.1f} ms", after / before))
+        before, after = base['peak_memory'], result['peak_memory']
+        if before >= MIN_MEMORY and after > before * (1 + threshold):
+            found.append((key, 'memoria', f"{before // 1024} KB", f"{after // 1024} KB", after / before))
+    return found
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Corre el banco de programas y compara con una base')
+    arguments.add_argument('--engine', choices=['tree', 'vm', 'py'], action='append',
+                           help='motor a medir; puede repetirse (por defecto los tres)')
+    arguments.add_argument('--repeat', type=int, default=5, help='corridas de cada programa')
+    arguments.add_argument('--only', action='append', help='medir solo estos programas (puede repetirse)')
+    arguments.add_argument('--no-optimize', action='store_true', help='no optimizar el árbol')
+    arguments.add_argument('--memo', action='store_true', help='memoizar las funciones puras')
+    arguments.add_argument('--output', help='escribir los resultados en este archivo JSON')
+    arguments.add_argument('--baseline', help='resultados JSON de referencia para detectar regresiones')
+    arguments.add_argument('--update', action='store_true', help='guardar los resultados como la nueva base')
+    arguments.add_argument('--threshold', type=float, default=0.10,
+                           help='aumento relativo tolerado antes de contar una regresión (por defecto 0.10)')
+    args = arguments.parse_args(argv)
+
+    engines = args.engine or ['tree', 'vm', 'py']
+    config = {'engines': engines, 'repeat': args.repeat, 'optimize': not args.no_optimize,
+              'memoize': args.memo, 'python': platform.python_version()}
+    programs = {name: code for name, code in corpus().items() if not args.only or name in args.only}
+
+    results = {}
+    print(f"{'programa':<22} {'lex':>8} {'parse':>8} {'optimize':>9} {'compile':>8} {'execute':>9} {'memoria':>10}")
+    for name, code in programs.items():
+        for engine in engines:
+            key = f"{name}/{engine}"
+            result = results[key] = measure(code, engine, args.repeat, config['optimize'], config['memoize'])
+            print(f"{key:<22} " + ' '.join(f"{result[phase]['min'] * 1000:>{width}.1f}"
+                                           for phase, width in zip(PHASES, (8, 8, 9, 8, 9))) +
+                  f" {result['peak_memory'] // 1024:>7} KB")
+    print("(tiempos en ms: el mínimo de las corridas)")
+
+    report = {'config': config, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if not args.baseline:
+        return 0
+    if args.update or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"base guardada en {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    differences = {name: (value, config[name]) for name, value in baseline['config'].items()
+                   if name in ('optimize', 'memoize', 'python') and config[name] != value}
+    for name, (before, after) in differences.items():
+        print(f"aviso: la base usó {name}={before} y esta corrida {name}={after}")
+    found = regressions(results, baseline['results'], args.threshold)
+    if not found:
+        print(f"sin regresiones respecto de {args.baseline} (tolerancia {args.threshold:.0%})")
+        return 0
+    print(f"{len(found)} regresiones respecto de {args.baseline} (tolerancia {args.threshold:.0%}):")
+    for key, phase, before, after, ratio in found:
+        print(f"  {key:<22} {phase:<9} {before:>10} -> {after:>10}  x{ratio:.2f}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import pickle
+
+from parser import parse
+
+# Igual que __pycache__ para los .pyc: los programas ya analizados se guardan
+# junto al script, con el hash del código fuente como nombre de archivo
+CACHE_DIR = '__cache__'
+
+# El código del intérprete también forma parte de la clave: si cambian los
+# nodos del árbol o el bytecode, las entradas viejas dejan de coincidir. Incluye
+# los módulos de los valores y funciones que el árbol guardado referencia
+# (listas numéricas, textos, diccionarios, memoización)
+IMPLEMENTATION_FILES = ('lexico.py', 'parser.py', 'compilador.py', 'transpilador.py', 'optimizador.py',
+                        'tipos.py', 'plano.py', 'modulos.py', 'vectores.py', 'textos.py',
+                        'diccionarios.py', 'memoizacion.py')
+
+_implementation_hash = None
+
+
+def implementation_hash():
+    global _implementation_hash
+    if _implementation_hash is None:
+        digest = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in IMPLEMENTATION_FILES:
+            with open(os.path.join(here, name), 'rb') as file:
+                digest.update(file.read())
+        _implementation_hash = digest.hexdigest()[:16]
+    return _implementation_hash
+
+
+def source_hash(code):
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def cache_path(code, directory='.', optimize=True):
+    # El árbol optimizado y el original se guardan por separado
+    suffix = '' if optimize else '.O0'
+    return os.path.join(directory, CACHE_DIR, f"{source_hash(code)}.{implementation_hash()}{suffix}.pickle")
+
+
+def module_cache_path(code, directory='.'):
+    # Un módulo importado se guarda analizado, sin optimizar (ver modulos.py)
+    return os.path.join(directory, CACHE_DIR, f"{source_hash(code)}.{implementation_hash()}.module.pickle")
+
+
+def source_state(path):
+    # (fecha de modificación, tamaño, hash del contenido) del archivo, y su código
+    stat = os.stat(path)
+    with open(path, 'r', encoding='utf-8') as file:
+        code = file.read()
+    return (stat.st_mtime_ns, stat.st_size, source_hash(code)), code
+
+
+def modules_changed(modules):
+    # Si cambió alguno de los archivos importados (ruta -> estado de source_state).
+    # Con la misma fecha y el mismo tamaño no se lee el archivo; si no, decide el
+    # contenido: guardarlo sin cambios no invalida nada.
+    for path, (mtime, size, digest) in modules.items():
+        try:
+            stat = os.stat(path)
+            if (stat.st_mtime_ns, stat.st_size) != (mtime, size) and source_state(path)[0][2] != digest:
+                return True
+        except (OSError, UnicodeDecodeError):
+            return True
+    return False
+
+
+def read_cache(path):
+    try:
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # Entrada inexistente, truncada o de una versión incompatible: se vuelve a analizar
+        return None
+
+
+def write_cache(path, program):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump(program, file, protocol=pickle.HIGHEST_PROTOCOL)
+        # El reemplazo atómico evita que otro proceso lea un archivo a medio escribir
+        os.replace(temporary, path)
+    except OSError:
+        pass  # Sin permisos de escritura simplemente no hay caché
+
+
+def load_program(code, directory='.', engine='tree', interpreter=None, optimize=True):
+    # Devuelve el programa desde la caché si el código no cambió; si no, lo
+    # analiza (con el parser del intérprete, si se indica), lo optimiza, lo
+    # compila para el motor 'vm' o lo traduce a Python para el motor 'py' y
+    # guarda el resultado. Con un intérprete, se optimiza según su configuración.
+    if interpreter is not None:
+        optimize = interpreter.optimize
+    path = cache_path(code, directory, optimize)
+    program = read_cache(path)
+    if program is not None and modules_changed(program.modules):
+        # Las funciones importadas ya no son las de la caché
+        program = None
+    changed = False
+    if program is None:
+        if interpreter is not None:
+            program = interpreter.parse(code, directory)
+        else:
+            from modulos import resolve_imports
+            program = parse(code)
+            if program is not None:
+                resolve_imports(program, directory)
+        if program is None:
+            return None
+        if optimize:
+            program.optimize()
+        changed = True
+    if engine == 'vm' and program.bytecode is None:
+        program.compile()
+        changed = True
+    if engine == 'py' and program.python is None:
+        program.transpile()
+        changed = True
+    # Los programas con errores se vuelven a analizar para que los errores se sigan viendo
+    if changed and not program.syntax_errors:
+        write_cache(path, program)
+    return program
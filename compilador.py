@@ -0,0 +1,433 @@
+from parser import Variable, Local, ListOperation, FunctionCall, CALL_OPERATIONS, kind_name
+from vectores import REDUCTIONS
+
+# Bytecode de registros. Cada instrucción ocupa cuatro posiciones del arreglo de
+# código: (opcode, a, b, c). Los operandos son índices de registro. Cada código
+# tiene su propio archivo de registros [locales | constantes | temporales |
+# bucles], de modo que leer una constante o una variable cuesta lo mismo. En el programa principal
+# las locales son las variables globales, y ese archivo de registros es la tabla
+# global que las funciones leen con LOAD_GLOBAL.
+MOVE = 0            # r[a] = r[b]
+ADD = 1             # r[a] = r[b] + r[c]
+SUB = 2
+MULT = 3
+DIVIDE = 4
+MODULE = 5
+LESS = 6
+GREATER = 7
+LESSEQ = 8
+GREATEREQ = 9
+EQ = 10
+NEQ = 11
+AND = 12
+OR = 13
+NOT = 14            # r[a] = not r[b]
+JUMP_IF_FALSE = 15  # si no r[a], salta a la instrucción c
+JUMP = 16           # salta a la instrucción c
+LOAD_GLOBAL = 17    # r[a] = globales[b]
+CALL = 18           # r[a] = llamada; r[b] es la constante (nombre, registros de los argumentos)
+RETURN_VALUE = 19   # devuelve r[a]
+PRINT = 20          # imprime los registros de la constante r[b]
+INPUT = 21          # lee una línea en r[a]; r[b] es el nombre de la variable
+BUILD_LIST = 22     # r[a] = lista con los registros de la constante r[b]
+LIST_GET = 23       # r[a] = r[b][r[c]]
+LIST_SIZE = 24      # r[a] = len(r[b])
+LIST_INSERT = 25    # r[b].append(r[c]); r[a] = r[b]
+LIST_EXPLODE = 26   # r[b].pop(r[c]); r[a] = r[b]
+LIST_SET = 27       # r[a][r[b]] = r[c]
+TAIL_CALL = 28      # answer f(...): como CALL, pero la función llamada reemplaza al frame actual;
+                    # siempre va seguida de RETURN_VALUE a
+LIST_REDUCE = 29    # r[a] = sum/min/max de r[b]; r[c] es la constante con el nombre del método
+FOR_PREP = 30       # r[a] = iterador de los valores de un CountedLoop; r[b] es la constante
+                    # (registro de la variable, paso, comparación) y r[c] el límite
+FOR_NEXT = 31       # siguiente valor del iterador r[a] en r[b] y salta a c; agotado, sigue
+BUILD_DICT = 32     # r[a] = diccionario con los registros (clave, valor, clave, ...) de la constante r[b]
+HAS_KEY = 33        # r[a] = si r[c] está en r[b] (ver diccionarios.py)
+REMOVE_KEY = 34     # quita la clave r[c] de r[b]; r[a] = r[b]
+PUT_KEY = 35        # r[b][clave] = valor, con los registros (clave, valor) de la constante r[c]; r[a] = r[b]
+KEYS = 36           # r[a] = lista de las claves de r[b]
+CONCAT = 37         # r[a] = r[b] + r[c], armando una Rope (ver textos.py)
+MATERIALIZE = 38    # si r[a] es una Rope, r[a] = su texto
+CALL_LIST = 39      # r[a] = map/filter de r[b]; r[c] es la constante (operación, nombre de la función)
+
+BINARY_OPS = {
+    '+': ADD, '-': SUB, '*': MULT, '/': DIVIDE, '%': MODULE,
+    '<': LESS, '>': GREATER, '<=': LESSEQ, '>=': GREATEREQ,
+    '==': EQ, '!=': NEQ, '&&': AND, '||': OR,
+}
+
+LIST_OPS = {
+    'get': LIST_GET, 'size': LIST_SIZE, 'insert': LIST_INSERT, 'explode': LIST_EXPLODE,
+    'has': HAS_KEY, 'remove': REMOVE_KEY,
+}
+
+OPNAMES = {value: name for name, value in globals().items()
+           if name.isupper() and isinstance(value, int)}
+
+# Tipos de operando antes de asignar los registros definitivos. LOOP son los
+# iteradores de los bucles contados, que viven durante todo el cuerpo (los
+# temporales se reusan en cada sentencia)
+GLOBAL, LOCAL, CONST, TEMP, LOOP = 'global', 'local', 'const', 'temp', 'loop'
+
+
+class CodeObject:
+    def __init__(self, name, code, local_names, parameters, consts, size, global_inits):
+        self.name = name
+        self.code = code                  # arreglo plano de enteros: opcode, a, b, c, opcode, ...
+        self.local_names = local_names    # registros 0 .. len(local_names) - 1
+        self.parameters = parameters      # los primeros registros locales son los parámetros
+        self.consts = consts              # constantes: los registros siguientes
+        self.size = size                  # cantidad total de registros
+        # (local, global) por cada local: la que no recibe argumento empieza con el valor global
+        self.global_inits = global_inits
+
+    def instructions(self):
+        code = self.code
+        return [tuple(code[i:i + 4]) for i in range(0, len(code), 4)]
+
+
+class CompiledProgram:
+    def __init__(self, main, functions, globals):
+        self.main = main              # CodeObject del programa principal
+        self.functions = functions    # nombre -> CodeObject
+        self.globals = globals        # nombres de las variables globales
+
+    def disassemble(self):
+        lines = []
+        for code_object in [self.main, *self.functions.values()]:
+            lines.append(f"{code_object.name}:")
+            for index, (op, a, b, c) in enumerate(code_object.instructions()):
+                lines.append(f"{index:5d} {OPNAMES[op]:<14} {a:<5d} {b:<5d} {c:<5d}")
+        return '\n'.join(lines)
+
+
+class Compiler:
+    def __init__(self):
+        self.globals = []
+        self._global_index = {}
+
+    # Operandos y emisión
+
+    def global_name(self, name):
+        if name not in self._global_index:
+            self._global_index[name] = len(self.globals)
+            self.globals.append(name)
+        return (GLOBAL, self._global_index[name])
+
+    def const(self, value):
+        # True == 1 en Python, así que el tipo forma parte de la clave
+        key = (type(value), value)
+        if key not in self._const_index:
+            self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return (CONST, self._const_index[key])
+
+    def temp(self):
+        operand = (TEMP, self.temps)
+        self.temps += 1
+        self.max_temps = max(self.max_temps, self.temps)
+        return operand
+
+    def emit(self, op, a=0, b=0, c=0):
+        self.code.append([op, a, b, c])
+        return len(self.code) - 1
+
+    def here(self):
+        return len(self.code)
+
+    def patch(self, index, target):
+        self.code[index][3] = target
+
+    def compile_code(self, name, statements, function=None):
+        self.function = function
+        self.code = []
+        self.consts = []
+        self._const_index = {}
+        self.temps = 0
+        self.max_temps = 0
+        self.loops = 0
+        self.max_loops = 0
+        for statement in statements:
+            self.statement(statement)
+        self.emit(RETURN_VALUE, self.const(None))
+        return (name, function, self.code, self.consts, self.max_temps, self.max_loops)
+
+    def assemble(self, pending):
+        # Con todas las globales conocidas se fijan los registros de cada código
+        code_objects = []
+        for name, function, code, consts, max_temps, max_loops in pending:
+            if function is None:
+                local_names = list(self.globals)
+                parameters = 0
+                global_inits = []
+            else:
+                local_names = list(function.locals)
+                parameters = len(function.parameters)
+                global_inits = [(slot, self.global_name(local)[1])
+                                for slot, local in enumerate(local_names)]
+            base = {GLOBAL: 0, LOCAL: 0, CONST: len(local_names),
+                    TEMP: len(local_names) + len(consts),
+                    LOOP: len(local_names) + len(consts) + max_temps}
+
+            def register(operand):
+                if isinstance(operand, tuple):
+                    kind, index = operand
+                    return base[kind] + index
+                return operand
+
+            # Las constantes con listas de registros (PRINT, BUILD_LIST, BUILD_DICT, PUT_KEY,
+            # CALL) también se resuelven
+            for index, value in enumerate(consts):
+                if isinstance(value, tuple) and value[0] == 'registers':
+                    consts[index] = tuple(register(operand) for operand in value[1])
+                elif isinstance(value, tuple) and value[0] == 'call':
+                    consts[index] = (value[1], tuple(register(operand) for operand in value[2]))
+                elif isinstance(value, tuple) and value[0] == 'counted':
+                    consts[index] = (register(value[1]), value[2], value[3])
+
+            flat = []
+            for instruction in code:
+                flat.extend(register(operand) for operand in instruction)
+            size = len(local_names) + len(consts) + max_temps + max_loops
+            code_objects.append(CodeObject(name, flat, local_names, parameters, consts, size, global_inits))
+        return code_objects
+
+    # Sentencias
+
+    def statement(self, node):
+        if node is None:
+            return
+        # Ningún temporal sobrevive a la sentencia que lo creó
+        self.temps = 0
+        method = getattr(self, 'statement_' + type(node).__name__, None)
+        if method is None:
+            raise ValueError(f"El compilador no soporta la sentencia '{type(node).__name__}'")
+        method(node)
+
+    def variable(self, node):
+        # Registro donde se puede escribir la variable destino de una asignación
+        if isinstance(node, Local):
+            return (LOCAL, node.slot)
+        if self.function is not None:
+            raise ValueError(f"La variable global '{node.name}' no puede asignarse dentro de una función")
+        return self.global_name(node.name)
+
+    def statement_ExpressionStatement(self, node):
+        self.expression(node.expression)
+
+    def statement_Assign(self, node):
+        target = node.target
+        if isinstance(target, (Variable, Local)):
+            destination = self.variable(target)
+            value = self.expression(node.expression, destination)
+            if value != destination:
+                self.emit(MOVE, destination, value)
+        elif isinstance(target, ListOperation) and target.operation == 'set':
+            list_val = self.expression(target.list_expr)
+            index = self.expression(target.argument)
+            value = self.expression(node.expression)
+            self.emit(LIST_SET, list_val, index, value)
+        else:
+            raise ValueError("Invalid assignment target")
+
+    def statement_Print(self, node):
+        values = [self.expression(expression) for expression in node.expressions]
+        self.emit(PRINT, 0, self.const(('registers', tuple(values))))
+
+    def statement_Input(self, node):
+        if not isinstance(node.target, (Variable, Local)):
+            raise ValueError("input() solo admite variables como destino")
+        self.emit(INPUT, self.variable(node.target), self.const(node.target.name))
+
+    def statement_Block(self, node):
+        for statement in node.statements:
+            self.statement(statement)
+
+    def statement_Materialize(self, node):
+        for target in node.targets:
+            self.emit(MATERIALIZE, self.variable(target))
+
+    def statement_IfElse(self, node):
+        jump_else = self.emit(JUMP_IF_FALSE, self.expression(node.condition))
+        self.statement(node.if_block)
+        if node.else_block:
+            jump_end = self.emit(JUMP)
+            self.patch(jump_else, self.here())
+            self.statement(node.else_block)
+            self.patch(jump_end, self.here())
+        else:
+            self.patch(jump_else, self.here())
+
+    def statement_WhileLoop(self, node):
+        start = self.here()
+        jump_end = self.emit(JUMP_IF_FALSE, self.expression(node.condition))
+        self.statement(node.block)
+        self.emit(JUMP, 0, 0, start)
+        self.patch(jump_end, self.here())
+
+    def statement_ForLoop(self, node):
+        self.statement(node.init)
+        start = self.here()
+        self.temps = 0
+        jump_end = self.emit(JUMP_IF_FALSE, self.expression(node.condition))
+        self.statement(node.block)
+        self.statement(node.update)
+        self.emit(JUMP, 0, 0, start)
+        self.patch(jump_end, self.here())
+
+    def statement_CountedLoop(self, node):
+        # init; el iterador se arma una vez y FOR_NEXT, al final del cuerpo, vuelve
+        # al principio mientras haya valores. Después, como en el bucle común, la
+        # variable termina con el primer valor que no cumple la condición.
+        self.statement(node.init)
+        iterator = (LOOP, self.loops)
+        self.loops += 1
+        self.max_loops = max(self.max_loops, self.loops)
+        self.temps = 0
+        variable = self.variable(node.condition.left)
+        stop = self.expression(node.condition.right)
+        self.emit(FOR_PREP, iterator, self.const(('counted', variable, node.step, node.condition.op)), stop)
+        jump_next = self.emit(JUMP)
+        start = self.here()
+        self.statement(node.block)
+        self.patch(jump_next, self.here())
+        self.emit(FOR_NEXT, iterator, variable, start)
+        self.loops -= 1
+        self.temps = 0
+        jump_end = self.emit(JUMP_IF_FALSE, self.expression(node.condition))
+        self.statement(node.update)
+        self.patch(jump_end, self.here())
+
+    def statement_Return(self, node):
+        if self.function is None:
+            # Un 'answer' fuera de una función termina el programa sin evaluar su expresión
+            self.emit(RETURN_VALUE, self.const(None))
+        elif isinstance(node.expression, FunctionCall):
+            # El RETURN_VALUE solo se ejecuta si la VM no puede reemplazar el frame
+            destination = self.temp()
+            self.emit(TAIL_CALL, destination, self.call_const(node.expression))
+            self.emit(RETURN_VALUE, destination)
+        else:
+            self.emit(RETURN_VALUE, self.expression(node.expression))
+
+    # Expresiones: devuelven el operando que contiene el valor. Si se indica un
+    # destino, el resultado se escribe ahí directamente y se evita un MOVE.
+
+    def expression(self, node, destination=None):
+        method = getattr(self, 'expression_' + kind_name(node), None)
+        if method is None:
+            raise ValueError(f"El compilador no soporta la expresión '{type(node).__name__}'")
+        return method(node, destination)
+
+    def expression_Number(self, node, destination):
+        return self.const(node.value)
+
+    expression_String = expression_Number
+    expression_Boolean = expression_Number
+
+    def expression_Local(self, node, destination):
+        return (LOCAL, node.slot)
+
+    def expression_Variable(self, node, destination):
+        if self.function is None:
+            return self.global_name(node.name)
+        destination = destination or self.temp()
+        self.emit(LOAD_GLOBAL, destination, self.global_name(node.name))
+        return destination
+
+    def expression_BinOp(self, node, destination):
+        if node.op not in BINARY_OPS:
+            raise ValueError(f"Operador desconocido '{node.op}'")
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        destination = destination or self.temp()
+        self.emit(BINARY_OPS[node.op], destination, left, right)
+        return destination
+
+    def expression_Concat(self, node, destination):
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        destination = destination or self.temp()
+        self.emit(CONCAT, destination, left, right)
+        return destination
+
+    def expression_NotOp(self, node, destination):
+        value = self.expression(node.expression)
+        destination = destination or self.temp()
+        self.emit(NOT, destination, value)
+        return destination
+
+    def expression_Negate(self, node, destination):
+        value = self.expression(node.expression)
+        destination = destination or self.temp()
+        self.emit(SUB, destination, self.const(0), value)
+        return destination
+
+    def expression_List(self, node, destination):
+        elements = [self.expression(element) for element in node.elements]
+        destination = destination or self.temp()
+        self.emit(BUILD_LIST, destination, self.const(('registers', tuple(elements))))
+        return destination
+
+    def expression_Dict(self, node, destination):
+        entries = []
+        for key, value in zip(node.keys, node.values):
+            entries += [self.expression(key), self.expression(value)]
+        destination = destination or self.temp()
+        self.emit(BUILD_DICT, destination, self.const(('registers', tuple(entries))))
+        return destination
+
+    def expression_ListOperation(self, node, destination):
+        if node.operation in REDUCTIONS:
+            list_val = self.expression(node.list_expr)
+            destination = destination or self.temp()
+            self.emit(LIST_REDUCE, destination, list_val, self.const(node.operation))
+            return destination
+        if node.operation == 'keys':
+            list_val = self.expression(node.list_expr)
+            destination = destination or self.temp()
+            self.emit(KEYS, destination, list_val)
+            return destination
+        if node.operation in CALL_OPERATIONS:
+            list_val = self.expression(node.list_expr)
+            destination = destination or self.temp()
+            self.emit(CALL_LIST, destination, list_val, self.const((node.operation, node.argument.value)))
+            return destination
+        if node.operation == 'put':
+            list_val = self.expression(node.list_expr)
+            entry = (self.expression(node.argument), self.expression(node.value))
+            destination = destination or self.temp()
+            self.emit(PUT_KEY, destination, list_val, self.const(('registers', entry)))
+            return destination
+        if node.operation not in LIST_OPS:
+            raise ValueError(f"Método de lista desconocido '{node.operation}'")
+        list_val = self.expression(node.list_expr)
+        argument = 0
+        if node.operation != 'size':
+            if node.argument is None:
+                raise ValueError(f"{node.operation}() requiere un argumento")
+            argument = self.expression(node.argument)
+        destination = destination or self.temp()
+        self.emit(LIST_OPS[node.operation], destination, list_val, argument)
+        return destination
+
+    def expression_FunctionCall(self, node, destination):
+        call = self.call_const(node)
+        destination = destination or self.temp()
+        self.emit(CALL, destination, call)
+        return destination
+
+    def call_const(self, node):
+        arguments = tuple(self.expression(argument) for argument in node.arguments)
+        return self.const(('call', node.name, arguments))
+
+
+def compile_program(statements, functions):
+    compiler = Compiler()
+    pending = [compiler.compile_code('<program>', statements)]
+    for function in functions.values():
+        pending.append(compiler.compile_code(function.name, function.block.statements, function))
+    # Las funciones se ensamblan primero: pueden agregar globales que el programa
+    # principal debe reservar en su archivo de registros
+    main, *compiled_functions = reversed(compiler.assemble(pending[::-1]))
+    return CompiledProgram(main, {code.name: code for code in compiled_functions}, compiler.globals)
@@ -0,0 +1,57 @@
+from vectores import numeric_list
+
+# Diccionarios: un dict de Python, una tabla hash, así buscar, asignar y quitar
+# una clave no depende de cuántas haya (buscar con pick en una lista recorre los
+# elementos uno por uno). Las claves son números, textos o booleanos; como en
+# Python, 1, 1.0 y true son la misma clave.
+#
+#   d = {"ana": 3, "luis": 5};
+#   d.pick("ana")        el valor de la clave (error si no está)
+#   d["eva"] = 7;        asigna la clave; también d.put("eva", 7), que devuelve d
+#   d.has("eva")         si la clave está
+#   d.remove("eva")      quita la clave (error si no está) y devuelve d
+#   d.size()             cantidad de claves
+#   d.keys()             lista de las claves, en el orden en que se agregaron
+#
+# has, put y remove también sirven con listas, donde la clave es la posición
+# (como en pick): si la posición existe, asignarla y quitarla. Para saber si un
+# valor está en la lista hay que recorrerla. Los métodos no son palabras
+# reservadas (como sum, min y max): siguen sirviendo como nombres de variables.
+
+# Métodos con argumentos -> cantidad de argumentos
+KEYED_METHODS = {'has': 1, 'remove': 1, 'put': 2}
+
+
+def missing_key(operation, key):
+    return LookupError(f"{operation}(): Clave {key!r} inexistente")
+
+
+def has_key(collection, key):
+    if isinstance(collection, dict):
+        return key in collection
+    # La misma clave que remove y put: una posición que pick puede leer
+    size = len(collection)
+    return isinstance(key, int) and -size <= key < size
+
+
+def remove_key(collection, key):
+    try:
+        return collection.pop(key)
+    except KeyError:
+        raise missing_key('remove', key) from None
+    except IndexError:
+        raise IndexError(f"remove(): Índice {key} fuera de rango") from None
+
+
+def put_key(collection, key, value):
+    try:
+        collection[key] = value
+    except IndexError:
+        raise IndexError(f"put(): Índice {key} fuera de rango") from None
+    return collection
+
+
+def keys_of(collection):
+    if not isinstance(collection, dict):
+        raise ValueError("keys() requiere un diccionario")
+    return numeric_list(list(collection))
@@ -0,0 +1,214 @@
+import copy
+import sys
+
+from parser import Frame, Program, Return, get_lexer, get_parser, parse
+from memoizacion import MEMO_SIZE, MemoCache, callers, pure_functions
+from modulos import resolve_imports
+from paralelo import CHUNK_SIZE, WorkerPool
+from salida import QUIET, OutputSink
+from textos import finish
+from tipos import check_program
+
+
+class Interpreter:
+    # Estado completo de una ejecución: variables globales, funciones, salida y
+    # entrada. Nada de esto es global al módulo, así que varios intérpretes pueden
+    # ejecutar programas a la vez (por ejemplo, uno por hilo) sin mezclarse.
+    #
+    # output: archivo donde escribe show (None: la salida estándar del momento)
+    # input: archivo del que lee input (None: la entrada estándar, con input())
+    # sink: destino de show ya armado (por defecto, un OutputSink con buffer sobre output)
+    # verbose: TRACE muestra los mensajes de depuración de input() y de las listas
+    # optimize: optimizar el árbol (ver optimizador.py) antes de ejecutarlo
+    # memoize: guardar los resultados de las funciones puras (ver memoizacion.py),
+    # hasta memo_size llamadas por función
+    # check: avisar antes de ejecutar los errores seguros (ver tipos.py) en warnings,
+    # un archivo (None: la salida de errores del momento). No detiene el programa.
+    # workers: procesos para map y filter con funciones puras, que reciben tramos
+    # de chunk_size elementos (ver paralelo.py). Con 1, todo en este proceso: un
+    # intérprete dentro de un proceso del pool de lote.py no puede crear otros, y
+    # varios intérpretes en hilos no deberían tener un pool cada uno. main.py usa
+    # uno por núcleo.
+    def __init__(self, output=None, input=None, sink=None, verbose=QUIET, optimize=True,
+                 memoize=True, memo_size=MEMO_SIZE, check=True, warnings=None, workers=1,
+                 chunk_size=CHUNK_SIZE):
+        self.variables = {}
+        self.functions = {}
+        self.pure = set()  # nombres de las funciones puras (ver memoizacion.py)
+        self.optimize = optimize
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.check = check
+        self.warnings = warnings
+        self.memo = {}  # nombre de función pura -> MemoCache
+        self.output = output
+        self.input = input
+        self.sink = sink if sink is not None else OutputSink(output)
+        self.verbose = verbose
+        self.write = self.sink.write
+        self.lexer = None
+        self.parser = None
+        self.profiler = None  # un Profiler (ver profilador.py) mide la ejecución del árbol
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.pool = None      # un WorkerPool (ver paralelo.py), mientras dura una ejecución
+
+    def prepare_parser(self):
+        if self.parser is None:
+            # PLY guarda el estado del análisis en el lexer y el parser: cada intérprete
+            # usa sus propias copias de las tablas, que se cargan recién al analizar
+            # el primer programa
+            self.lexer = get_lexer().clone()
+            self.lexer.output = self.output
+            self.parser = copy.copy(get_parser())
+
+    def parse(self, code, directory='.'):
+        # directory: desde donde se buscan los archivos de los import (ver modulos.py)
+        self.prepare_parser()
+        program = parse(code, self.lexer, self.parser)
+        if program is not None:
+            resolve_imports(program, directory, self.output)
+            if self.optimize:
+                program.optimize()
+        return program
+
+    def register(self, program):
+        if not program.functions:
+            return
+        redefined = [name for name in program.functions if name in self.functions]
+        self.functions.update(program.functions)
+        # Las funciones nuevas, y con una redefinida también las que la llaman directa
+        # o indirectamente (stream, repl.py), deciden otra vez si son puras y empiezan
+        # con la caché vacía. Pueden llamar a las puras ya definidas sin dejar de serlo.
+        changed = set(program.functions)
+        if redefined:
+            changed |= callers(self.functions, redefined)
+        for name in changed:
+            self.memo.pop(name, None)
+            self.pure.discard(name)
+        # Los procesos de map y filter tienen las funciones de antes
+        self.close_pool()
+        pure = pure_functions({name: self.functions[name] for name in changed}, self.pure)
+        self.pure.update(pure)
+        if self.memoize:
+            for name in pure:
+                self.memo[name] = MemoCache(self.memo_size, len(self.functions[name].parameters))
+
+    def verify(self, program):
+        # Los errores que el programa va a tener si llega a su línea se avisan antes
+        # de ejecutar. El programa corre igual: lo anterior tiene que mostrarse, y
+        # antes puede fallar otra cosa, que es el error que se informa.
+        if self.check:
+            warnings = self.warnings if self.warnings is not None else sys.stderr
+            for error in check_program(program, self.variables, self.functions):
+                print(f"Warning: {error}", file=warnings)
+
+    def run(self, program, engine='tree'):
+        # Las funciones se registran antes de ejecutar, así pueden llamarse antes de su definición
+        self.register(program)
+        self.verify(program)
+        try:
+            if engine == 'vm':
+                from maquina import VM
+                VM(program.compile(), self).run()
+                return
+            if engine == 'py':
+                from transpilador import run
+                run(program.transpile(), self)
+                return
+            if self.profiler is not None:
+                self.profiler.run(program, self)
+                return
+            # En el nivel superior todas las variables son globales
+            frame = Frame(self, [])
+            for statement in program.statements:
+                # Un 'answer' fuera de una función termina el programa
+                if isinstance(statement.execute(frame), Return):
+                    break
+        except RecursionError:
+            # El árbol y el motor py usan la pila de Python; la VM tiene la suya
+            raise RecursionError(f"Recursión demasiado profunda para el motor '{engine}' "
+                                 "(el motor vm no tiene este límite)") from None
+        finally:
+            # Al terminar, también con error, se escribe lo que quedó en el buffer
+            # y ninguna variable queda con un texto a medio armar (ver textos.py)
+            finish(self.variables)
+            self.close_pool()
+            self.sink.flush()
+
+    def stream(self, code, directory='.'):
+        # Analiza y ejecuta a la vez (main.py --stream), con el motor del árbol: cada
+        # sentencia del nivel superior se ejecuta apenas el parser la reconoce, así
+        # la salida empieza enseguida y lo ya ejecutado no queda en memoria. A
+        # cambio, una función tiene que estar definida antes de su primera llamada.
+        # Devuelve el programa, vacío, con la cuenta de errores de sintaxis.
+        frame = Frame(self, [])
+        finished = False
+
+        def execute(statement):
+            nonlocal finished
+            if finished:
+                return
+            program = Program([statement])
+            resolve_imports(program, directory, self.output)
+            if self.optimize:
+                program.optimize()
+            self.register(program)
+            for node in program.statements:
+                if isinstance(node.execute(frame), Return):
+                    # Un 'answer' termina el programa: el resto solo se analiza
+                    finished = True
+                    return
+
+        self.prepare_parser()
+        try:
+            return parse(code, self.lexer, self.parser, stream=execute)
+        except RecursionError:
+            raise RecursionError("Recursión demasiado profunda para el motor 'tree' "
+                                 "(el motor vm no tiene este límite)") from None
+        finally:
+            finish(self.variables)
+            self.close_pool()
+            self.sink.flush()
+
+    def execute(self, code, engine='tree'):
+        program = self.parse(code)
+        if program is not None:
+            self.run(program, engine)
+        return program
+
+    def worker_pool(self, engine):
+        # Los procesos para map y filter (ver paralelo.py), o None si hay uno solo.
+        # Se crean con el primer map que los necesita y quedan hasta el final de la
+        # ejecución, o hasta que se defina otra función.
+        if self.workers <= 1:
+            return None
+        if self.pool is None or self.pool.engine != engine:
+            self.close_pool()
+            self.pool = WorkerPool({name: self.functions[name] for name in self.pure}, engine,
+                                   self.workers, self.memoize)
+        return self.pool
+
+    def close_pool(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def memo_stats(self):
+        # nombre -> (aciertos, fallos, llamadas sin clave, resultados guardados, activa)
+        return {name: (cache.hits, cache.misses, cache.skipped, len(cache.entries), cache.active)
+                for name, cache in self.memo.items()}
+
+    def trace(self, message):
+        # Los nodos solo la llaman si verbose >= TRACE: apagada no cuesta nada
+        self.sink.write(message)
+
+    def read_line(self):
+        # Lo mostrado antes de pedir la entrada tiene que verse antes de leer
+        self.sink.flush()
+        if self.input is None:
+            return input()
+        line = self.input.readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line.rstrip('\n')
@@ -1,11 +1,15 @@
-import ply.lex as lex
+import re
+import sys
+import threading
+import zlib
+from functools import partial
 
 # tokens
 tokens = [
     'NUMBER', 'ID', 'EQUALS', 'PLUS', 'MINUS', 'MULT', 'DIVIDE', 'MODULE',
     'LPAREN', 'RPAREN', 'STRING', 'SEMICOLON', 'LESS', 'GREATER',
     'LESSEQ', 'GREATEREQ', 'LKEY', 'RKEY', 'AND', 'OR', 'NOT', 'BOOLEAN',
-    'EQ', 'NEQ', 'COMMA', 'LBRACKET', 'RBRACKET','DOT'
+    'EQ', 'NEQ', 'COMMA', 'LBRACKET', 'RBRACKET','DOT', 'COLON'
 ]
 
 # palabras reservadas 
@@ -17,6 +21,7 @@ reserved = {
     'for': 'FOR',
     'while': 'WHILE',
     'mission': 'FUNC',
+    'import': 'IMPORT',
     'answer': 'RETURN',
     'insert': 'INSERT',
     'explode': 'EXPLODE',     
@@ -50,6 +55,7 @@ t_COMMA = r','
 t_LBRACKET = r'\['
 t_RBRACKET = r'\]'
 t_DOT = r'\.'
+t_COLON = r':'  # {clave: valor}
 
 # Ignorar espacios y tabulacion
 t_ignore = ' \t'
@@ -73,13 +79,14 @@ def t_ID(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
     # Verificar si es palabra reservada
     t.type = reserved.get(t.value, 'ID')  # Busca en palabras reservadas, sino, es ID
+    t.value = sys.intern(t.value)
     return t
 
 
 
 # Token para números 
 def t_NUMBER(t):
-    r'-?\d+(\.\d+)?'  # Agrega el signo negativo opcional
+    r'\d+(\.\d+)?'  # sin signo: x-1 es x - 1; -1 es el menos unario
     # para flotantes
     if '.' in t.value:
         t.value = float(t.value)
@@ -100,9 +107,148 @@ def t_newline(t):
 
 # Manejo de errores
 def t_error(t):
-    print(f"Caracter no valido '{t.value[0]}' en la línea {t.lexer.lineno}")
+    print(f"Caracter no valido '{t.value[0]}' en la línea {t.lexer.lineno}", file=t.lexer.output)
+    t.lexer.errors += 1
     t.lexer.skip(1)
 
-# Construir el lexer
-lexer = lex.lex()
+def rules_signature():
+    # Lo que lextab.py guarda de este archivo: los tokens y la expresión regular de
+    # cada regla, en el orden en que lex las prueba
+    rules = {name: value for name, value in globals().items() if name.startswith('t_')}
+    functions = sorted((rule.__code__.co_firstlineno, name) for name, rule in rules.items() if callable(rule))
+    signature = (sorted(tokens), sorted((name, rule) for name, rule in rules.items() if isinstance(rule, str)),
+                 [(name, rules[name].__doc__) for _, name in functions])
+    return zlib.crc32(repr(signature).encode('utf-8'))
+
+
+def master_pattern():
+    # Una sola expresión regular con un grupo por regla, en el orden en que las
+    # prueba PLY: primero las funciones, en el orden del archivo, después las
+    # cadenas, de la más larga a la más corta. Al final, cualquier otro carácter,
+    # que es un error. Los caracteres que se ignoran van con el token anterior
+    # (así no cuestan una vuelta más cada uno); el grupo ignore solo encuentra
+    # los del principio del código.
+    rules = {name[2:]: value for name, value in globals().items() if name.startswith('t_')}
+    functions = sorted((rule.__code__.co_firstlineno, name) for name, rule in rules.items()
+                       if callable(rule) and name != 'error')
+    strings = sorted(((name, rule) for name, rule in rules.items() if isinstance(rule, str) and name != 'ignore'),
+                     key=lambda item: len(item[1]), reverse=True)
+    groups = [('ignore', f"[{re.escape(t_ignore)}]+")]
+    groups += [(name, rules[name].__doc__) for _, name in functions]
+    groups += strings
+    groups.append(('error', '.'))
+    alternatives = '|'.join(f"(?P<{name}>{regex})" for name, regex in groups)
+    return re.compile(f"(?:{alternatives})[{re.escape(t_ignore)}]*")
+
+
+# Grupos de master_pattern() que no son directamente un token del mismo tipo
+ACTIONS = frozenset(['ignore', 'COMMENT', 'newline', 'NUMBER', 'STRING', 'BOOLEAN', 'error'])
+
+
+class Token:
+    # Lo que el parser lee de un token (lexer lo agrega yacc al recuperarse de un error)
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class FastLexer:
+    # Lexer sin PLY: la expresión regular de master_pattern() recorre el código con
+    # finditer y cada token sale de un generador, sin llamar a una función de
+    # regla por token. Da los mismos tokens que el lexer de PLY y se usa igual
+    # (input, token, clone, lineno); las acciones de abajo son las de las reglas
+    # t_STRING, t_BOOLEAN, t_ID, t_NUMBER, t_COMMENT, t_newline y t_error.
+    def __init__(self, pattern=None):
+        self.pattern = pattern if pattern is not None else master_pattern()
+        self.lineno = 1
+        self.errors = 0  # errores léxicos y de sintaxis del último análisis
+        self.output = None  # dónde se reportan los errores (None: la salida estándar)
+        self.token = partial(next, iter(()), None)
+
+    def clone(self):
+        return FastLexer(self.pattern)
+
+    def input(self, data):
+        self.token = partial(next, self.scan(data), None)
+
+    def scan(self, data):
+        # Los nombres y los operadores se internan: cada 'x' o '<=' del programa es
+        # el mismo objeto, que los nodos del árbol comparten
+        lineno = self.lineno
+        get_reserved = reserved.get
+        intern = sys.intern
+        for match in self.pattern.finditer(data):
+            kind = match.lastgroup
+            value = match[kind]
+            if kind == 'ID':
+                value = intern(value)
+                kind = get_reserved(value, 'ID')
+            elif kind in ACTIONS:
+                if kind == 'NUMBER':
+                    value = float(value) if '.' in value else int(value)
+                elif kind == 'newline':
+                    lineno += len(value)
+                    self.lineno = lineno
+                    continue
+                elif kind == 'STRING':
+                    value = value[1:-1]
+                elif kind == 'BOOLEAN':
+                    value = value == 'true'
+                elif kind == 'error':
+                    print(f"Caracter no valido '{value}' en la línea {lineno}", file=self.output)
+                    self.errors += 1
+                    continue
+                else:  # ignore, COMMENT
+                    continue
+            else:
+                value = intern(value)
+            yield Token(kind, value, lineno, match.start())
+
+
+# Los lexers se construyen la primera vez que se usan. El de todos los días es
+# FastLexer; el de PLY (get_ply_lexer) sigue disponible y da los mismos tokens.
+_lexer = None
+_ply_lexer = None
+_lock = threading.Lock()
+
+
+def get_lexer():
+    global _lexer
+    with _lock:
+        if _lexer is None:
+            _lexer = FastLexer()
+    return _lexer
+
+
+def get_ply_lexer():
+    # Un programa que sale de la caché de programas analizados no llega a importar PLY
+    global _ply_lexer
+    with _lock:
+        if _ply_lexer is None:
+            import ply.lex as lex
+            try:
+                import lextab
+                fresh = getattr(lextab, '_lexsignature', None) == rules_signature()
+            except ImportError:
+                fresh = False
+            # Con las tablas de lextab.py (ver tablas.py) lex no valida las reglas; si
+            # no corresponden a este archivo, se arman de nuevo sin escribir nada
+            _ply_lexer = lex.lex(optimize=True, lextab=lextab) if fresh else lex.lex()
+            _ply_lexer.errors = 0
+            _ply_lexer.output = None
+    return _ply_lexer
+
+
+def __getattr__(name):
+    # lexico.lexer sigue disponible, construido al pedirlo
+    if name == 'lexer':
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
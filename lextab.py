@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'BOOLEAN', 'COLON', 'COMMA', 'DIVIDE', 'DOT', 'ELSE', 'EQ', 'EQUALS', 'EXPLODE', 'FOR', 'FUNC', 'GET', 'GREATER', 'GREATEREQ', 'ID', 'IF', 'IMPORT', 'INPUT', 'INSERT', 'LBRACKET', 'LESS', 'LESSEQ', 'LKEY', 'LPAREN', 'MINUS', 'MODULE', 'MULT', 'NEQ', 'NOT', 'NUMBER', 'OR', 'PLUS', 'PRINT', 'RBRACKET', 'RETURN', 'RKEY', 'RPAREN', 'SEMICOLON', 'SIZE', 'STRING', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_STRING>\\"([^\\\\\\n]|(\\\\.))*?\\")|(?P<t_BOOLEAN>\\btrue\\b|\\bfalse\\b)|(?P<t_ID>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_NUMBER>\\d+(\\.\\d+)?)|(?P<t_COMMENT>//.*)|(?P<t_newline>\\n+)|(?P<t_OR>\\|\\|)|(?P<t_AND>&&)|(?P<t_DOT>\\.)|(?P<t_EQ>==)|(?P<t_GREATEREQ>>=)|(?P<t_LBRACKET>\\[)|(?P<t_LESSEQ><=)|(?P<t_LKEY>\\{)|(?P<t_LPAREN>\\()|(?P<t_MULT>\\*)|(?P<t_NEQ>!=)|(?P<t_PLUS>\\+)|(?P<t_RBRACKET>\\])|(?P<t_RKEY>\\})|(?P<t_RPAREN>\\))|(?P<t_COLON>:)|(?P<t_COMMA>,)|(?P<t_DIVIDE>/)|(?P<t_EQUALS>=)|(?P<t_GREATER>>)|(?P<t_LESS><)|(?P<t_MINUS>-)|(?P<t_MODULE>%)|(?P<t_NOT>!)|(?P<t_SEMICOLON>;)', [None, ('t_STRING', 'STRING'), None, None, ('t_BOOLEAN', 'BOOLEAN'), ('t_ID', 'ID'), ('t_NUMBER', 'NUMBER'), None, ('t_COMMENT', 'COMMENT'), ('t_newline', 'newline'), (None, 'OR'), (None, 'AND'), (None, 'DOT'), (None, 'EQ'), (None, 'GREATEREQ'), (None, 'LBRACKET'), (None, 'LESSEQ'), (None, 'LKEY'), (None, 'LPAREN'), (None, 'MULT'), (None, 'NEQ'), (None, 'PLUS'), (None, 'RBRACKET'), (None, 'RKEY'), (None, 'RPAREN'), (None, 'COLON'), (None, 'COMMA'), (None, 'DIVIDE'), (None, 'EQUALS'), (None, 'GREATER'), (None, 'LESS'), (None, 'MINUS'), (None, 'MODULE'), (None, 'NOT'), (None, 'SEMICOLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_lexsignature = 1072734616
@@ -0,0 +1,125 @@
+import argparse
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from cache import load_program
+from interprete import Interpreter
+
+# Ejecuta muchos programas en un pool de procesos y escribe un reporte JSONL con
+# una línea por programa: salida, error y tiempo de ejecución.
+#
+#   python lote.py programas/ --inputs entradas/ --report reporte.jsonl
+#
+# La entrada de cada programa (lo que leen sus input(...)) es el archivo con el
+# mismo nombre y extensión .in, en --inputs o junto al programa.
+
+_options = None
+
+
+def init_worker(options):
+    # Una vez por proceso: importar parser.py ya cargó las tablas LALR; un análisis
+    # de prueba deja listo el lexer. Cada programa usa copias de estos objetos.
+    global _options
+    _options = options
+    Interpreter(output=io.StringIO()).parse('x = 0;')
+
+
+def input_path(script, inputs_dir):
+    name = os.path.splitext(os.path.basename(script))[0] + '.in'
+    directory = inputs_dir if inputs_dir else os.path.dirname(script)
+    path = os.path.join(directory, name)
+    return path if os.path.exists(path) else None
+
+
+def run_script(script):
+    engine = _options['engine']
+    stdin_path = input_path(script, _options['inputs'])
+    output = io.StringIO()
+    warnings = io.StringIO()
+    result = {'script': script, 'engine': engine, 'input': stdin_path,
+              'ok': False, 'error': None, 'syntax_errors': 0}
+    interpreter = None
+    start = time.perf_counter()
+    try:
+        with open(script, 'r', encoding='utf-8') as file:
+            code = file.read()
+        if stdin_path is not None:
+            with open(stdin_path, 'r', encoding='utf-8') as file:
+                stdin = io.StringIO(file.read())
+        else:
+            # Sin archivo de entrada, input() encuentra fin de archivo
+            stdin = io.StringIO()
+        # workers=1: un proceso del pool (daemon) no puede crear los de map y filter
+        interpreter = Interpreter(output=output, input=stdin, verbose=_options['verbose'],
+                                  optimize=_options['optimize'], memoize=_options['memoize'],
+                                  warnings=warnings, workers=1)
+        if _options['cache']:
+            program = load_program(code, os.path.dirname(os.path.abspath(script)), engine, interpreter)
+        else:
+            program = interpreter.parse(code)
+        if program is not None:
+            result['syntax_errors'] = program.syntax_errors
+            interpreter.run(program, engine)
+        result['ok'] = program is not None and not program.syntax_errors
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    result['output'] = output.getvalue()
+    # Los avisos del análisis previo (ver Interpreter.verify)
+    result['warnings'] = warnings.getvalue().splitlines()
+    if interpreter is not None:
+        result['memo'] = {name: dict(zip(('hits', 'misses', 'skipped', 'size', 'active'), stats))
+                          for name, stats in interpreter.memo_stats().items()}
+    return result
+
+
+def collect_scripts(paths, pattern):
+    scripts = []
+    for path in paths:
+        if os.path.isdir(path):
+            scripts.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            scripts.append(path)
+    return scripts
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Ejecuta muchos programas en paralelo')
+    arguments.add_argument('paths', nargs='+', help='archivos fuente o directorios')
+    arguments.add_argument('--pattern', default='*.txt', help='archivos a tomar de cada directorio (por defecto *.txt)')
+    arguments.add_argument('--inputs', help='directorio con los archivos .in de cada programa (por defecto, junto al programa)')
+    arguments.add_argument('--report', default='reporte.jsonl', help='reporte JSONL de salida')
+    arguments.add_argument('--engine', choices=['tree', 'vm', 'py'], default='tree')
+    arguments.add_argument('--jobs', type=int, default=os.cpu_count(), help='procesos del pool')
+    arguments.add_argument('--chunksize', type=int, default=8, help='programas que recibe cada proceso por vez')
+    arguments.add_argument('--no-cache', action='store_true', help='no usar la caché de programas analizados')
+    arguments.add_argument('--no-optimize', action='store_true', help='no optimizar el árbol antes de ejecutar')
+    arguments.add_argument('--no-memo', action='store_true', help='no memoizar las funciones puras')
+    arguments.add_argument('-v', '--verbose', action='count', default=0,
+                           help='incluir los mensajes de depuración de input() y de las listas')
+    args = arguments.parse_args(argv)
+
+    scripts = collect_scripts(args.paths, args.pattern)
+    options = {'engine': args.engine, 'inputs': args.inputs, 'cache': not args.no_cache,
+               'verbose': args.verbose, 'optimize': not args.no_optimize, 'memoize': not args.no_memo}
+
+    start = time.perf_counter()
+    failed = 0
+    with multiprocessing.Pool(args.jobs, initializer=init_worker, initargs=(options,)) as pool, \
+            open(args.report, 'w', encoding='utf-8') as report:
+        for result in pool.imap(run_script, scripts, chunksize=args.chunksize):
+            failed += not result['ok']
+            report.write(json.dumps(result, ensure_ascii=False) + '\n')
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(scripts)} programas, {failed} con errores, {elapsed:.2f}s -> {args.report}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,90 @@
-from parser import parser
+import argparse
+import os
+import sys
+
+from cache import load_program
+from interprete import Interpreter
+from paralelo import CHUNK_SIZE
+
+arguments = argparse.ArgumentParser(description='Ejecuta un programa del lenguaje')
+arguments.add_argument('file', nargs='?', default='input.txt', help='archivo fuente (por defecto input.txt)')
+arguments.add_argument('--engine', choices=['tree', 'vm', 'py'], default='tree',
+                       help='motor de ejecución: recorrido del árbol, máquina virtual de bytecode o traducción a Python')
+arguments.add_argument('--no-cache', action='store_true',
+                       help="no leer ni escribir programas ya analizados en __cache__ junto al archivo")
+arguments.add_argument('-v', '--verbose', action='count', default=0,
+                       help='mostrar los mensajes de depuración de input() y de las listas')
+arguments.add_argument('--no-optimize', action='store_true',
+                       help='ejecutar el árbol tal como sale del parser, sin optimizarlo')
+arguments.add_argument('--no-memo', action='store_true',
+                       help='no memoizar las funciones puras')
+arguments.add_argument('--no-check', action='store_true',
+                       help='no avisar antes de ejecutar los errores seguros (variables sin asignar, tipos que no se pueden operar)')
+arguments.add_argument('--memo-stats', action='store_true',
+                       help='al terminar, mostrar en stderr los aciertos y fallos de la memoización')
+arguments.add_argument('--dump-python', metavar='ARCHIVO',
+                       help="escribir el módulo de Python generado en ARCHIVO ('-': la salida estándar) sin ejecutarlo")
+arguments.add_argument('--profile', action='store_true',
+                       help='al terminar, mostrar en stderr el tiempo y las ejecuciones de cada línea y función')
+arguments.add_argument('--profile-stacks', metavar='ARCHIVO',
+                       help='con --profile, escribir además las pilas colapsadas para flamegraph.pl en ARCHIVO')
+arguments.add_argument('--stream', action='store_true',
+                       help='ejecutar cada sentencia apenas se analiza, sin esperar el resto del archivo '
+                            '(motor del árbol; las funciones deben definirse antes de llamarlas)')
+arguments.add_argument('--workers', type=int, metavar='N',
+                       help='procesos para map y filter con funciones puras (por defecto uno por núcleo; 1: sin procesos)')
+arguments.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, metavar='N',
+                       help=f'elementos que recibe cada proceso por vez en map y filter (por defecto {CHUNK_SIZE})')
+args = arguments.parse_args()
+if args.workers is not None and args.workers < 1 or args.chunk_size < 1:
+    arguments.error('--workers y --chunk-size deben ser al menos 1')
+if args.stream and (args.engine != 'tree' or args.profile or args.profile_stacks or args.dump_python):
+    arguments.error('--stream ejecuta con el motor del árbol: no se puede usar con --engine vm ni py, '
+                    '--profile ni --dump-python')
+if (args.profile or args.profile_stacks) and args.engine != 'tree':
+    arguments.error('--profile mide el motor del árbol: no se puede usar con --engine vm ni py')
 
 # Read the input file and execute the program
-with open('input.txt', 'r', encoding='utf-8') as file:
+with open(args.file, 'r', encoding='utf-8') as file:
     code = file.read()
+# Los import se buscan junto al archivo
+directory = os.path.dirname(os.path.abspath(args.file))
 
+interpreter = Interpreter(verbose=args.verbose, optimize=not args.no_optimize, memoize=not args.no_memo,
+                          check=not args.no_check, workers=args.workers or os.cpu_count() or 1,
+                          chunk_size=args.chunk_size)
+if args.profile or args.profile_stacks:
+    from profilador import Profiler
+    interpreter.profiler = Profiler()
 try:
-    parser.parse(code)
+    if args.stream:
+        # Se ejecuta mientras se analiza: no queda un programa que correr ni guardar
+        interpreter.stream(code, directory)
+        program = None
+    elif args.no_cache:
+        program = interpreter.parse(code, directory)
+    else:
+        program = load_program(code, directory, args.engine, interpreter)
+    if program is not None and args.dump_python:
+        if args.dump_python == '-':
+            print(program.transpile(), end='')
+        else:
+            with open(args.dump_python, 'w', encoding='utf-8') as file:
+                file.write(program.transpile())
+    elif program is not None:
+        interpreter.run(program, args.engine)
 except Exception as e:
-    print(f"Error: {e}")
\ No newline at end of file
+    print(f"Error: {e}")
+
+if interpreter.profiler is not None:
+    if args.profile:
+        print(interpreter.profiler.report(code), end='', file=sys.stderr)
+    if args.profile_stacks:
+        with open(args.profile_stacks, 'w', encoding='utf-8') as file:
+            file.write(interpreter.profiler.collapsed_stacks())
+
+if args.memo_stats:
+    print(f"{'función':<20} {'aciertos':>10} {'fallos':>10} {'sin clave':>10} {'guardados':>10}", file=sys.stderr)
+    for name, (hits, misses, skipped, size, active) in interpreter.memo_stats().items():
+        state = '' if active else '  (desactivada: pocos aciertos)'
+        print(f"{name:<20} {hits:>10} {misses:>10} {skipped:>10} {size:>10}{state}", file=sys.stderr)
@@ -0,0 +1,313 @@
+from parser import Undefined, counted_values
+from memoizacion import MemoCache
+from salida import TRACE
+from diccionarios import has_key, keys_of, missing_key, put_key, remove_key
+from textos import Rope, concat, text
+from vectores import numeric_list, reduce_list
+from compilador import (
+    MOVE, ADD, SUB, MULT, DIVIDE, LESS, GREATER, LESSEQ, GREATEREQ, EQ, NEQ,
+    AND, OR, NOT, JUMP_IF_FALSE, JUMP, LOAD_GLOBAL, CALL, RETURN_VALUE, PRINT, INPUT,
+    BUILD_LIST, LIST_GET, LIST_SIZE, LIST_INSERT, LIST_EXPLODE, LIST_SET, TAIL_CALL,
+    LIST_REDUCE, FOR_PREP, FOR_NEXT, BUILD_DICT, HAS_KEY, REMOVE_KEY, PUT_KEY, KEYS, CONCAT,
+    MATERIALIZE, CALL_LIST,
+)
+
+DONE = object()  # fin del iterador de FOR_NEXT
+
+# Motivos por los que execute() vuelve sin terminar, cuando corre por tramos
+# (ver planificador.py): se agotó el tramo de pasos o un input() espera su línea
+PAUSED = object()
+WAITING_INPUT = object()
+
+
+def registers_template(code_object, locals_):
+    # Archivo de registros inicial de un código: [locales | constantes | temporales]
+    registers = locals_ + code_object.consts
+    return registers + [None] * (code_object.size - len(registers))
+
+
+class VM:
+    def __init__(self, program, interpreter):
+        self.program = program
+        self.interpreter = interpreter
+        main = program.main
+        # El archivo de registros del programa principal es la tabla de globales
+        variables = interpreter.variables
+        self.globals = registers_template(
+            main, [variables.get(name, Undefined(name)) for name in main.local_names])
+        # Instrucciones ya decodificadas en tuplas para el bucle de despacho
+        self.main = main.instructions()
+        # nombre -> (código, instrucciones, registros iniciales, inicios de las locales
+        # que no son parámetros)
+        self.functions = {
+            name: (code, code.instructions(),
+                   registers_template(code, [Undefined(local) for local in code.local_names]),
+                   code.global_inits[code.parameters:])
+            for name, code in program.functions.items()
+        }
+        # Ejecución por tramos: con slice, execute() vuelve (PAUSED) después de esa
+        # cantidad de pasos, y resume() sigue desde ahí. Un paso es una vuelta de un
+        # bucle o una llamada: todo programa que no termina pasa por ellos. Sin
+        # slice, execute() corre hasta el final y input() lee con read_line().
+        self.slice = None
+        self.remaining = None  # pasos del tramo que no se usaron, al volver
+        self.state = None      # (código, pc, registros, pila) de la ejecución pausada
+        self.line = None       # la línea (o el error) para el input() que esperaba
+
+    def frame(self, name, args):
+        # Instrucciones y archivo de registros de una llamada. Cada llamada tiene su
+        # propio archivo de registros: cuesta O(locales), sin importar cuántas
+        # globales haya
+        if name not in self.functions:
+            raise ValueError(f"Undefined function '{name}'")
+        code, instructions, template, inits = self.functions[name]
+        registers = template[:]
+        count = code.parameters
+        if len(args) >= count:
+            registers[:count] = args[:count]
+        else:
+            count = len(args)
+            registers[:count] = args
+            inits = code.global_inits[count:]
+        globals_ = self.globals
+        for local, global_ in inits:
+            registers[local] = globals_[global_]
+        return instructions, registers
+
+    def call(self, name, args):
+        return self.execute(*self.frame(name, args))
+
+    def resume(self):
+        code, pc, r, stack = self.state
+        self.state = None
+        return self.execute(code, r, pc, stack)
+
+    def execute(self, code, r, pc=0, stack=None):
+        # La pila de llamadas es propia, no la de Python: CALL guarda el frame actual
+        # (instrucciones, pc, registros, registro destino) y RETURN_VALUE lo
+        # recupera. La profundidad de la recursión solo está limitada por la memoria.
+        # Las llamadas a funciones memoizadas guardan además la caché y la clave
+        # donde se anota el resultado al volver. Como todo el estado está en
+        # (code, pc, r, stack), la ejecución puede pausarse y seguir después.
+        if stack is None:
+            stack = []
+        budget = self.slice
+        memo = self.interpreter.memo
+        MISSING = MemoCache.MISSING
+        g = self.globals
+        write = self.interpreter.write
+        # Los mensajes de depuración se deciden una vez por ejecución, no por instrucción
+        trace = self.interpreter.trace if self.interpreter.verbose >= TRACE else None
+
+        while True:
+            op, a, b, c = code[pc]
+            pc += 1
+
+            if op == MOVE:
+                value = r[b]
+                if value.__class__ is Undefined:
+                    value.fail()
+                r[a] = value
+            elif op <= NEQ:  # operadores binarios ADD..NEQ
+                if op == ADD:
+                    r[a] = r[b] + r[c]
+                elif op == SUB:
+                    r[a] = r[b] - r[c]
+                elif op == LESS:
+                    r[a] = r[b] < r[c]
+                elif op == MULT:
+                    r[a] = r[b] * r[c]
+                elif op == GREATER:
+                    r[a] = r[b] > r[c]
+                elif op == LESSEQ:
+                    r[a] = r[b] <= r[c]
+                elif op == GREATEREQ:
+                    r[a] = r[b] >= r[c]
+                elif op == EQ:
+                    r[a] = r[b] == r[c]
+                elif op == NEQ:
+                    r[a] = r[b] != r[c]
+                elif op == DIVIDE:
+                    r[a] = r[b] / r[c]
+                else:
+                    r[a] = r[b] % r[c]
+            elif op == JUMP_IF_FALSE:
+                if not r[a]:
+                    pc = c
+            elif op == JUMP:
+                pc = c
+                if budget is not None:
+                    budget -= 1
+                    if not budget:
+                        self.state, self.remaining = (code, pc, r, stack), 0
+                        return PAUSED
+            elif op == FOR_NEXT:
+                value = next(r[a], DONE)
+                if value is not DONE:
+                    r[b] = value
+                    pc = c
+                    if budget is not None:
+                        budget -= 1
+                        if not budget:
+                            self.state, self.remaining = (code, pc, r, stack), 0
+                            return PAUSED
+            elif op == LOAD_GLOBAL:
+                r[a] = g[b]
+            elif op == CALL or op == TAIL_CALL:
+                name, arguments = r[b]
+                args = [r[argument] for argument in arguments]
+                cache = memo.get(name)
+                key = None
+                if cache is not None:
+                    key, value = cache.lookup(args)
+                    if value is not MISSING:
+                        r[a] = value
+                        continue
+                # En TAIL_CALL el frame de la función que termina se descarta y la
+                # recursión de cola no hace crecer la pila; salvo que haya que anotar el
+                # resultado en la caché: entonces es un CALL, y la instrucción
+                # siguiente devuelve el valor
+                if op == CALL or key is not None:
+                    stack.append((code, pc, r, a, cache, key))
+                code, r = self.frame(name, args)
+                pc = 0
+                if budget is not None:
+                    budget -= 1
+                    if not budget:
+                        self.state, self.remaining = (code, pc, r, stack), 0
+                        return PAUSED
+            elif op == RETURN_VALUE:
+                if not stack:
+                    self.remaining = budget
+                    return r[a]
+                value = r[a]
+                code, pc, r, a, cache, key = stack.pop()
+                if key is not None:
+                    cache.store(key, value)
+                r[a] = value
+            elif op == AND or op == OR:
+                # Como en el árbol, el lado derecho se evalúa siempre: una variable
+                # sin valor es un error aunque el izquierdo ya decida
+                right = r[c]
+                if right.__class__ is Undefined:
+                    right.fail()
+                r[a] = (r[b] and right) if op == AND else (r[b] or right)
+            elif op == NOT:
+                r[a] = not r[b]
+            elif op == PRINT:
+                write(*[r[register] for register in r[b]])
+            elif op == INPUT:
+                if budget is not None and self.line is None:
+                    # Por tramos, la línea se espera fuera de la VM: al seguir, el
+                    # mismo INPUT la toma de self.line
+                    self.state, self.remaining = (code, pc - 1, r, stack), budget
+                    return WAITING_INPUT
+                try:
+                    if budget is None:
+                        user_input = self.interpreter.read_line()
+                    else:
+                        user_input, self.line = self.line, None
+                        if isinstance(user_input, Exception):
+                            raise user_input
+                    r[a] = user_input
+                    if trace:
+                        trace(f"Asignado: {r[b]} = {user_input}")
+                except Exception as e:
+                    write(f"Error al leer la entrada: {e}")
+            elif op == BUILD_LIST:
+                r[a] = numeric_list([r[register] for register in r[b]])
+            elif op == LIST_GET:
+                try:
+                    r[a] = r[b][r[c]]
+                except IndexError:
+                    raise IndexError(f"get(): Índice {r[c]} fuera de rango") from None
+                except KeyError:
+                    raise missing_key('get', r[c]) from None
+            elif op == LIST_SIZE:
+                r[a] = len(r[b])
+            elif op == LIST_INSERT:
+                list_val = r[b]
+                list_val.append(r[c])
+                if trace:
+                    trace(f"Elemento insertado: {r[c]}")
+                r[a] = list_val
+            elif op == LIST_EXPLODE:
+                list_val = r[b]
+                try:
+                    removed_element = list_val.pop(r[c])
+                except IndexError:
+                    raise IndexError(f"explode(): Índice {r[c]} fuera de rango") from None
+                if trace:
+                    trace(f"Elemento removido en posición {r[c]}: {removed_element}")
+                r[a] = list_val
+            elif op == LIST_SET:
+                try:
+                    r[a][r[b]] = r[c]
+                except IndexError:
+                    raise IndexError(f"set(): Índice {r[b]} fuera de rango") from None
+                if trace:
+                    trace(f"Elemento en posición {r[b]} actualizado a: {r[c]}")
+            elif op == LIST_REDUCE:
+                r[a] = reduce_list(r[c], r[b])
+            elif op == BUILD_DICT:
+                entries = r[b]
+                r[a] = {r[entries[i]]: r[entries[i + 1]] for i in range(0, len(entries), 2)}
+            elif op == HAS_KEY:
+                r[a] = has_key(r[b], r[c])
+            elif op == REMOVE_KEY:
+                removed_element = remove_key(r[b], r[c])
+                if trace:
+                    trace(f"Elemento removido en {r[c]!r}: {removed_element}")
+                r[a] = r[b]
+            elif op == PUT_KEY:
+                key, value = r[c]
+                put_key(r[b], r[key], r[value])
+                if trace:
+                    trace(f"Elemento en {r[key]!r} actualizado a: {r[value]}")
+                r[a] = r[b]
+            elif op == KEYS:
+                r[a] = keys_of(r[b])
+            elif op == CONCAT:
+                r[a] = concat(r[b], r[c])
+            elif op == MATERIALIZE:
+                if r[a].__class__ is Rope:
+                    r[a] = r[a].text()
+            elif op == CALL_LIST:
+                operation, name = r[c]
+                r[a] = self.apply(operation, name, r[b])
+            elif op == FOR_PREP:
+                variable, step, comparison = r[b]
+                start = r[variable]
+                if start.__class__ is Undefined:
+                    start.fail()
+                r[a] = iter(counted_values(start, r[c], step, comparison))
+            else:
+                raise ValueError(f"Opcode desconocido {op}")
+
+    def apply(self, operation, name, collection):
+        # map/filter (ver paralelo.py). Cada llamada corre entera, sin tramos: la
+        # ejecución pausada no podría seguir desde dentro de apply_function
+        from paralelo import apply_function, cached
+        if name not in self.functions:
+            raise ValueError(f"Undefined function '{name}'")
+        function = cached(self.interpreter, name, lambda *args: self.call(name, list(args)))
+        saved, self.slice = self.slice, None
+        try:
+            return apply_function(self.interpreter, operation, name, collection, 'vm', function)
+        finally:
+            self.slice = saved
+
+    def run(self):
+        # También con error: lo que el programa ya asignó queda, como en el árbol
+        # y el motor py (una entrada del REPL que falla a la mitad)
+        try:
+            self.execute(self.main, self.globals)
+        finally:
+            self.publish()
+
+    def publish(self):
+        # Las variables globales quedan visibles para el resto del intérprete; un
+        # texto a medio armar (answer dentro del bucle), ya armado
+        for index, name in enumerate(self.program.main.local_names):
+            if not isinstance(self.globals[index], Undefined):
+                self.interpreter.variables[name] = text(self.globals[index])
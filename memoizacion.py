@@ -0,0 +1,201 @@
+from collections import OrderedDict
+
+from parser import (
+    Variable, Local, Assign, IfElse, Block, WhileLoop, ForLoop, Return, ExpressionStatement,
+    FunctionCall, ListOperation, Materialize, READ_OPERATIONS, CALL_OPERATIONS, is_call, walk,
+)
+
+# Memoización automática de funciones puras. Una función es pura si su resultado
+# depende solo de sus argumentos y llamarla no tiene efectos:
+#
+# - no usa show ni input
+# - no modifica listas ni diccionarios (insert, explode, lista[i] = x, put, remove)
+# - no lee variables globales, ni locales que puedan no tener valor todavía
+#   (esas ven la global del mismo nombre)
+# - solo llama a funciones puras
+#
+# (Asignar globales dentro de una función ya es imposible: toda variable
+# asignada es local.)
+#
+# Cada función pura tiene su propia caché LRU. Solo se guardan llamadas cuyos
+# argumentos son enteros o textos, para que dos claves iguales sean valores
+# idénticos (1 == 1.0 == true, pero no se muestran igual), y resultados
+# inmutables, para que nadie modifique un valor guardado. Tampoco las que no
+# pasan todos los parámetros: los que faltan ven la global del mismo nombre, que
+# no forma parte de la clave.
+#
+# Una función barata llamada siempre con argumentos distintos solo paga el costo
+# de la caché: si después de MEMO_TRIAL fallos hay menos de un acierto cada
+# MEMO_RATIO fallos, la caché de esa función se desactiva.
+
+MEMO_SIZE = 10000
+MEMO_TRIAL = 1024
+MEMO_RATIO = 8
+
+KEY_TYPES = (int, str)
+CACHEABLE = (int, float, str, bool, type(None))
+
+
+class MemoCache:
+    MISSING = object()  # valor de una llamada que no está guardada
+
+    def __init__(self, maxsize=MEMO_SIZE, parameters=0):
+        self.maxsize = maxsize
+        self.parameters = parameters  # cuántos parámetros tiene la función
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0  # llamadas con argumentos que no sirven de clave, o que faltan
+        self.active = True
+
+    def lookup(self, args):
+        # Devuelve (clave, valor). El valor es MISSING si hay que calcularlo, y la
+        # clave es None si el resultado no puede guardarse.
+        if not self.active:
+            return None, self.MISSING
+        if len(args) < self.parameters:
+            self.skipped += 1
+            return None, self.MISSING
+        for arg in args:
+            if type(arg) not in KEY_TYPES:
+                self.skipped += 1
+                return None, self.MISSING
+        key = tuple(args)
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return key, entries[key]
+        self.misses += 1
+        if self.misses == MEMO_TRIAL and self.hits * MEMO_RATIO < self.misses:
+            self.active = False
+            entries.clear()
+            return None, self.MISSING
+        return key, self.MISSING
+
+    def store(self, key, value):
+        if type(value) not in CACHEABLE:
+            return
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+
+def memoized(function, cache):
+    # function(*args) pasando por la caché: las funciones del motor py y las que
+    # llaman map y filter (ver paralelo.py)
+    MISSING = cache.MISSING
+
+    def call(*args):
+        if not cache.active:
+            return function(*args)
+        key, value = cache.lookup(args)
+        if value is MISSING:
+            value = function(*args)
+            if key is not None:
+                cache.store(key, value)
+        return value
+
+    return call
+
+
+def pure_functions(functions, known=()):
+    # Primero se descartan las funciones impuras por sí mismas; después, hasta que
+    # no cambie nada, las que llaman a alguna función que no es pura. known: nombres
+    # de funciones de fuera de 'functions' que ya se sabe que son puras
+    calls = {}
+    for name, function in functions.items():
+        callees = set()
+        if PurityCheck(callees).function(function):
+            calls[name] = callees
+    changed = True
+    while changed:
+        changed = False
+        for name, callees in list(calls.items()):
+            if not all(callee in calls or callee in known for callee in callees):
+                del calls[name]
+                changed = True
+    return sorted(calls)
+
+
+def callers(functions, names):
+    # Los nombres de names y los de las funciones que llaman a alguna de ellas,
+    # directa o indirectamente (con f(...) o con map y filter)
+    calls = {name: {node.name if isinstance(node, FunctionCall) else node.argument.value
+                    for node in walk(function.block) if is_call(node)}
+             for name, function in functions.items()}
+    result = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name, callees in calls.items():
+            if name not in result and callees & result:
+                result.add(name)
+                changed = True
+    return result
+
+
+class PurityCheck:
+    def __init__(self, callees):
+        self.callees = callees
+
+    def function(self, function):
+        return self.statements(function.block.statements, set(function.parameters))
+
+    def statements(self, statements, assigned):
+        return all(self.statement(statement, assigned) for statement in statements)
+
+    def statement(self, node, assigned):
+        # assigned: locales que seguro tienen valor en este punto; se actualiza
+        if isinstance(node, Assign):
+            if not isinstance(node.target, Local) or not self.expression(node.expression, assigned):
+                return False
+            assigned.add(node.target.name)
+            return True
+        if isinstance(node, (ExpressionStatement, Return)):
+            return self.expression(node.expression, assigned)
+        if isinstance(node, Block):
+            return self.statements(node.statements, assigned)
+        if isinstance(node, Materialize):
+            # Solo cambia cómo se guarda un texto de sus locales
+            return True
+        if isinstance(node, IfElse):
+            if not self.expression(node.condition, assigned):
+                return False
+            if_assigned = set(assigned)
+            if not self.statement(node.if_block, if_assigned):
+                return False
+            if node.else_block is None:
+                return True
+            else_assigned = set(assigned)
+            if not self.statement(node.else_block, else_assigned):
+                return False
+            # Lo asignado en las dos ramas tiene valor después del if
+            assigned |= if_assigned & else_assigned
+            return True
+        if isinstance(node, WhileLoop):
+            return (self.expression(node.condition, assigned) and
+                    self.statement(node.block, set(assigned)))
+        if isinstance(node, ForLoop):
+            if not self.statement(node.init, assigned) or not self.expression(node.condition, assigned):
+                return False
+            inner = set(assigned)
+            return self.statement(node.block, inner) and self.statement(node.update, inner)
+        # show, input y cualquier sentencia desconocida
+        return False
+
+    def expression(self, node, assigned):
+        for child in walk(node):
+            if isinstance(child, Variable):
+                return False
+            if isinstance(child, Local) and child.name not in assigned:
+                return False
+            if isinstance(child, ListOperation) and child.operation in CALL_OPERATIONS:
+                # map/filter con una función pura no modifica la lista
+                self.callees.add(child.argument.value)
+            elif isinstance(child, ListOperation) and child.operation not in READ_OPERATIONS:
+                return False
+            if isinstance(child, FunctionCall):
+                self.callees.add(child.name)
+        return True
@@ -0,0 +1,119 @@
+import copy
+import os
+
+from cache import module_cache_path, read_cache, source_state, write_cache
+from parser import Program, get_lexer, get_parser, parse
+from plano import FlatTree
+
+# Programas de varios archivos. import "ruta"; en el nivel superior agrega al
+# programa las funciones (mission) de otro archivo, con la ruta relativa al
+# archivo que importa:
+#
+#   import "geometria.txt";
+#   show(area(3, 4));
+#
+# Del módulo solo se toman las funciones, incluidas las de sus propios import;
+# sus otras sentencias no se ejecutan. Una función del programa reemplaza a una
+# importada con el mismo nombre, y entre módulos gana el último import.
+#
+# Cada módulo se analiza una vez por proceso. MODULES guarda su árbol plano (ver
+# plano.py), del que cada import arma objetos nuevos: el optimizador modifica el
+# árbol del programa que lo usa. Si cambian la fecha de modificación o el tamaño
+# del archivo se vuelve a leer, y solo se analiza si cambió su contenido. El
+# árbol plano también se guarda en __cache__ junto al módulo, con el hash del
+# contenido como nombre (ver cache.py), así otro proceso no lo vuelve a analizar.
+# El programa recuerda el estado de cada archivo que importó (Program.modules):
+# load_program descarta el programa guardado si alguno cambió.
+#
+# Los errores (un archivo que no está, uno con errores de sintaxis, un módulo que
+# se importa a sí mismo, directa o indirectamente) se informan como los de
+# sintaxis, y el programa sigue sin esas funciones:
+#
+#   Import error: ciclo a.txt -> b.txt -> a.txt on line 1
+
+MODULES = {}  # ruta absoluta -> Module
+
+
+class Module:
+    def __init__(self, state, flat, imports, parsed=None):
+        self.state = state      # (fecha de modificación, tamaño, hash) del archivo
+        self.flat = flat        # FlatTree con las funciones del módulo
+        self.imports = imports  # [(ruta como se escribió, línea)] de sus import
+        self.parsed = parsed    # las funciones recién analizadas, para el primer import
+
+    def functions(self):
+        # Objetos nuevos para cada import: la primera vez los del análisis, después
+        # armados desde el árbol plano
+        parsed, self.parsed = self.parsed, None
+        return parsed if parsed is not None else self.flat.program().functions
+
+
+def resolve_imports(program, directory='.', output=None):
+    # Agrega al programa las funciones de sus import, con las rutas relativas a
+    # directory; los errores se escriben en output y cuentan en syntax_errors
+    if program.imports:
+        Importer(output).resolve(program, directory)
+    return program
+
+
+class Importer:
+    def __init__(self, output):
+        self.output = output
+        self.loading = []  # los módulos que se están cargando, en orden: un ciclo vuelve a uno
+
+    def resolve(self, program, directory):
+        functions = {}
+        for node in program.imports:
+            try:
+                self.load(os.path.join(directory, node.path), functions, program.modules)
+            except ValueError as e:
+                print(f"Import error: {e} on line {node.line}", file=self.output)
+                program.syntax_errors += 1
+                self.loading = []
+        functions.update(program.functions)
+        program.functions = functions
+
+    def load(self, path, functions, modules):
+        # Agrega a functions las del módulo, después de las de sus import
+        path = os.path.abspath(path)
+        if path in self.loading:
+            cycle = self.loading[self.loading.index(path):] + [path]
+            raise ValueError('ciclo ' + ' -> '.join(os.path.relpath(module) for module in cycle))
+        module = self.module(path)
+        modules[path] = module.state
+        self.loading.append(path)
+        for name, _ in module.imports:
+            self.load(os.path.join(os.path.dirname(path), name), functions, modules)
+        self.loading.pop()
+        functions.update(module.functions())
+
+    def module(self, path):
+        # El módulo desde MODULES, desde __cache__ o analizando el archivo
+        module = MODULES.get(path)
+        try:
+            if module is not None:
+                stat = os.stat(path)
+                if (stat.st_mtime_ns, stat.st_size) == module.state[:2]:
+                    return module
+            state, code = source_state(path)
+        except (OSError, UnicodeDecodeError):
+            raise ValueError(f"no se puede leer '{os.path.relpath(path)}'") from None
+        if module is not None and module.state[2] == state[2]:
+            module.state = state
+            return module
+        cache = module_cache_path(code, os.path.dirname(path))
+        entry = read_cache(cache)
+        parsed = None
+        if entry is None:
+            # Un lexer y un parser propios: el import puede llegar en medio de otro
+            # análisis (Interpreter.stream)
+            lexer = get_lexer().clone()
+            lexer.output = self.output
+            program = parse(code, lexer, copy.copy(get_parser()))
+            if program is None or program.syntax_errors:
+                raise ValueError(f"'{os.path.relpath(path)}' tiene errores de sintaxis")
+            parsed = program.functions
+            entry = (FlatTree(Program(list(parsed.values()))), [(node.path, node.line) for node in program.imports])
+            write_cache(cache, entry)
+        module = MODULES[path] = Module(state, *entry, parsed)
+        return module
@@ -0,0 +1,306 @@
+from parser import (
+    Number, String, Boolean, Variable, Local, BinOp, NotOp, Negate, Assign, Print,
+    ExpressionStatement, IfElse, Block, ForLoop, CountedLoop, FunctionCall, List,
+    Dict, ListOperation, Input, Concat, Materialize, READ_OPERATIONS, WRITE_OPERATIONS,
+    COUNTED_COMPARISONS, at, is_call, walk, rewrite,
+)
+from tipos import specialize
+
+# Optimizaciones sobre el árbol, entre el análisis y la ejecución. Todos los
+# motores (árbol, bytecode y Python) ejecutan el árbol ya optimizado:
+#
+# - plegado de constantes: 2*3+1 -> 7, !true -> false
+# - ramas muertas: if(true){A}else{B} -> A, while(false){...} desaparece
+# - menos unario: 0 - x (como lo arma el parser) -> Negate(x)
+# - invariantes de bucles: las expresiones que no cambian entre iteraciones (por
+#   ejemplo lista.size() en la condición) se calculan una vez antes del bucle,
+#   en una variable ·invN (ver TEMP_PREFIX)
+# - bucles contados: for (i = 0; i < n; i = i + 1) recorre un range de Python
+#   (ver CountedLoop en parser.py)
+# - textos armados en bucles: s = s + x agrega x a una Rope en lugar de copiar s
+#   (ver textos.py)
+# - nodos especializados por tipos: i + 1 con i seguro entero, variables que seguro
+#   tienen valor (ver tipos.py)
+#
+# Un programa optimizado produce la misma salida que sin optimizar y falla en los
+# mismos casos, después de la misma salida. Pero si tiene más de un error puede
+# cambiar cuál se informa: una invariante sacada de un bucle se calcula antes que
+# el resto de la condición y que las asignaciones del principio del cuerpo, aunque
+# esté en una sentencia posterior, y su error se informa con la línea del bucle.
+
+CONSTANTS = (Number, String, Boolean)
+
+# Nombre de las variables de las invariantes: el lexer no arma identificadores con
+# '·', así que no chocan con las del programa; con el prefijo v_ del motor py
+# (ver transpilador.py) siguen siendo nombres válidos de Python
+TEMP_PREFIX = '·inv'
+
+# Un texto plegado más largo que esto se sigue calculando al ejecutar
+MAX_FOLDED_STRING = 4096
+
+
+def constant(node):
+    return isinstance(node, CONSTANTS)
+
+
+def same_variable(node, variable):
+    return type(node) is type(variable) and node.name == variable.name
+
+
+def constant_node(value):
+    if isinstance(value, str):
+        return String(value)
+    return Number(value)
+
+
+class Optimizer:
+    def __init__(self):
+        self.temps = 0
+
+    def optimize_program(self, program):
+        self.function = None
+        program.statements = self.statements(program.statements)
+        for function in program.functions.values():
+            self.function = function
+            function.block = self.statement(function.block)
+
+    def statements(self, statements):
+        result = []
+        for statement in statements:
+            statement = self.statement(statement)
+            if statement is not None:
+                result.append(statement)
+        return result
+
+    # Sentencias: devuelven la sentencia optimizada, o None si no hace nada
+
+    def statement(self, node):
+        method = getattr(self, 'statement_' + type(node).__name__, None)
+        if method is not None:
+            return method(node)
+        # Asignación, show, input, answer y expresiones sueltas
+        rewrite(node, self.expression)
+        return node
+
+    def statement_Block(self, node):
+        node.statements = self.statements(node.statements)
+        return node
+
+    def statement_IfElse(self, node):
+        node.condition = self.expression(node.condition)
+        node.if_block = self.statement(node.if_block)
+        if node.else_block is not None:
+            node.else_block = self.statement(node.else_block)
+        if constant(node.condition):
+            return node.if_block if node.condition.value else node.else_block
+        return node
+
+    def statement_WhileLoop(self, node):
+        node.condition = self.expression(node.condition)
+        if constant(node.condition) and not node.condition.value:
+            return None
+        node.block = self.statement(node.block)
+        return self.builders(node, self.hoist(node))
+
+    def statement_ForLoop(self, node):
+        node.init = self.statement(node.init)
+        node.condition = self.expression(node.condition)
+        if constant(node.condition) and not node.condition.value:
+            return node.init
+        node.update = self.statement(node.update)
+        node.block = self.statement(node.block)
+        result = self.hoist(node)
+        # Después de sacar las invariantes: i < l.size() ya es i < ·invN
+        self.counted(node)
+        return self.builders(node, result)
+
+    def counted(self, loop):
+        # for (i = a; i < b; i = i + k) pasa a ser un CountedLoop si k es un entero
+        # constante que va en la dirección de la comparación, b es una constante o
+        # una variable que el bucle no asigna (las funciones no pueden asignar
+        # variables de quien las llama), e i solo se asigna en la actualización
+        condition, update = loop.condition, loop.update
+        if not (isinstance(condition, BinOp) and condition.op in COUNTED_COMPARISONS and
+                isinstance(condition.left, (Variable, Local))):
+            return
+        variable = condition.left
+        increment = update.expression if isinstance(update, Assign) else None
+        if not (isinstance(increment, BinOp) and same_variable(update.target, variable) and
+                increment.op in ('+', '-') and same_variable(increment.left, variable) and
+                isinstance(increment.right, Number) and type(increment.right.value) is int):
+            return
+        step = increment.right.value if increment.op == '+' else -increment.right.value
+        if step == 0 or (step > 0) != (condition.op in ('<', '<=')):
+            return
+        assigned = {node.target.name for node in walk(loop.block)
+                    if isinstance(node, (Assign, Input)) and isinstance(node.target, (Variable, Local))}
+        stop = condition.right
+        if variable.name in assigned:
+            return
+        if not (constant(stop) or isinstance(stop, (Variable, Local)) and
+                stop.name not in assigned and stop.name != variable.name):
+            return
+        loop.__class__ = CountedLoop
+        loop.step = step
+
+    def builders(self, loop, result):
+        # s = s + x (o s = s + x + y...) pasa a armar una Rope si el bucle no lee ni
+        # asigna s de ninguna otra forma. Una global, además, solo si el bucle no
+        # llama funciones, que podrían leerla. result es lo que reemplaza al bucle
+        # (él mismo o el bloque de hoist); después va un Materialize.
+        nodes = list(walk(loop))
+        calls = any(is_call(node) for node in nodes)
+        appends = {}     # nombre -> [los + de cada s = s + ...]
+        allowed = set()  # id de las lecturas y asignaciones de s que son parte de esos
+        for node in nodes:
+            if isinstance(node, Assign) and isinstance(node.target, (Variable, Local)):
+                chain = []
+                leaf = node.expression
+                while isinstance(leaf, BinOp) and leaf.op == '+':
+                    chain.append(leaf)
+                    leaf = leaf.left
+                if chain and same_variable(leaf, node.target):
+                    appends.setdefault(node.target.name, []).extend(chain)
+                    allowed.update((id(node.target), id(leaf)))
+            elif isinstance(node, Materialize):
+                # Un bucle de adentro que ya arma s
+                allowed.update(id(target) for target in node.targets)
+        used = {node.name for node in nodes
+                if isinstance(node, (Variable, Local)) and id(node) not in allowed}
+        targets = []
+        for name, chain in appends.items():
+            variable = chain[-1].left
+            if name in used or (calls and isinstance(variable, Variable)):
+                continue
+            for operation in chain:
+                operation.__class__ = Concat
+            targets.append(Local(name, variable.slot) if isinstance(variable, Local) else Variable(name))
+        if not targets:
+            return result
+        names = {target.name for target in targets}
+        for node in nodes:
+            if isinstance(node, Materialize):
+                # Este bucle termina de armarlas: no hace falta en cada vuelta
+                node.targets = [target for target in node.targets if target.name not in names]
+        line = getattr(loop, 'line', 0)
+        return at(Block([result, at(Materialize(targets), line)]), line)
+
+    # Expresiones
+
+    def expression(self, node):
+        rewrite(node, self.expression)
+        if isinstance(node, BinOp):
+            if constant(node.left) and constant(node.right):
+                return self.fold(node)
+            if isinstance(node.left, Number) and type(node.left.value) is int \
+                    and node.left.value == 0 and node.op == '-':
+                return Negate(node.right)
+        elif isinstance(node, (NotOp, Negate)) and constant(node.expression):
+            return self.fold(node)
+        return node
+
+    def fold(self, node):
+        # Las constantes no leen variables, así que se evalúan sin frame. Si la
+        # operación falla (1/0, "a" - 1) el error queda para la ejecución. Un
+        # resultado inf o nan también se pliega (ver Transpiler.expression_Number).
+        try:
+            value = node.evaluate(None)
+        except Exception:
+            return node
+        if isinstance(value, str) and len(value) > MAX_FOLDED_STRING:
+            return node
+        return constant_node(value)
+
+    # Invariantes de bucles
+
+    def hoist(self, loop):
+        parts = [loop.condition, loop.block]
+        if isinstance(loop, ForLoop):
+            parts.append(loop.update)
+        nodes = [node for part in parts for node in walk(part)]
+        # Con llamadas o listas (o diccionarios) modificados en el bucle cualquier
+        # valor puede cambiar aunque la variable no se reasigne
+        if any(is_call(node) or
+               (isinstance(node, ListOperation) and node.operation in WRITE_OPERATIONS)
+               for node in nodes):
+            return loop
+        self.assigned = {node.target.name for node in nodes
+                         if isinstance(node, (Assign, Input)) and isinstance(node.target, (Variable, Local))}
+
+        # La condición se evalúa al menos una vez: lo suyo se calcula antes del bucle
+        before = []
+        loop.condition = self.extract(loop.condition, before)
+
+        # El cuerpo puede no ejecutarse nunca: lo suyo se calcula solo si la
+        # condición se cumple, para no agregar errores que el programa no tenía.
+        # Solo se toman las asignaciones del principio del cuerpo y la primera
+        # sentencia después de ellas, que se ejecutan antes de cualquier show: un
+        # error que el programa tenga sigue apareciendo después de la misma salida.
+        guarded = []
+        for statement in loop.block.statements:
+            if isinstance(statement, Assign) and isinstance(statement.target, (Variable, Local)):
+                statement.expression = self.extract(statement.expression, guarded)
+                continue
+            if isinstance(statement, Print):
+                statement.expressions = [self.extract(expression, guarded)
+                                         for expression in statement.expressions]
+            elif isinstance(statement, ExpressionStatement):
+                statement.expression = self.extract(statement.expression, guarded)
+            break
+
+        if not before and not guarded:
+            return loop
+        # Lo que se saca del bucle cuenta como de la línea del bucle
+        line = getattr(loop, 'line', 0)
+        for statement in before + guarded:
+            at(statement, line)
+        statements = []
+        if isinstance(loop, ForLoop):
+            statements.append(loop.init)
+            loop.init = Block([])
+        statements.extend(before)
+        if guarded:
+            # La condición no tiene llamadas ni efectos: evaluarla una vez más es seguro
+            statements.append(at(IfElse(loop.condition, at(Block(guarded + [loop]), line)), line))
+        else:
+            statements.append(loop)
+        return at(Block(statements), line)
+
+    def invariant(self, node):
+        # Sin listas modificadas en el bucle, size(), pick(), sum(), min() y max() de
+        # una lista que no se reasigna también son invariantes (y pick(), size() y
+        # has() de un diccionario); un literal [..] o {..} no, crea uno nuevo
+        for child in walk(node):
+            if isinstance(child, (FunctionCall, List, Dict, Input)):
+                return False
+            if isinstance(child, ListOperation) and child.operation not in READ_OPERATIONS:
+                return False
+            if isinstance(child, (Variable, Local)) and child.name in self.assigned:
+                return False
+        return True
+
+    def extract(self, node, hoisted):
+        # Reemplaza cada subexpresión invariante (que no sea ya una constante o una
+        # variable) por una variable temporal calculada antes del bucle
+        if isinstance(node, (BinOp, NotOp, Negate, ListOperation)) and self.invariant(node):
+            read, target = self.temp()
+            hoisted.append(Assign(target, node))
+            return read
+        rewrite(node, lambda child: self.extract(child, hoisted))
+        return node
+
+    def temp(self):
+        name = f"{TEMP_PREFIX}{self.temps}"
+        self.temps += 1
+        if self.function is None:
+            return Variable(name), Variable(name)
+        # Dentro de una función la temporal es una local más
+        slot = len(self.function.locals)
+        self.function.locals.append(name)
+        return Local(name, slot), Local(name, slot)
+
+
+def optimize_program(program):
+    Optimizer().optimize_program(program)
+    # Con el árbol ya optimizado, los nodos especializados por tipos (ver tipos.py)
+    specialize(program)
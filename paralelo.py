@@ -0,0 +1,113 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from memoizacion import memoized
+from parser import Program
+from plano import FlatTree
+from vectores import NumericList, numeric_list
+
+# map y filter: lista.map(f) es la lista de f(x) para cada elemento x, y
+# lista.filter(f) la de los elementos x con f(x) verdadero, en el mismo orden. f
+# es el nombre de una función del programa (de un diccionario, se recorren sus
+# claves).
+#
+#   mission cuadrado(x) { answer x * x; }
+#   show([1, 2, 3].map(cuadrado));          [1, 4, 9]
+#
+# Si f es pura (ver memoizacion.py: no muestra, no lee globales, no modifica
+# listas) y la lista tiene más de chunk_size elementos, los elementos se reparten
+# en tramos de chunk_size entre los procesos de un ProcessPoolExecutor, y los
+# resultados vuelven en orden. Cada proceso arma una sola vez, al empezar, un
+# intérprete con las funciones puras del programa en el mismo motor; después
+# solo recibe tramos. Una función que no es pura (o una lista corta, o un solo
+# proceso) se llama en el mismo proceso, elemento por elemento, como un bucle.
+#
+# Con un error en algún elemento se informa el del primero que falla, como en el
+# recorrido en orden: una función pura no tiene efectos que se vean antes.
+
+CHUNK_SIZE = 1000
+
+# Funciones del proceso de trabajo (start_worker): nombre -> función(x)
+_functions = None
+
+
+def cached(interpreter, name, function):
+    # La función, pasando por su caché si es pura y se memoiza
+    cache = interpreter.memo.get(name)
+    return function if cache is None else memoized(function, cache)
+
+
+def tree_function(interpreter, name):
+    function = interpreter.functions[name]
+    return cached(interpreter, name, lambda *args: function.execute(interpreter, list(args)))
+
+
+def apply_function(interpreter, operation, name, collection, engine, function=None):
+    # function: la función en el motor que ejecuta el programa (por defecto, el árbol)
+    if function is None:
+        if name not in interpreter.functions:
+            raise ValueError(f"Undefined function '{name}'")
+        function = tree_function(interpreter, name)
+    if not isinstance(collection, (list, NumericList, dict)):
+        raise ValueError(f"{operation}() requiere una lista")
+    values = list(collection)
+    pool = None
+    if name in interpreter.pure and len(values) > interpreter.chunk_size:
+        pool = interpreter.worker_pool(engine)
+    if pool is not None:
+        results = pool.map(name, values, interpreter.chunk_size)
+    else:
+        results = [function(value) for value in values]
+    if operation == 'filter':
+        return numeric_list([value for value, keep in zip(values, results) if keep])
+    return numeric_list(results)
+
+
+class WorkerPool:
+    def __init__(self, functions, engine, workers, memoize=True):
+        self.engine = engine
+        # Las funciones viajan como árbol plano (ver plano.py): pickle no recorre
+        # el árbol de objetos, que puede ser más profundo que su límite
+        flat = FlatTree(Program(list(functions.values())))
+        self.executor = ProcessPoolExecutor(workers, initializer=start_worker, initargs=(flat, engine, memoize))
+
+    def map(self, name, values, chunk_size):
+        futures = [self.executor.submit(run_chunk, name, values[start:start + chunk_size])
+                   for start in range(0, len(values), chunk_size)]
+        results = []
+        try:
+            for future in futures:
+                results.extend(future.result())
+        finally:
+            # Si un tramo falla, los que no empezaron ya no hacen falta
+            for future in futures:
+                future.cancel()
+        return results
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def start_worker(flat, engine, memoize):
+    global _functions
+    from interprete import Interpreter
+    program = flat.program()
+    # Sin procesos propios: un map dentro de una función pura corre en orden
+    interpreter = Interpreter(output=io.StringIO(), memoize=memoize, workers=1)
+    interpreter.register(program)
+    if engine == 'vm':
+        from maquina import VM
+        vm = VM(program.compile(), interpreter)
+        _functions = {name: cached(interpreter, name, lambda *args, name=name: vm.call(name, list(args)))
+                      for name in program.functions}
+    elif engine == 'py':
+        from transpilador import load
+        namespace = load(program.transpile(), interpreter)
+        _functions = {name: namespace['f_' + name] for name in program.functions}
+    else:
+        _functions = {name: tree_function(interpreter, name) for name in program.functions}
+
+
+def run_chunk(name, values):
+    function = _functions[name]
+    return [function(value) for value in values]
@@ -1,8 +1,14 @@
-import ply.yacc as yacc
-from lexico import tokens
-
-variables = {}
-functions = {}
+import copyreg
+import operator
+import os
+import threading
+from functools import cache
+
+from lexico import tokens, get_lexer
+from salida import TRACE
+from diccionarios import KEYED_METHODS, has_key, keys_of, missing_key, put_key, remove_key
+from textos import Rope, concat
+from vectores import REDUCTIONS, numeric_list, reduce_list
 
 # Precedencia de operadores
 precedence = (
@@ -14,65 +20,158 @@ precedence = (
     ('left', 'MULT', 'DIVIDE', 'MODULE'),
     ('right', 'NOT'),
     ('right', 'UMINUS'),
+    ('left', 'DOT'),  # a < l.size() es a < (l.size())
 )
 
 
-class Number:
+class Frame:
+    # Registro de activación de una llamada: las variables locales de la función,
+    # ya resueltas a posiciones fijas. El programa principal usa un Frame vacío.
+    # Las globales, las funciones, la salida y la entrada son del intérprete.
+    __slots__ = ('interpreter', 'globals', 'slots')
+
+    def __init__(self, interpreter, slots):
+        self.interpreter = interpreter
+        self.globals = interpreter.variables
+        self.slots = slots
+
+class Undefined:
+    # Valor de una variable local que todavía no tiene valor ni existe como global.
+    # Cualquier uso reporta el mismo error que una variable global indefinida.
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        object.__setattr__(self, 'name', name)
+
+    def fail(self, *args):
+        raise ValueError(f"Undefined variable '{object.__getattribute__(self, 'name')}'")
+
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = fail
+    __truediv__ = __rtruediv__ = __mod__ = __rmod__ = fail
+    __lt__ = __gt__ = __le__ = __ge__ = __eq__ = __ne__ = fail
+    __bool__ = __len__ = __getitem__ = __setitem__ = __str__ = __repr__ = fail
+
+    def __getattr__(self, attribute):
+        self.fail()
+
+# Cada nodo declara en 'fields' los atributos que contienen nodos hijos (o listas
+# de nodos), para poder recorrer el árbol sin conocer cada clase, y en __slots__
+# todos sus atributos: sin un __dict__ por nodo, el árbol de un programa grande
+# ocupa un tercio menos (ver benchmarks/bench_memoria.py, y plano.py para
+# guardarlo todavía más chico).
+
+class Node:
+    # 'line' es la línea del código fuente (ver at()); los nodos que arma el
+    # optimizador pueden no tenerla
+    __slots__ = ('line',)
+
+    # Para pickle (la caché de programas): el estado es una tupla con los valores de
+    # los slots, más chica y rápida de leer que el diccionario que arma pickle por
+    # defecto. Un slot sin valor (la línea, el paso de un ForLoop) se guarda como ...
+    def __reduce__(self):
+        return copyreg.__newobj__, (type(self),), tuple(getattr(self, name, ...) for name in slot_names(type(self)))
+
+    def __setstate__(self, state):
+        for name, value in zip(slot_names(type(self)), state):
+            if value is not ...:
+                setattr(self, name, value)
+
+
+@cache
+def slot_names(kind):
+    return tuple(name for klass in reversed(kind.__mro__) for name in getattr(klass, '__slots__', ()))
+
+class Number(Node):
+    fields = ()
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
-    def evaluate(self):
+    def evaluate(self, frame):
         return self.value
 
-class String:
+class String(Node):
+    fields = ()
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
-    def evaluate(self):
+    def evaluate(self, frame):
         return self.value
 
-    def evaluate(self):
-        return self.value
+class Boolean(Node):
+    fields = ()
+    __slots__ = ('value',)
 
-class Boolean:
     def __init__(self, value):
         self.value = value
 
-    def evaluate(self):
+    def evaluate(self, frame):
         return self.value
 
-class Input:
+class Input(Node):
+    fields = ('target',)
+    __slots__ = ('target',)
+
     def __init__(self, target):
-        self.target = target  # Debería ser una instancia de Variable
+        self.target = target  # Debería ser una instancia de Variable o Local
 
-    def execute(self):
+    def execute(self, frame):
         try:
             # Leer la entrada del usuario
-            user_input = input()
+            user_input = frame.interpreter.read_line()
             # Asignar la entrada a la variable
-            variables[self.target.name] = user_input
-            print(f"Asignado: {self.target.name} = {user_input}")  # Mensaje de depuración
+            if isinstance(self.target, Local):
+                frame.slots[self.target.slot] = user_input
+            else:
+                frame.globals[self.target.name] = user_input
+            if frame.interpreter.verbose >= TRACE:
+                frame.interpreter.trace(f"Asignado: {self.target.name} = {user_input}")
         except Exception as e:
-            print(f"Error al leer la entrada: {e}")
+            frame.interpreter.write(f"Error al leer la entrada: {e}")
+
+class Variable(Node):
+    fields = ()
+    __slots__ = ('name',)
 
-class Variable:
     def __init__(self, name):
         self.name = name
 
-    def evaluate(self):
-        if self.name not in variables:
+    def evaluate(self, frame):
+        if self.name not in frame.globals:
             raise ValueError(f"Undefined variable '{self.name}'")
-        return variables[self.name]
+        return frame.globals[self.name]
+
+class Local(Node):
+    # Variable local de una función (parámetro o asignada en su cuerpo),
+    # resuelta al crear la función a su posición en el Frame
+    fields = ()
+    __slots__ = ('name', 'slot')
+
+    def __init__(self, name, slot):
+        self.name = name
+        self.slot = slot
+
+    def evaluate(self, frame):
+        value = frame.slots[self.slot]
+        if value.__class__ is Undefined:
+            value.fail()
+        return value
+
+class BinOp(Node):
+    fields = ('left', 'right')
+    __slots__ = ('left', 'op', 'right')
 
-class BinOp:
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
 
-    def evaluate(self):
-        left_val = self.left.evaluate()
-        right_val = self.right.evaluate()
+    def evaluate(self, frame):
+        left_val = self.left.evaluate(frame)
+        right_val = self.right.evaluate(frame)
         
         # Define las operaciones binarias
         if self.op == '+': return left_val + right_val
@@ -90,175 +189,507 @@ class BinOp:
         if self.op == '||': return left_val or right_val
         raise ValueError(f"Operador desconocido '{self.op}'")
 
-class NotOp:
+# Nodos especializados (ver tipos.py). El análisis de tipos cambia la clase de un
+# BinOp cuyos operandos son seguro enteros por la de su operación, que no busca el
+# operador en cada evaluación, y la de una variable que seguro ya tiene valor por
+# una que no lo verifica. Calculan lo mismo que el nodo general: los compiladores
+# los tratan como él (ver kind_name).
+
+class IntAdd(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) + self.right.evaluate(frame)
+
+class IntSub(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) - self.right.evaluate(frame)
+
+class IntMult(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) * self.right.evaluate(frame)
+
+class IntDivide(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) / self.right.evaluate(frame)
+
+class IntMod(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) % self.right.evaluate(frame)
+
+class IntLess(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) < self.right.evaluate(frame)
+
+class IntGreater(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) > self.right.evaluate(frame)
+
+class IntLessEq(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) <= self.right.evaluate(frame)
+
+class IntGreaterEq(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) >= self.right.evaluate(frame)
+
+class IntEq(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) == self.right.evaluate(frame)
+
+class IntNeq(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return self.left.evaluate(frame) != self.right.evaluate(frame)
+
+INT_OPERATIONS = {
+    '+': IntAdd, '-': IntSub, '*': IntMult, '/': IntDivide, '%': IntMod, '<': IntLess,
+    '>': IntGreater, '<=': IntLessEq, '>=': IntGreaterEq, '==': IntEq, '!=': IntNeq,
+}
+
+class DefinedVariable(Variable):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return frame.globals[self.name]
+
+class DefinedLocal(Local):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return frame.slots[self.slot]
+
+SPECIALIZED = {**{kind: BinOp for kind in INT_OPERATIONS.values()},
+               DefinedVariable: Variable, DefinedLocal: Local}
+
+def kind_name(node):
+    # Nombre con el que los compiladores despachan un nodo
+    kind = type(node)
+    return SPECIALIZED.get(kind, kind).__name__
+
+class Concat(BinOp):
+    # s + x dentro de un bucle que arma el texto s (ver Optimizer.builders): el
+    # resultado puede ser una Rope (ver textos.py), que solo puede guardarse en s.
+    # No calcula lo mismo que el + común, así que los compiladores la tratan aparte.
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return concat(self.left.evaluate(frame), self.right.evaluate(frame))
+
+class NotOp(Node):
+    fields = ('expression',)
+    __slots__ = ('expression',)
+
+    def __init__(self, expression):
+        self.expression = expression
+
+    def evaluate(self, frame):
+        return not self.expression.evaluate(frame)
+
+class Negate(Node):
+    # -x. El parser lo arma como 0 - x y el optimizador lo reemplaza por este
+    # nodo; se calcula igual (así -x de 0.0 sigue siendo 0.0) con un nodo menos
+    fields = ('expression',)
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
-    def evaluate(self):
-        return not self.expression.evaluate()
+    def evaluate(self, frame):
+        return 0 - self.expression.evaluate(frame)
+
+class Assign(Node):
+    fields = ('target', 'expression')
+    __slots__ = ('target', 'expression')
 
-class Assign:
     def __init__(self, target, expression):
         self.target = target
         self.expression = expression
 
-    def execute(self):
-        if isinstance(self.target, Variable):
-            value = self.expression.evaluate()
-            variables[self.target.name] = value
+    def execute(self, frame):
+        if isinstance(self.target, Local):
+            frame.slots[self.target.slot] = self.expression.evaluate(frame)
+        elif isinstance(self.target, Variable):
+            value = self.expression.evaluate(frame)
+            frame.globals[self.target.name] = value
         elif isinstance(self.target, ListOperation) and self.target.operation == 'set':
             self.target.value = self.expression
-            self.target.evaluate()
+            self.target.evaluate(frame)
         else:
             raise ValueError("Invalid assignment target")
 
 
 
-class Print:
+class Materialize(Node):
+    # Después de un bucle con Concat: las variables que armaba vuelven a ser textos.
+    # Una variable que no tiene valor (el bucle no dio ninguna vuelta) queda igual.
+    fields = ('targets',)
+    __slots__ = ('targets',)
+
+    def __init__(self, targets):
+        self.targets = targets
+
+    def execute(self, frame):
+        for target in self.targets:
+            if isinstance(target, Local):
+                value = frame.slots[target.slot]
+                if value.__class__ is Rope:
+                    frame.slots[target.slot] = value.text()
+            else:
+                value = frame.globals.get(target.name)
+                if value.__class__ is Rope:
+                    frame.globals[target.name] = value.text()
+
+class ExpressionStatement(Node):
+    fields = ('expression',)
+    __slots__ = ('expression',)
+
+    def __init__(self, expression):
+        self.expression = expression
+
+    def execute(self, frame):
+        # Se evalúa por sus efectos (p. ej. lista.insert(4);) y se descarta el valor
+        self.expression.evaluate(frame)
+
+class Print(Node):
+    fields = ('expressions',)
+    __slots__ = ('expressions',)
+
     def __init__(self, expressions):
         self.expressions = expressions
 
-    def execute(self):
-        values = [expr.evaluate() for expr in self.expressions]
-        print(*values)
+    def execute(self, frame):
+        values = [expr.evaluate(frame) for expr in self.expressions]
+        frame.interpreter.write(*values)
+
+class IfElse(Node):
+    fields = ('condition', 'if_block', 'else_block')
+    __slots__ = ('condition', 'if_block', 'else_block')
 
-class IfElse:
     def __init__(self, condition, if_block, else_block=None):
         self.condition = condition
         self.if_block = if_block
         self.else_block = else_block
 
-    def execute(self):
-        if self.condition.evaluate():
-            return self.if_block.execute()
+    def execute(self, frame):
+        if self.condition.evaluate(frame):
+            return self.if_block.execute(frame)
         elif self.else_block:
-            return self.else_block.execute()
+            return self.else_block.execute(frame)
+
+class Block(Node):
+    fields = ('statements',)
+    __slots__ = ('statements',)
 
-class Block:
     def __init__(self, statements):
         self.statements = statements
 
-    def execute(self):
+    def execute(self, frame):
         for stmt in self.statements:
-            result = stmt.execute()
-            # Si encontramos un retorno, lo propagamos
+            result = stmt.execute(frame)
+            # Si encontramos un retorno (aunque venga de un bloque anidado), lo propagamos
             if isinstance(result, Return):
-                return result.expression.evaluate()
+                return result
         return None
 
-class WhileLoop:
+class WhileLoop(Node):
+    fields = ('condition', 'block')
+    __slots__ = ('condition', 'block')
+
     def __init__(self, condition, block):
         self.condition = condition
         self.block = block
 
-    def execute(self):
-        while self.condition.evaluate():
-            self.block.execute()
+    def execute(self, frame):
+        while self.condition.evaluate(frame):
+            result = self.block.execute(frame)
+            if isinstance(result, Return):
+                return result
+
+class ForLoop(Node):
+    fields = ('init', 'condition', 'update', 'block')
+    __slots__ = ('init', 'condition', 'update', 'block', 'step')
 
-class ForLoop:
     def __init__(self, init, condition, update, block):
         self.init = init
         self.condition = condition
         self.update = update
         self.block = block
 
-    def execute(self):
-        self.init.execute()
-        while self.condition.evaluate():
-            self.block.execute()
-            self.update.execute()
+    def execute(self, frame):
+        self.init.execute(frame)
+        while self.condition.evaluate(frame):
+            result = self.block.execute(frame)
+            if isinstance(result, Return):
+                return result
+            self.update.execute(frame)
+
+# Comparaciones de la condición de un CountedLoop
+COUNTED_COMPARISONS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+def counted_values(start, stop, step, op):
+    # Los valores que toma la variable de un CountedLoop: un range si los límites
+    # son enteros; si no, los mismos que recorrería el bucle común
+    if type(start) is int and type(stop) is int:
+        if op == '<=':
+            stop += 1
+        elif op == '>=':
+            stop -= 1
+        return range(start, stop, step)
+    return stepped_values(start, stop, step, COUNTED_COMPARISONS[op])
+
+def stepped_values(value, stop, step, compare):
+    while compare(value, stop):
+        yield value
+        value = value + step
+
+class CountedLoop(ForLoop):
+    # for (i = a; i < b; i = i + k) donde k es un entero constante, b no cambia
+    # durante el bucle e i no se asigna en el cuerpo (ver Optimizer.counted, que
+    # cambia la clase del ForLoop). La variable recorre un range de Python en lugar
+    # de evaluar la condición y la actualización como nodos en cada vuelta. Vale
+    # también para <=, y para > y >= con k negativo. El paso k está en 'step', un
+    # slot de ForLoop: para cambiar la clase, las dos tienen que ocupar lo mismo.
+    __slots__ = ()
+
+    def execute(self, frame):
+        self.init.execute(frame)
+        variable = self.condition.left
+        start = variable.evaluate(frame)
+        values = counted_values(start, self.condition.right.evaluate(frame), self.step, self.condition.op)
+        block = self.block
+        if isinstance(variable, Local):
+            slots, slot = frame.slots, variable.slot
+            for value in values:
+                slots[slot] = value
+                result = block.execute(frame)
+                if isinstance(result, Return):
+                    return result
+        else:
+            variables, name = frame.globals, variable.name
+            for value in values:
+                variables[name] = value
+                result = block.execute(frame)
+                if isinstance(result, Return):
+                    return result
+        # Como en el bucle común, i termina con el primer valor que no cumple la condición
+        if self.condition.evaluate(frame):
+            self.update.execute(frame)
+
+class Function(Node):
+    fields = ('block',)
+    __slots__ = ('name', 'parameters', 'block', 'locals')
 
-class Function:
     def __init__(self, name, parameters, block):
         self.name = name
         self.parameters = parameters
         self.block = block
+        # Las locales son los parámetros y toda variable asignada en el cuerpo;
+        # el resto de los nombres se leen de la tabla global
+        self.locals = list(parameters)
+        for node in walk(block):
+            if isinstance(node, (Assign, Input)) and isinstance(node.target, Variable):
+                if node.target.name not in self.locals:
+                    self.locals.append(node.target.name)
+        slots = {name: slot for slot, name in enumerate(self.locals)}
+
+        def resolve(node):
+            if isinstance(node, Variable) and node.name in slots:
+                return Local(node.name, slots[node.name])
+            rewrite(node, resolve)
+            return node
+
+        rewrite(self, resolve)
+
+    def execute(self, interpreter, args):
+        # El costo de una llamada depende de sus locales, no de cuántas globales haya.
+        # Una local que se lee antes de asignarse ve la global del mismo nombre, como
+        # cuando la función trabajaba sobre una copia de las variables.
+        variables = interpreter.variables
+        count = min(len(args), len(self.parameters))
+        slots = list(args[:count])
+        for name in self.locals[count:]:
+            slots.append(variables[name] if name in variables else Undefined(name))
+        frame = Frame(interpreter, slots)
+
+        result = self.block.execute(frame)
 
-    def execute(self, args):
-        prev_variables = variables.copy()
-        for param, arg in zip(self.parameters, args):
-            variables[param] = arg
+        # Retornar el resultado si lo hay
+        if isinstance(result, Return):
+            return result.expression.evaluate(frame)
+        return None
 
-        result = self.block.execute()
+class Import(Node):
+    # import "ruta"; en el nivel superior: agrega las funciones de otro archivo (ver
+    # modulos.py). No se ejecuta: el programa lo guarda aparte, en 'imports'
+    fields = ()
+    __slots__ = ('path',)
 
-        # Restaurar las variables después de ejecutar la función
-        variables.clear()
-        variables.update(prev_variables)
+    def __init__(self, path):
+        self.path = path
 
-        # Retornar el resultado si lo hay
-        return result
+class FunctionCall(Node):
+    fields = ('arguments',)
+    __slots__ = ('name', 'arguments')
 
-class FunctionCall:
     def __init__(self, name, arguments):
         self.name = name
         self.arguments = arguments
 
-    def evaluate(self):
+    def evaluate(self, frame):
+        functions = frame.interpreter.functions
         if self.name in functions:
             func = functions[self.name]
-            args = [arg.evaluate() for arg in self.arguments]
-            return func.execute(args)
+            args = [arg.evaluate(frame) for arg in self.arguments]
+            cache = frame.interpreter.memo.get(self.name)
+            if cache is None:
+                return func.execute(frame.interpreter, args)
+            key, value = cache.lookup(args)
+            if value is cache.MISSING:
+                value = func.execute(frame.interpreter, args)
+                if key is not None:
+                    cache.store(key, value)
+            return value
         else:
             raise ValueError(f"Undefined function '{self.name}'")
 
-class Return:
+class Return(Node):
+    fields = ('expression',)
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
-    def execute(self):
+    def execute(self, frame):
         return self  # Se devuelve a sí misma para ser manejada en el bloque
 
-class List:
+class List(Node):
+    fields = ('elements',)
+    __slots__ = ('elements',)
+
     def __init__(self, elements):
         self.elements = elements
 
-    def evaluate(self):
-        return [element.evaluate() for element in self.elements]
+    def evaluate(self, frame):
+        # Todos enteros o todos reales: una NumericList (ver vectores.py)
+        return numeric_list([element.evaluate(frame) for element in self.elements])
+
+class Dict(Node):
+    # {clave: valor, ...} (ver diccionarios.py). Se evalúa como en Python: cada
+    # clave y después su valor, en orden.
+    fields = ('keys', 'values')
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+    def evaluate(self, frame):
+        return {key.evaluate(frame): value.evaluate(frame) for key, value in zip(self.keys, self.values)}
+
+# Métodos de lista (y de diccionario) que no la modifican. keys() tampoco, pero
+# arma una lista nueva cada vez.
+READ_OPERATIONS = ('get', 'size', 'has') + tuple(REDUCTIONS)
+# Los que sí
+WRITE_OPERATIONS = ('insert', 'explode', 'set', 'put', 'remove')
+# Los que llaman a una función del programa con cada elemento (ver paralelo.py):
+# pueden hacer lo mismo que una llamada
+CALL_OPERATIONS = ('map', 'filter')
+
+class ListOperation(Node):
+    fields = ('list_expr', 'argument', 'value')
+    __slots__ = ('list_expr', 'operation', 'argument', 'value')
 
-class ListOperation:
     def __init__(self, list_expr, operation, argument=None, value=None):
         self.list_expr = list_expr
         self.operation = operation
         self.argument = argument
         self.value = value
 
-    def evaluate(self):
-        list_val = self.list_expr.evaluate()
+    def evaluate(self, frame):
+        list_val = self.list_expr.evaluate(frame)
         if self.operation == 'insert':
             if self.argument is None:
                 raise ValueError("insert() requiere un argumento")
             # Supongamos que insert actúa como append
-            list_val.append(self.argument.evaluate())
-            print(f"Elemento insertado: {self.argument.evaluate()}")  # Depuración
+            value = self.argument.evaluate(frame)
+            list_val.append(value)
+            if frame.interpreter.verbose >= TRACE:
+                frame.interpreter.trace(f"Elemento insertado: {value}")
             return list_val
         elif self.operation == 'explode':
             if self.argument is None:
                 raise ValueError("explode() requiere un índice")
-            index = self.argument.evaluate()
+            index = self.argument.evaluate(frame)
             try:
                 removed_element = list_val.pop(index)
-                print(f"Elemento removido en posición {index}: {removed_element}")  # Depuración
+                if frame.interpreter.verbose >= TRACE:
+                    frame.interpreter.trace(f"Elemento removido en posición {index}: {removed_element}")
                 return list_val
             except IndexError:
                 raise IndexError(f"explode(): Índice {index} fuera de rango")
         elif self.operation == 'get':
             if self.argument is None:
                 raise ValueError("get() requiere un índice")
-            index = self.argument.evaluate()
+            index = self.argument.evaluate(frame)
             try:
                 return list_val[index]
             except IndexError:
                 raise IndexError(f"get(): Índice {index} fuera de rango")
+            except KeyError:
+                raise missing_key('get', index) from None
         elif self.operation == 'size':
             return len(list_val)
+        elif self.operation in REDUCTIONS:
+            return reduce_list(self.operation, list_val)
+        elif self.operation == 'has':
+            return has_key(list_val, self.argument.evaluate(frame))
+        elif self.operation == 'keys':
+            return keys_of(list_val)
+        elif self.operation in CALL_OPERATIONS:
+            from paralelo import apply_function
+            return apply_function(frame.interpreter, self.operation, self.argument.value, list_val, 'tree')
+        elif self.operation == 'remove':
+            key = self.argument.evaluate(frame)
+            removed_element = remove_key(list_val, key)
+            if frame.interpreter.verbose >= TRACE:
+                frame.interpreter.trace(f"Elemento removido en {key!r}: {removed_element}")
+            return list_val
+        elif self.operation == 'put':
+            key = self.argument.evaluate(frame)
+            value = self.value.evaluate(frame)
+            put_key(list_val, key, value)
+            if frame.interpreter.verbose >= TRACE:
+                frame.interpreter.trace(f"Elemento en {key!r} actualizado a: {value}")
+            return list_val
         elif self.operation == 'set':
             if self.argument is None or self.value is None:
                 raise ValueError("set() requiere un índice y un valor")
-            index = self.argument.evaluate()
-            value = self.value.evaluate()
+            index = self.argument.evaluate(frame)
+            value = self.value.evaluate(frame)
             try:
                 list_val[index] = value
-                print(f"Elemento en posición {index} actualizado a: {value}")  # Depuración
+                if frame.interpreter.verbose >= TRACE:
+                    frame.interpreter.trace(f"Elemento en posición {index} actualizado a: {value}")
             except IndexError:
                 raise IndexError(f"set(): Índice {index} fuera de rango")
             return list_val
@@ -266,25 +697,120 @@ class ListOperation:
             raise ValueError(f"Método de lista desconocido '{self.operation}'")
         return list_val
 
-    def execute(self):
+    def execute(self, frame):
         # Para operaciones que modifican la lista sin retornar valor
-        self.evaluate()
-
-
+        self.evaluate(frame)
 
+class Program:
+    # Resultado de parser.parse(): el árbol del programa, sin ejecutar. Lo ejecuta
+    # un Interpreter (ver interprete.py), así que puede correrse muchas veces.
+    def __init__(self, statements):
+        self.functions = {stmt.name: stmt for stmt in statements if isinstance(stmt, Function)}
+        self.imports = [stmt for stmt in statements if isinstance(stmt, Import)]
+        self.statements = [stmt for stmt in statements if not isinstance(stmt, (Function, Import))]
+        self.modules = {}  # ruta -> estado de cada archivo importado (ver modulos.py)
+        self.bytecode = None
+        self.python = None
+        self.syntax_errors = 0
+        self.optimized = False
+        self.pure = None
+        self.type_errors = None  # errores seguros, sin las variables de antes (ver tipos.py)
+
+    def optimize(self):
+        if not self.optimized:
+            from optimizador import optimize_program
+            optimize_program(self)
+            self.optimized = True
+            # El bytecode y el módulo de Python se generan a partir del árbol nuevo
+            self.bytecode = self.python = self.pure = None
+        return self
+
+    def pure_functions(self):
+        # Nombres de las funciones que pueden memoizarse (ver memoizacion.py)
+        if self.pure is None:
+            from memoizacion import pure_functions
+            self.pure = pure_functions(self.functions)
+        return self.pure
+
+    def compile(self):
+        if self.bytecode is None:
+            from compilador import compile_program
+            self.bytecode = compile_program(self.statements, self.functions)
+        return self.bytecode
+
+    def transpile(self):
+        if self.python is None:
+            from transpilador import transpile_program
+            self.python = transpile_program(self.statements, self.functions)
+        return self.python
+
+
+def walk(node):
+    # Recorre el nodo y todos sus descendientes
+    yield node
+    for field in node.fields:
+        value = getattr(node, field)
+        if isinstance(value, list):
+            for child in value:
+                if child is not None:
+                    yield from walk(child)
+        elif value is not None:
+            yield from walk(value)
+
+def is_call(node):
+    # Una llamada a una función del programa: f(...) o un map/filter que la usa
+    return isinstance(node, FunctionCall) or (isinstance(node, ListOperation) and
+                                              node.operation in CALL_OPERATIONS)
+
+def rewrite(node, function):
+    # Reemplaza cada hijo del nodo por function(hijo); function decide si sigue bajando
+    for field in node.fields:
+        value = getattr(node, field)
+        if isinstance(value, list):
+            value[:] = [function(child) if child is not None else None for child in value]
+        elif value is not None:
+            setattr(node, field, function(value))
+
+
+
+
+# Las sentencias, las llamadas y las operaciones recuerdan su línea del código
+# fuente en 'line' (ver profilador.py). Los nodos que arma el optimizador pueden
+# no tenerla.
+def at(node, line):
+    node.line = line
+    return node
+
+# Las listas de sentencias, argumentos y elementos crecen con append sobre la
+# misma lista: p[1] + [p[2]] la copiaba en cada reducción (tiempo cuadrático)
 
 def p_program(p):
-    'program : statement_list'
-    statements = [stmt for stmt in p[1] if stmt is not None]
-    for statement in statements:
-        statement.execute()
+    'program : top_statements'
+    p[0] = Program([stmt for stmt in p[1] if stmt is not None])
+
+
+def p_top_statements(p):
+    '''top_statements : top_statements statement
+                      | top_statements import_statement
+                      | statement
+                      | import_statement'''
+    statements = p[1] if len(p) == 3 else []
+    statement = p[len(p) - 1]
+    stream = getattr(_parsing, 'stream', None)
+    if stream is not None and statement is not None:
+        # Modo streaming (ver Interpreter.stream): la sentencia se ejecuta ya y no se guarda
+        stream(statement)
+    else:
+        statements.append(statement)
+    p[0] = statements
 
 
 def p_statement_list(p):
     '''statement_list : statement_list statement
                       | statement'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -299,18 +825,22 @@ def p_statement(p):
                  | input_statement
                  | expression SEMICOLON'''
     if len(p) == 3:
-        p[0] = p[1].evaluate()
+        p[0] = at(ExpressionStatement(p[1]), p.lineno(2))
     else:
         p[0] = p[1]
 
+def p_import_statement(p):
+    'import_statement : IMPORT STRING SEMICOLON'
+    p[0] = at(Import(p[2]), p.lineno(1))
+
 def p_input_statement(p):
     'input_statement : INPUT LPAREN lvalue RPAREN SEMICOLON'
-    p[0] = Input(p[3])
+    p[0] = at(Input(p[3]), p.lineno(1))
 
 
 def p_print_statement(p):
     'print_statement : PRINT LPAREN print_arguments RPAREN SEMICOLON'
-    p[0] = Print(p[3])
+    p[0] = at(Print(p[3]), p.lineno(1))
 
 def p_print_arguments(p):
     '''print_arguments : print_arguments COMMA expression
@@ -318,11 +848,12 @@ def p_print_arguments(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_assign_statement(p):
     'assign_statement : lvalue EQUALS expression SEMICOLON'
-    p[0] = Assign(p[1], p[3])
+    p[0] = at(Assign(p[1], p[3]), p.lineno(2))
 
 def p_lvalue(p):
     '''lvalue : ID
@@ -342,31 +873,38 @@ def p_argument_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_if_statement(p):
     '''if_statement : IF LPAREN expression RPAREN block
                     | IF LPAREN expression RPAREN block ELSE block'''
     if len(p) == 6:
-        p[0] = IfElse(p[3], p[5])
+        p[0] = at(IfElse(p[3], p[5]), p.lineno(1))
     else:
-        p[0] = IfElse(p[3], p[5], p[7])
+        p[0] = at(IfElse(p[3], p[5], p[7]), p.lineno(1))
 
 def p_while_statement(p):
     'while_statement : WHILE LPAREN expression RPAREN block'
-    p[0] = WhileLoop(p[3], p[5])
+    p[0] = at(WhileLoop(p[3], p[5]), p.lineno(1))
 
 def p_for_statement(p):
     '''for_statement : FOR LPAREN assign_statement expression SEMICOLON assign_statement RPAREN block'''
-    p[0] = ForLoop(p[3], p[4], p[6], p[8])
+    p[0] = at(ForLoop(p[3], p[4], p[6], p[8]), p.lineno(1))
 
 def p_function_definition(p):
     'function_definition : FUNC ID LPAREN parameters RPAREN block'
-    functions[p[2]] = Function(p[2], p[4], p[6])
+    parameters = p[4]
+    repeated = [name for index, name in enumerate(parameters) if name in parameters[:index]]
+    if repeated:
+        syntax_error(f"Syntax error: parámetro '{repeated[0]}' repetido en '{p[2]}' on line {p.lineno(1)}")
+        # Como con cualquier error recuperado, el programa sigue: con cada nombre una vez
+        parameters = list(dict.fromkeys(parameters))
+    p[0] = at(Function(p[2], parameters, p[6]), p.lineno(1))
 
 def p_function_call(p):
     'expression : ID LPAREN argument_list RPAREN'
-    p[0] = FunctionCall(p[1], p[3])
+    p[0] = at(FunctionCall(p[1], p[3]), p.lineno(1))
 
 def p_parameters(p):
     '''parameters : parameters COMMA ID
@@ -375,15 +913,19 @@ def p_parameters(p):
     if len(p) == 2:
         p[0] = [] if p[1] is None else [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_block(p):
     'block : LKEY statement_list RKEY'
-    p[0] = Block(p[2])
+    for stmt in p[2]:
+        if isinstance(stmt, Function):
+            syntax_error(f"Syntax error: la función '{stmt.name}' solo puede definirse en el nivel superior")
+    p[0] = Block([stmt for stmt in p[2] if not isinstance(stmt, Function)])
 
 def p_return_statement(p):
     'return_statement : RETURN expression SEMICOLON'
-    p[0] = Return(p[2])
+    p[0] = at(Return(p[2]), p.lineno(1))
 
 # Reglas específicas para métodos de lista
 def p_expression_insert(p):
@@ -402,6 +944,31 @@ def p_expression_get(p):
     'expression : expression DOT GET LPAREN expression RPAREN'
     p[0] = ListOperation(p[1], 'get', p[5])
 
+def p_expression_reduction(p):
+    'expression : expression DOT ID LPAREN RPAREN'
+    # sum, min, max y keys no son palabras reservadas: siguen sirviendo como nombres
+    if p[3] not in REDUCTIONS and p[3] != 'keys':
+        syntax_error(f"Syntax error: método de lista desconocido '{p[3]}' on line {p.lineno(3)}")
+    p[0] = ListOperation(p[1], p[3])
+
+def p_expression_keyed(p):
+    'expression : expression DOT ID LPAREN argument_list RPAREN'
+    if p[3] in CALL_OPERATIONS:
+        # map(f) y filter(f) reciben el nombre de una función, que se guarda como texto
+        if len(p[5]) != 1 or type(p[5][0]) is not Variable:
+            syntax_error(f"Syntax error: {p[3]}() recibe el nombre de una función on line {p.lineno(3)}")
+            p[0] = ListOperation(p[1], p[3], String(''))
+        else:
+            p[0] = ListOperation(p[1], p[3], String(p[5][0].name))
+        return
+    # has, remove y put (ver diccionarios.py)
+    count = KEYED_METHODS.get(p[3])
+    if count is None:
+        syntax_error(f"Syntax error: método desconocido '{p[3]}' on line {p.lineno(3)}")
+    elif len(p[5]) != count:
+        syntax_error(f"Syntax error: {p[3]}() recibe {count} argumento{'s' if count > 1 else ''} on line {p.lineno(3)}")
+    p[0] = ListOperation(p[1], p[3], *p[5][:2])
+
 
 
 def p_expression_general(p):
@@ -438,7 +1005,11 @@ def p_expression_general(p):
                 p[0] = Variable(p[1])
     elif len(p) == 3:  # Operadores unarios
         if p[1] == '-':
-            p[0] = BinOp(Number(0), '-', p[2])
+            if type(p[2]) is Number and type(p[2].value) in (int, float):
+                # Un literal negativo (-1, -2.5) es un número, no una resta
+                p[0] = Number(-p[2].value)
+            else:
+                p[0] = at(BinOp(Number(0), '-', p[2]), p.lineno(1))
         else:
             p[0] = NotOp(p[2])
     elif len(p) == 4:
@@ -447,7 +1018,7 @@ def p_expression_general(p):
         elif p[1] == '[':  # Lista
             p[0] = List(p[2])
         else:  # Operadores binarios
-            p[0] = BinOp(p[1], p[2], p[3])
+            p[0] = at(BinOp(p[1], p[2], p[3]), p.lineno(2))
     return
 
 
@@ -458,7 +1029,29 @@ def p_list_elements(p):
     if len(p) == 2:  # Un solo elemento
         p[0] = [p[1]]  # `p[1]` ya debería ser un objeto con `evaluate`
     else:  # Más de un elemento
-        p[0] = p[1] + [p[3]]  # Combina la lista acumulada con el nuevo elemento
+        p[1].append(p[3])  # Agrega el nuevo elemento a la lista acumulada
+        p[0] = p[1]
+
+def p_expression_dict(p):
+    '''expression : LKEY dict_entries RKEY
+                  | LKEY RKEY'''
+    # Una { al principio de una expresión no puede ser un bloque: los bloques
+    # solo van después de if, else, while, for y mission
+    if len(p) == 3:
+        p[0] = Dict([], [])
+    else:
+        p[0] = Dict(*p[2])
+
+def p_dict_entries(p):
+    '''dict_entries : expression COLON expression
+                    | dict_entries COMMA expression COLON expression'''
+    # (claves, valores), que crecen con append como las demás listas
+    if len(p) == 4:
+        p[0] = ([p[1]], [p[3]])
+    else:
+        p[1][0].append(p[3])
+        p[1][1].append(p[5])
+        p[0] = p[1]
 
 def p_empty(p):
     'empty :'
@@ -466,9 +1059,66 @@ def p_empty(p):
 
 def p_error(p):
     if p:
-        print(f"Syntax error at token '{p.value}' on line {p.lineno}")
+        syntax_error(f"Syntax error at token '{p.value}' on line {p.lineno}")
     else:
-        print("Syntax error: Unexpected end of input")
-
-# Construir el parser
-parser = yacc.yacc(start='program')
+        syntax_error("Syntax error: Unexpected end of input")
+
+# Lexer del análisis en curso en cada hilo: ahí se cuentan y reportan los errores
+_parsing = threading.local()
+
+def syntax_error(message):
+    current = _parsing.lexer
+    current.errors += 1
+    print(message, file=current.output)
+
+# El parser se construye la primera vez que se usa, con las tablas LALR de
+# parsetab.pickle (ver tablas.py): cargarlas es mucho más rápido que importar el
+# parsetab.py que genera yacc por defecto, que las arma con bucles de Python.
+# Si la gramática cambió y las tablas no se regeneraron, yacc lo detecta por la
+# firma y las recalcula en memoria; en ningún caso escribe archivos.
+PARSETAB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsetab.pickle')
+
+_parser = None
+_build_lock = threading.Lock()
+
+def get_parser():
+    global _parser
+    with _build_lock:
+        if _parser is None:
+            # parser.parse(code) sin lexer usa el último que armó lex: que sea el nuestro
+            import ply.lex as lex
+            lex.lexer = get_lexer()
+            import ply.yacc as yacc
+            _parser = yacc.yacc(start='program', debug=False, write_tables=False, picklefile=PARSETAB)
+    return _parser
+
+def __getattr__(name):
+    # parser.parser y parser.lexer siguen disponibles, construidos al pedirlos
+    if name == 'parser':
+        return get_parser()
+    if name == 'lexer':
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def parse(code, lexer=None, parser=None, stream=None):
+    # Analiza el código sin ejecutarlo. Ante errores de sintaxis el parser se
+    # recupera como siempre, pero el programa recuerda cuántos hubo. PLY guarda el
+    # estado del análisis en el lexer y el parser, así que para analizar en varios
+    # hilos a la vez cada uno debe pasar los suyos (ver Interpreter).
+    # stream: se llama con cada sentencia del nivel superior apenas se reconoce, y
+    # esas sentencias no quedan en el programa que se devuelve
+    if lexer is None:
+        lexer = get_lexer()
+    if parser is None:
+        parser = get_parser()
+    lexer.lineno = 1
+    lexer.errors = 0
+    previous = getattr(_parsing, 'lexer', None), getattr(_parsing, 'stream', None)
+    _parsing.lexer, _parsing.stream = lexer, stream
+    try:
+        program = parser.parse(code, lexer=lexer)
+    finally:
+        _parsing.lexer, _parsing.stream = previous
+    if program is not None:
+        program.syntax_errors = lexer.errors
+    return program
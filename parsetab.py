@@ -1,90 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'programleftORleftANDleftEQNEQleftLESSGREATERLESSEQGREATEREQleftPLUSMINUSleftMULTDIVIDEMODULErightNOTrightUMINUSAND BOOLEAN COMMA DIVIDE DOT ELSE EQ EQUALS EXPLODE FOR FUNC GET GREATER GREATEREQ ID IF INPUT INSERT LBRACKET LESS LESSEQ LKEY LPAREN MINUS MODULE MULT NEQ NOT NUMBER OR PLUS PRINT RBRACKET RETURN RKEY RPAREN SEMICOLON SIZE STRING WHILEprogram : statement_liststatement_list : statement_list statement\n| statementstatement : print_statement\n| assign_statement\n| if_statement\n| while_statement\n| for_statement\n| function_definition\n| return_statement\n| input_statement\n| expression SEMICOLONinput_statement : INPUT LPAREN lvalue RPAREN SEMICOLONprint_statement : PRINT LPAREN print_arguments RPAREN SEMICOLONprint_arguments : print_arguments COMMA expression\n| expressionassign_statement : lvalue EQUALS expression SEMICOLONlvalue : ID\n| expression LBRACKET expression RBRACKETargument_list : argument_list COMMA expression\n| expressionif_statement : IF LPAREN expression RPAREN block\n| IF LPAREN expression RPAREN block ELSE blockwhile_statement : WHILE LPAREN expression RPAREN blockfor_statement : FOR LPAREN assign_statement expression SEMICOLON assign_statement RPAREN blockfunction_definition : FUNC ID LPAREN parameters RPAREN blockexpression : ID LPAREN argument_list RPARENparameters : parameters COMMA ID\n| ID\n| emptyblock : LKEY statement_list RKEYreturn_statement : RETURN expression SEMICOLONexpression : expression DOT INSERT LPAREN expression RPARENexpression : expression DOT EXPLODE LPAREN expression RPARENexpression : expression DOT SIZE LPAREN RPARENexpression : expression DOT GET LPAREN expression RPARENexpression : expression PLUS expression\n| expression MINUS expression\n| expression MULT expression\n| expression DIVIDE expression\n| expression MODULE expression\n| expression LESS expression\n| expression GREATER expression\n| expression LESSEQ expression\n| expression GREATEREQ expression\n| expression EQ expression\n| expression NEQ expression\n| expression AND expression\n| expression OR expression\n| NOT expression %prec UMINUS\n| MINUS expression %prec UMINUS\n| LPAREN expression RPAREN\n| NUMBER\n| STRING\n| BOOLEAN\n| ID\n| LBRACKET list_elements RBRACKETlist_elements : expression\n| list_elements COMMA expressionempty :'
-    
-_lr_action_items = {'PRINT':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[13,13,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,13,-24,-13,13,-26,-23,-31,-25,]),'IF':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[16,16,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,16,-24,-13,16,-26,-23,-31,-25,]),'WHILE':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[17,17,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,17,-24,-13,17,-26,-23,-31,-25,]),'FOR':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[18,18,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,18,-24,-13,18,-26,-23,-31,-25,]),'FUNC':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[19,19,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,19,-24,-13,19,-26,-23,-31,-25,]),'RETURN':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[21,21,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,21,-24,-13,21,-26,-23,-31,-25,]),'INPUT':([0,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,120,121,126,131,133,135,136,138,],[22,22,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,22,-24,-13,22,-26,-23,-31,-25,]),'ID':([0,2,3,4,5,6,7,8,9,10,11,14,19,21,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,88,91,94,95,96,98,101,102,110,117,119,120,121,122,124,126,131,133,135,136,138,],[20,20,-3,-4,-5,-6,-7,-8,-9,-10,-11,48,53,48,48,48,48,-2,-12,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,87,48,87,48,106,-32,48,48,48,48,48,-17,48,-14,-22,20,-24,87,134,-13,20,-26,-23,-31,-25,]),'NOT':([0,2,3,4,5,6,7,8,9,10,11,14,21,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,91,94,95,96,98,101,102,110,117,119,120,121,122,126,131,133,135,136,138,],[24,24,-3,-4,-5,-6,-7,-8,-9,-10,-11,24,24,24,24,24,-2,-12,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,-32,24,24,24,24,24,-17,24,-14,-22,24,-24,24,-13,24,-26,-23,-31,-25,]),'MINUS':([0,2,3,4,5,6,7,8,9,10,11,12,14,20,21,23,24,25,26,27,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,85,86,87,90,91,93,94,95,96,98,101,102,105,109,110,112,113,114,115,116,117,118,119,120,121,122,125,126,127,128,129,131,133,135,136,138,],[23,23,-3,-4,-5,-6,-7,-8,-9,-10,-11,33,23,-56,23,23,23,-53,-54,-55,23,-2,-12,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,33,-56,23,23,23,23,23,33,23,-51,-50,33,-37,-38,-39,-40,-41,33,33,33,33,33,33,33,33,33,33,-52,33,33,33,23,33,-56,33,-32,-57,23,23,23,23,23,-17,33,-27,23,33,33,33,-35,33,-14,33,-22,23,-24,23,33,-13,-33,-34,-36,23,-26,-23,-31,-25,]),'LPAREN':([0,2,3,4,5,6,7,8,9,10,11,13,14,16,17,18,20,21,22,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,48,49,50,51,52,53,54,56,61,62,63,64,85,87,91,94,95,96,98,101,102,110,117,119,120,121,122,126,131,133,135,136,138,],[14,14,-3,-4,-5,-6,-7,-8,-9,-10,-11,46,14,50,51,52,54,14,56,14,14,14,-2,-12,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,54,14,14,14,14,88,14,14,95,96,97,98,14,54,-32,14,14,14,14,14,-17,14,-14,-22,14,-24,14,-13,14,-26,-23,-31,-25,]),'NUMBER':([0,2,3,4,5,6,7,8,9,10,11,14,21,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,91,94,95,96,98,101,102,110,117,119,120,121,122,126,131,133,135,136,138,],[25,25,-3,-4,-5,-6,-7,-8,-9,-10,-11,25,25,25,25,25,-2,-12,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-32,25,25,25,25,25,-17,25,-14,-22,25,-24,25,-13,25,-26,-23,-31,-25,]),'STRING':([0,2,3,4,5,6,7,8,9,10,11,14,21,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,91,94,95,96,98,101,102,110,117,119,120,121,122,126,131,133,135,136,138,],[26,26,-3,-4,-5,-6,-7,-8,-9,-10,-11,26,26,26,26,26,-2,-12,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-32,26,26,26,26,26,-17,26,-14,-22,26,-24,26,-13,26,-26,-23,-31,-25,]),'BOOLEAN':([0,2,3,4,5,6,7,8,9,10,11,14,21,23,24,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,91,94,95,96,98,101,102,110,117,119,120,121,122,126,131,133,135,136,138,],[27,27,-3,-4,-5,-6,-7,-8,-9,-10,-11,27,27,27,27,27,-2,-12,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-32,27,27,27,27,27,-17,27,-14,-22,27,-24,27,-13,27,-26,-23,-31,-25,]),'LBRACKET':([0,2,3,4,5,6,7,8,9,10,11,12,14,20,21,23,24,25,26,27,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,48,49,50,51,52,54,56,57,58,65,66,67,68,69,70,71,72,73,74,75,76,77,81,85,86,87,91,93,94,95,96,98,101,102,109,110,115,117,119,120,121,122,126,127,128,129,131,133,135,136,138,],[28,28,-3,-4,-5,-6,-7,-8,-9,-10,-11,45,28,-56,28,28,28,-53,-54,-55,28,-2,-12,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-56,28,28,28,28,28,28,-51,-50,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-52,28,45,-56,-32,-57,28,28,28,28,28,-17,-27,28,-35,-14,-22,28,-24,28,-13,-33,-34,-36,28,-26,-23,-31,-25,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,121,126,133,135,136,138,],[0,-1,-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,-24,-13,-26,-23,-31,-25,]),'RKEY':([3,4,5,6,7,8,9,10,11,29,30,91,102,117,119,121,126,131,133,135,136,138,],[-3,-4,-5,-6,-7,-8,-9,-10,-11,-2,-12,-32,-17,-14,-22,-24,-13,136,-26,-23,-31,-25,]),'SEMICOLON':([12,20,25,26,27,48,55,57,58,65,66,67,68,69,70,71,72,73,74,75,76,77,81,82,93,100,105,109,111,115,127,128,129,],[30,-56,-53,-54,-55,-56,91,-51,-50,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-52,102,-57,117,122,-27,126,-35,-33,-34,-36,]),'DOT':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[31,-56,-53,-54,-55,31,-56,31,-51,-50,31,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,31,31,-52,31,31,31,31,-56,31,-57,31,-27,31,31,31,-35,31,31,31,-33,-34,-36,]),'PLUS':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[32,-56,-53,-54,-55,32,-56,32,-51,-50,32,-37,-38,-39,-40,-41,32,32,32,32,32,32,32,32,32,32,-52,32,32,32,32,-56,32,-57,32,-27,32,32,32,-35,32,32,32,-33,-34,-36,]),'MULT':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[34,-56,-53,-54,-55,34,-56,34,-51,-50,34,34,34,-39,-40,-41,34,34,34,34,34,34,34,34,34,34,-52,34,34,34,34,-56,34,-57,34,-27,34,34,34,-35,34,34,34,-33,-34,-36,]),'DIVIDE':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[35,-56,-53,-54,-55,35,-56,35,-51,-50,35,35,35,-39,-40,-41,35,35,35,35,35,35,35,35,35,35,-52,35,35,35,35,-56,35,-57,35,-27,35,35,35,-35,35,35,35,-33,-34,-36,]),'MODULE':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[36,-56,-53,-54,-55,36,-56,36,-51,-50,36,36,36,-39,-40,-41,36,36,36,36,36,36,36,36,36,36,-52,36,36,36,36,-56,36,-57,36,-27,36,36,36,-35,36,36,36,-33,-34,-36,]),'LESS':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[37,-56,-53,-54,-55,37,-56,37,-51,-50,37,-37,-38,-39,-40,-41,-42,-43,-44,-45,37,37,37,37,37,37,-52,37,37,37,37,-56,37,-57,37,-27,37,37,37,-35,37,37,37,-33,-34,-36,]),'GREATER':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[38,-56,-53,-54,-55,38,-56,38,-51,-50,38,-37,-38,-39,-40,-41,-42,-43,-44,-45,38,38,38,38,38,38,-52,38,38,38,38,-56,38,-57,38,-27,38,38,38,-35,38,38,38,-33,-34,-36,]),'LESSEQ':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[39,-56,-53,-54,-55,39,-56,39,-51,-50,39,-37,-38,-39,-40,-41,-42,-43,-44,-45,39,39,39,39,39,39,-52,39,39,39,39,-56,39,-57,39,-27,39,39,39,-35,39,39,39,-33,-34,-36,]),'GREATEREQ':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[40,-56,-53,-54,-55,40,-56,40,-51,-50,40,-37,-38,-39,-40,-41,-42,-43,-44,-45,40,40,40,40,40,40,-52,40,40,40,40,-56,40,-57,40,-27,40,40,40,-35,40,40,40,-33,-34,-36,]),'EQ':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[41,-56,-53,-54,-55,41,-56,41,-51,-50,41,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,41,41,41,41,-52,41,41,41,41,-56,41,-57,41,-27,41,41,41,-35,41,41,41,-33,-34,-36,]),'NEQ':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[42,-56,-53,-54,-55,42,-56,42,-51,-50,42,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,42,42,42,42,-52,42,42,42,42,-56,42,-57,42,-27,42,42,42,-35,42,42,42,-33,-34,-36,]),'AND':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[43,-56,-53,-54,-55,43,-56,43,-51,-50,43,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,43,43,43,-52,43,43,43,43,-56,43,-57,43,-27,43,43,43,-35,43,43,43,-33,-34,-36,]),'OR':([12,20,25,26,27,47,48,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,81,82,83,84,86,87,90,93,105,109,112,113,114,115,116,118,125,127,128,129,],[44,-56,-53,-54,-55,44,-56,44,-51,-50,44,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,44,44,-52,44,44,44,44,-56,44,-57,44,-27,44,44,44,-35,44,44,44,-33,-34,-36,]),'EQUALS':([15,20,87,99,],[49,-18,-18,-19,]),'RPAREN':([25,26,27,47,48,57,58,65,66,67,68,69,70,71,72,73,74,75,76,77,79,80,81,83,84,87,88,89,90,92,93,97,99,102,106,107,108,109,113,114,115,116,118,125,127,128,129,132,134,],[-53,-54,-55,81,-56,-51,-50,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,100,-16,-52,103,104,-18,-60,109,-21,111,-57,115,-19,-17,-29,123,-30,-27,127,128,-35,129,-15,-20,-33,-34,-36,137,-28,]),'RBRACKET':([25,26,27,48,57,58,59,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,81,93,109,112,115,127,128,129,],[-53,-54,-55,-56,-51,-50,93,-58,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,99,-52,-57,-27,-59,-35,-33,-34,-36,]),'COMMA':([25,26,27,48,57,58,59,60,65,66,67,68,69,70,71,72,73,74,75,76,77,79,80,81,88,89,90,93,106,107,108,109,112,115,118,125,127,128,129,134,],[-53,-54,-55,-56,-51,-50,94,-58,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,101,-16,-52,-60,110,-21,-57,-29,124,-30,-27,-59,-35,-15,-20,-33,-34,-36,-28,]),'INSERT':([31,],[61,]),'EXPLODE':([31,],[62,]),'SIZE':([31,],[63,]),'GET':([31,],[64,]),'LKEY':([103,104,123,130,137,],[120,120,120,120,120,]),'ELSE':([119,136,],[130,-31,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,120,],[2,131,]),'statement':([0,2,120,131,],[3,29,3,29,]),'print_statement':([0,2,120,131,],[4,4,4,4,]),'assign_statement':([0,2,52,120,122,131,],[5,5,85,5,132,5,]),'if_statement':([0,2,120,131,],[6,6,6,6,]),'while_statement':([0,2,120,131,],[7,7,7,7,]),'for_statement':([0,2,120,131,],[8,8,8,8,]),'function_definition':([0,2,120,131,],[9,9,9,9,]),'return_statement':([0,2,120,131,],[10,10,10,10,]),'input_statement':([0,2,120,131,],[11,11,11,11,]),'expression':([0,2,14,21,23,24,28,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,49,50,51,52,54,56,85,94,95,96,98,101,110,120,122,131,],[12,12,47,55,57,58,60,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,82,83,84,86,90,86,105,112,113,114,116,118,125,12,86,12,]),'lvalue':([0,2,52,56,120,122,131,],[15,15,15,92,15,15,15,]),'list_elements':([28,],[59,]),'print_arguments':([46,],[79,]),'argument_list':([54,],[89,]),'parameters':([88,],[107,]),'empty':([88,],[108,]),'block':([103,104,123,130,137,],[119,121,133,135,138,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_program','parser.py',282),
-  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',288),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',289),
-  ('statement -> print_statement','statement',1,'p_statement','parser.py',296),
-  ('statement -> assign_statement','statement',1,'p_statement','parser.py',297),
-  ('statement -> if_statement','statement',1,'p_statement','parser.py',298),
-  ('statement -> while_statement','statement',1,'p_statement','parser.py',299),
-  ('statement -> for_statement','statement',1,'p_statement','parser.py',300),
-  ('statement -> function_definition','statement',1,'p_statement','parser.py',301),
-  ('statement -> return_statement','statement',1,'p_statement','parser.py',302),
-  ('statement -> input_statement','statement',1,'p_statement','parser.py',303),
-  ('statement -> expression SEMICOLON','statement',2,'p_statement','parser.py',304),
-  ('input_statement -> INPUT LPAREN lvalue RPAREN SEMICOLON','input_statement',5,'p_input_statement','parser.py',311),
-  ('print_statement -> PRINT LPAREN print_arguments RPAREN SEMICOLON','print_statement',5,'p_print_statement','parser.py',316),
-  ('print_arguments -> print_arguments COMMA expression','print_arguments',3,'p_print_arguments','parser.py',320),
-  ('print_arguments -> expression','print_arguments',1,'p_print_arguments','parser.py',321),
-  ('assign_statement -> lvalue EQUALS expression SEMICOLON','assign_statement',4,'p_assign_statement','parser.py',328),
-  ('lvalue -> ID','lvalue',1,'p_lvalue','parser.py',332),
-  ('lvalue -> expression LBRACKET expression RBRACKET','lvalue',4,'p_lvalue','parser.py',333),
-  ('argument_list -> argument_list COMMA expression','argument_list',3,'p_argument_list','parser.py',344),
-  ('argument_list -> expression','argument_list',1,'p_argument_list','parser.py',345),
-  ('if_statement -> IF LPAREN expression RPAREN block','if_statement',5,'p_if_statement','parser.py',352),
-  ('if_statement -> IF LPAREN expression RPAREN block ELSE block','if_statement',7,'p_if_statement','parser.py',353),
-  ('while_statement -> WHILE LPAREN expression RPAREN block','while_statement',5,'p_while_statement','parser.py',360),
-  ('for_statement -> FOR LPAREN assign_statement expression SEMICOLON assign_statement RPAREN block','for_statement',8,'p_for_statement','parser.py',364),
-  ('function_definition -> FUNC ID LPAREN parameters RPAREN block','function_definition',6,'p_function_definition','parser.py',368),
-  ('expression -> ID LPAREN argument_list RPAREN','expression',4,'p_function_call','parser.py',372),
-  ('parameters -> parameters COMMA ID','parameters',3,'p_parameters','parser.py',376),
-  ('parameters -> ID','parameters',1,'p_parameters','parser.py',377),
-  ('parameters -> empty','parameters',1,'p_parameters','parser.py',378),
-  ('block -> LKEY statement_list RKEY','block',3,'p_block','parser.py',385),
-  ('return_statement -> RETURN expression SEMICOLON','return_statement',3,'p_return_statement','parser.py',389),
-  ('expression -> expression DOT INSERT LPAREN expression RPAREN','expression',6,'p_expression_insert','parser.py',394),
-  ('expression -> expression DOT EXPLODE LPAREN expression RPAREN','expression',6,'p_expression_explode','parser.py',398),
-  ('expression -> expression DOT SIZE LPAREN RPAREN','expression',5,'p_expression_size','parser.py',402),
-  ('expression -> expression DOT GET LPAREN expression RPAREN','expression',6,'p_expression_get','parser.py',406),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_general','parser.py',412),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_general','parser.py',413),
-  ('expression -> expression MULT expression','expression',3,'p_expression_general','parser.py',414),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_general','parser.py',415),
-  ('expression -> expression MODULE expression','expression',3,'p_expression_general','parser.py',416),
-  ('expression -> expression LESS expression','expression',3,'p_expression_general','parser.py',417),
-  ('expression -> expression GREATER expression','expression',3,'p_expression_general','parser.py',418),
-  ('expression -> expression LESSEQ expression','expression',3,'p_expression_general','parser.py',419),
-  ('expression -> expression GREATEREQ expression','expression',3,'p_expression_general','parser.py',420),
-  ('expression -> expression EQ expression','expression',3,'p_expression_general','parser.py',421),
-  ('expression -> expression NEQ expression','expression',3,'p_expression_general','parser.py',422),
-  ('expression -> expression AND expression','expression',3,'p_expression_general','parser.py',423),
-  ('expression -> expression OR expression','expression',3,'p_expression_general','parser.py',424),
-  ('expression -> NOT expression','expression',2,'p_expression_general','parser.py',425),
-  ('expression -> MINUS expression','expression',2,'p_expression_general','parser.py',426),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_general','parser.py',427),
-  ('expression -> NUMBER','expression',1,'p_expression_general','parser.py',428),
-  ('expression -> STRING','expression',1,'p_expression_general','parser.py',429),
-  ('expression -> BOOLEAN','expression',1,'p_expression_general','parser.py',430),
-  ('expression -> ID','expression',1,'p_expression_general','parser.py',431),
-  ('expression -> LBRACKET list_elements RBRACKET','expression',3,'p_expression_general','parser.py',432),
-  ('list_elements -> expression','list_elements',1,'p_list_elements','parser.py',460),
-  ('list_elements -> list_elements COMMA expression','list_elements',3,'p_list_elements','parser.py',461),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',468),
-]
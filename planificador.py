@@ -0,0 +1,110 @@
+import asyncio
+import io
+import time
+
+from interprete import Interpreter
+from maquina import VM, PAUSED, WAITING_INPUT
+
+# Muchos programas a la vez en un solo proceso, cada uno como una tarea de asyncio.
+# Los programas corren en la VM por tramos de pasos (una vuelta de un bucle o una
+# llamada, ver maquina.py): al terminar cada tramo la sesión le cede el turno al
+# resto, así un while (true) no bloquea a nadie. input() no bloquea: la sesión
+# espera la línea de su fuente asíncrona mientras las demás siguen.
+#
+#   sessions = [Session(code, input=queue.get) for code in programas]
+#   await run_sessions(sessions)
+#   sessions[0].output.getvalue(), sessions[0].error
+#
+# Cada sesión puede tener un límite de pasos y de tiempo (el de sus tramos, sin las
+# esperas de la entrada): al pasarlo, el programa se corta con un error.
+#
+# Solo la VM puede pausarse a mitad de un programa: el árbol y el motor py usan la
+# pila de Python, que no puede guardarse para seguir después.
+
+SLICE_STEPS = 1000
+
+
+class Session:
+    # code: el programa
+    # input: corrutina sin argumentos que devuelve la línea siguiente, o None al
+    #   terminar la entrada (sin input, input() encuentra fin de archivo)
+    # slice_steps: pasos de cada tramo antes de ceder el turno
+    # max_steps, max_time: límites de pasos y de segundos de ejecución (None: sin límite)
+    def __init__(self, code, input=None, slice_steps=SLICE_STEPS, max_steps=None, max_time=None,
+                 optimize=True, memoize=True):
+        self.code = code
+        self.read = input
+        self.slice_steps = slice_steps
+        self.max_steps = max_steps
+        self.max_time = max_time
+        self.output = io.StringIO()
+        # Los avisos del análisis previo, aparte de la salida (ver Interpreter.verify)
+        self.warnings = io.StringIO()
+        # Sin procesos para map (workers=1, el valor por defecto): corre entero dentro
+        # de un tramo (ver VM.apply)
+        self.interpreter = Interpreter(output=self.output, optimize=optimize, memoize=memoize,
+                                       warnings=self.warnings)
+        self.steps = 0
+        self.time = 0.0
+        self.slices = 0
+        self.syntax_errors = 0
+        self.error = None
+
+    async def run(self):
+        try:
+            await self.execute()
+        except Exception as e:
+            self.error = str(e)
+            self.interpreter.write(f"Error: {e}")
+        finally:
+            self.interpreter.sink.flush()
+        return self
+
+    async def execute(self):
+        start = time.perf_counter()
+        program = self.interpreter.parse(self.code)
+        if program is None or program.syntax_errors:
+            self.syntax_errors = program.syntax_errors if program is not None else 1
+            return
+        self.interpreter.register(program)
+        self.interpreter.verify(program)
+        vm = VM(program.compile(), self.interpreter)
+        self.time += time.perf_counter() - start
+        # Analizar y compilar ya fue un turno: la ejecución empieza en el siguiente
+        await asyncio.sleep(0)
+        result = self.advance(vm, lambda: vm.execute(vm.main, vm.globals))
+        while result is PAUSED or result is WAITING_INPUT:
+            if result is WAITING_INPUT:
+                # Lo mostrado antes de pedir la entrada tiene que verse antes de leer
+                self.interpreter.sink.flush()
+                line = await self.read() if self.read is not None else None
+                vm.line = EOFError("EOF when reading a line") if line is None else line.rstrip('\n')
+            else:
+                await asyncio.sleep(0)
+            result = self.advance(vm, vm.resume)
+        vm.publish()
+
+    def advance(self, vm, step):
+        # Un tramo de la ejecución, dentro de los límites que le quedan a la sesión
+        if self.max_time is not None and self.time >= self.max_time:
+            raise TimeoutError(f"El programa superó el límite de {self.max_time} s de ejecución")
+        slice_steps = self.slice_steps
+        if self.max_steps is not None:
+            slice_steps = min(slice_steps, self.max_steps - self.steps)
+            if slice_steps <= 0:
+                raise RuntimeError(f"El programa superó el límite de {self.max_steps} pasos")
+        vm.slice = slice_steps
+        vm.remaining = None
+        start = time.perf_counter()
+        try:
+            return step()
+        finally:
+            self.time += time.perf_counter() - start
+            self.slices += 1
+            if vm.remaining is not None:
+                self.steps += slice_steps - vm.remaining
+
+
+async def run_sessions(sessions):
+    # Corre todas las sesiones a la vez; cada una guarda su salida y su error
+    return await asyncio.gather(*(session.run() for session in sessions))
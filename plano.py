@@ -0,0 +1,194 @@
+from array import array
+
+from parser import (
+    Number, String, Boolean, Input, Variable, Local, BinOp, NotOp, Negate, Assign,
+    ExpressionStatement, Print, IfElse, Block, WhileLoop, ForLoop, CountedLoop, Function,
+    FunctionCall, Return, List, ListOperation, Program, INT_OPERATIONS, DefinedVariable,
+    DefinedLocal, Dict, Concat, Materialize, slot_names,
+)
+
+# Representación plana de un programa: en lugar de un objeto por nodo, unos pocos
+# arrays paralelos con un elemento por nodo (su clase, su línea y dónde empiezan
+# sus datos) y un array con los datos de todos: los índices de sus hijos y de sus
+# atributos (nombres, operadores, valores) en una tabla de constantes, donde cada
+# valor distinto se guarda una sola vez. Un nodo ocupa unos 20 bytes en lugar de
+# los 60 a 100 de un objeto (ver benchmarks/bench_memoria.py).
+#
+#   flat = FlatTree(program)     # el árbol del programa ya puede descartarse
+#   flat.kind(i), flat.children(i), flat.attributes(i)
+#   program = flat.program()     # un Program de objetos, para ejecutarlo
+#
+# Los nodos van en postorden: los hijos antes que el padre, así program() los
+# arma en un solo recorrido. Un nodo que aparece en dos lugares del árbol (el
+# optimizador reutiliza la condición de un bucle) se guarda una vez y vuelve a
+# quedar compartido. Los arrays y las constantes se guardan con pickle sin la
+# recursión que necesita un árbol de objetos.
+
+KINDS = (Number, String, Boolean, Input, Variable, Local, BinOp, NotOp, Negate, Assign,
+         ExpressionStatement, Print, IfElse, Block, WhileLoop, ForLoop, CountedLoop, Function,
+         FunctionCall, Return, List, ListOperation,
+         *INT_OPERATIONS.values(), DefinedVariable, DefinedLocal, Dict, Concat, Materialize)
+
+KIND_INDEX = {kind: index for index, kind in enumerate(KINDS)}
+
+NONE = -1  # hijo o atributo ausente
+
+
+def attribute_names(kind):
+    # Los slots que no son hijos ni la línea: name, op, value, step...
+    return tuple(name for name in slot_names(kind) if name != 'line' and name not in kind.fields)
+
+
+ATTRIBUTES = tuple(attribute_names(kind) for kind in KINDS)
+
+
+def list_marker(length):
+    # Un campo que es una lista se guarda como -2 - largo seguido de los hijos
+    return -2 - length
+
+
+class FlatTree:
+    def __init__(self, program):
+        self.kinds = array('B')     # índice en KINDS
+        self.lines = array('i')     # línea del código fuente (0: sin línea)
+        self.offsets = array('i')   # dónde empiezan los datos del nodo en links
+        self.links = array('i')     # atributos (índices en constants) e hijos (índices de nodos)
+        self.constants = []
+        self.constant_index = {}
+        index = {}  # id(nodo) -> índice
+        self.functions = array('i', (self.add(function, index) for function in program.functions.values()))
+        self.statements = array('i', (self.add(statement, index) for statement in program.statements))
+        self.syntax_errors = program.syntax_errors
+        self.optimized = program.optimized
+        self.type_errors = program.type_errors
+        # Solo sirve para armar las constantes
+        del self.constant_index
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # Armado
+
+    def add(self, root, index):
+        # Agrega el nodo y sus descendientes que falten; devuelve su índice. Con una
+        # pila propia: los árboles muy profundos no agotan la de Python.
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if id(node) in index:
+                stack.pop()
+                continue
+            pending = [child for child in children_of(node) if id(child) not in index]
+            if pending:
+                stack.extend(reversed(pending))
+                continue
+            stack.pop()
+            index[id(node)] = self.append(node, index)
+        return index[id(root)]
+
+    def append(self, node, index):
+        kind = KIND_INDEX[type(node)]
+        links = self.links
+        self.kinds.append(kind)
+        self.lines.append(getattr(node, 'line', 0))
+        self.offsets.append(len(links))
+        for name in ATTRIBUTES[kind]:
+            links.append(self.constant(getattr(node, name, None)))
+        for field in node.fields:
+            value = getattr(node, field)
+            if isinstance(value, list):
+                links.append(list_marker(len(value)))
+                links.extend(NONE if child is None else index[id(child)] for child in value)
+            else:
+                links.append(NONE if value is None else index[id(value)])
+        return len(self.kinds) - 1
+
+    def constant(self, value):
+        if value is None:
+            return NONE
+        if isinstance(value, list):
+            # Parámetros y locales de una función: una tupla, que se copia al rearmar
+            self.constants.append(tuple(value))
+            return len(self.constants) - 1
+        # True == 1 == 1.0: el tipo forma parte de la clave
+        key = (type(value), value)
+        position = self.constant_index.get(key)
+        if position is None:
+            position = self.constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return position
+
+    # Consultas sin armar los objetos
+
+    def kind(self, i):
+        return KINDS[self.kinds[i]]
+
+    def attributes(self, i):
+        # {nombre: valor} de los atributos que no son hijos
+        offset = self.offsets[i]
+        names = ATTRIBUTES[self.kinds[i]]
+        constants = self.constants
+        return {name: constants[position]
+                for name, position in zip(names, self.links[offset:offset + len(names)])
+                if position != NONE}
+
+    def children(self, i):
+        # Índices de los hijos, en el orden de 'fields' (los elementos de las listas en orden)
+        return [child for _, value in self.fields(i)
+                for child in (value if isinstance(value, list) else [value]) if child != NONE]
+
+    def fields(self, i):
+        # (campo, índice del hijo o NONE | lista de índices) de cada campo del nodo
+        links = self.links
+        position = self.offsets[i] + len(ATTRIBUTES[self.kinds[i]])
+        result = []
+        for field in KINDS[self.kinds[i]].fields:
+            value = links[position]
+            position += 1
+            if value < NONE:
+                length = -2 - value
+                value = links[position:position + length].tolist()
+                position += length
+            result.append((field, value))
+        return result
+
+    # Vuelta a objetos
+
+    def program(self):
+        nodes = []
+        constants = self.constants
+        for i, kind in enumerate(self.kinds):
+            klass = KINDS[kind]
+            node = object.__new__(klass)
+            if self.lines[i]:
+                node.line = self.lines[i]
+            offset = self.offsets[i]
+            names = ATTRIBUTES[kind]
+            for name, position in zip(names, self.links[offset:offset + len(names)]):
+                if position != NONE:
+                    value = constants[position]
+                    setattr(node, name, list(value) if type(value) is tuple else value)
+            for field, value in self.fields(i):
+                if isinstance(value, list):
+                    setattr(node, field, [None if child == NONE else nodes[child] for child in value])
+                else:
+                    setattr(node, field, None if value == NONE else nodes[value])
+            nodes.append(node)
+        program = Program([nodes[i] for i in self.functions] + [nodes[i] for i in self.statements])
+        program.syntax_errors = self.syntax_errors
+        program.optimized = self.optimized
+        program.type_errors = self.type_errors
+        return program
+
+
+def children_of(node):
+    for field in node.fields:
+        value = getattr(node, field)
+        if isinstance(value, list):
+            yield from (child for child in value if child is not None)
+        elif value is not None:
+            yield value
+
+
+def flatten(program):
+    return FlatTree(program)
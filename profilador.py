@@ -0,0 +1,242 @@
+import time
+
+from parser import (
+    Frame, Block, WhileLoop, ForLoop, CountedLoop, FunctionCall, BinOp, Concat, Return, Number,
+    INT_OPERATIONS, walk,
+)
+
+# Perfil de una ejecución con el motor del árbol (main.py --profile). Por línea
+# del código fuente: cuántas veces se ejecutaron sus sentencias, cuántas vueltas
+# dieron sus bucles, cuántas operaciones se evaluaron y el tiempo inclusivo (con
+# todo lo que se llama desde ahí) y exclusivo (sin las sentencias anidadas ni
+# las funciones llamadas). Por función: llamadas y tiempos.
+#
+# Para medir, los nodos del programa cambian de clase por subclases que toman
+# los tiempos (Block, WhileLoop, ForLoop, FunctionCall, BinOp, y Return dentro
+# de las funciones) y al terminar vuelven a la suya. Sin --profile el árbol no
+# tiene ninguna medición: no cuesta nada.
+#
+# Además del reporte de texto se puede escribir el perfil como pilas colapsadas
+# ("programa;línea 3;fib;línea 8 1234", en microsegundos exclusivos), el
+# formato que leen flamegraph.pl, speedscope e inferno.
+
+ROOT = 'programa'
+
+
+class Profiler:
+    def __init__(self):
+        self.lines = {}       # línea -> [ejecuciones, inclusivo, exclusivo]
+        self.functions = {}   # nombre -> [llamadas, inclusivo, exclusivo]
+        self.iterations = {}  # línea de un bucle -> vueltas
+        self.operations = {}  # línea -> operaciones evaluadas
+        self.stacks = {}      # pila colapsada -> segundos exclusivos
+        self.active = {}      # (id de la tabla, clave) -> entradas abiertas, por la recursión
+        # Entradas abiertas: [inicio, tiempo de las anidadas, tabla, clave, pila]
+        self.open = []
+        self.line = None      # línea de la sentencia en curso en esta llamada
+        self.path = ROOT
+
+    # Medición
+
+    def enter(self, table, key, label):
+        active = self.active
+        active[id(table), key] = active.get((id(table), key), 0) + 1
+        self.path = f"{self.path};{label}"
+        self.open.append([time.perf_counter(), 0.0, table, key, self.path])
+
+    def leave(self):
+        end = time.perf_counter()
+        start, nested, table, key, path = self.open.pop()
+        elapsed = end - start
+        if self.open:
+            self.open[-1][1] += elapsed
+        self.path = self.open[-1][4] if self.open else ROOT
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[2] += elapsed - nested
+        # Con recursión, el tiempo inclusivo se cuenta una sola vez: en la entrada
+        # más externa de esa línea o función
+        active = self.active
+        active[id(table), key] -= 1
+        if not active[id(table), key]:
+            stats[1] += elapsed
+        self.stacks[path] = self.stacks.get(path, 0.0) + elapsed - nested
+
+    def statement(self, statement, frame):
+        line = getattr(statement, 'line', 0)
+        if line == self.line:
+            # Otra sentencia de la misma línea (if (x) { y = 1; }): cuenta con esa
+            return statement.execute(frame)
+        outer = self.line
+        self.line = line
+        self.enter(self.lines, line, f"línea {line}")
+        try:
+            return statement.execute(frame)
+        finally:
+            self.leave()
+            self.line = outer
+
+    def call(self, node, frame):
+        outer = self.line
+        self.line = None
+        self.enter(self.functions, node.name, node.name)
+        try:
+            return FunctionCall.evaluate(node, frame)
+        finally:
+            self.leave()
+            self.line = outer
+
+    def iteration(self, line):
+        self.iterations[line] = self.iterations.get(line, 0) + 1
+
+    # Ejecución
+
+    def run(self, program, interpreter):
+        # Igual que el motor del árbol en Interpreter.run, con los nodos medidos
+        nodes = instrument(program)
+        try:
+            frame = Frame(interpreter, [])
+            for statement in program.statements:
+                if isinstance(self.statement(statement, frame), Return):
+                    break
+        finally:
+            for node, original in nodes:
+                node.__class__ = original
+
+    # Reportes
+
+    def report(self, code=''):
+        source = code.splitlines()
+        rows = ["Perfil por línea (tiempos en ms; inclusivo: con lo que se llama desde la línea)",
+                f"{'línea':>6} {'ejecuciones':>12} {'vueltas':>10} {'operaciones':>12} "
+                f"{'inclusivo':>10} {'exclusivo':>10}  código"]
+        for line in sorted(self.lines):
+            executions, inclusive, exclusive = self.lines[line]
+            text = source[line - 1].strip() if 0 < line <= len(source) else ''
+            rows.append(f"{line:>6} {executions:>12} {self.iterations.get(line, ''):>10} "
+                        f"{self.operations.get(line, ''):>12} {inclusive * 1000:>10.2f} "
+                        f"{exclusive * 1000:>10.2f}  {text[:50]}")
+        if self.functions:
+            rows.append('')
+            rows.append("Perfil por función (tiempos en ms)")
+            rows.append(f"{'función':<20} {'llamadas':>10} {'inclusivo':>10} {'exclusivo':>10}")
+            ranking = sorted(self.functions.items(), key=lambda item: item[1][2], reverse=True)
+            for name, (calls, inclusive, exclusive) in ranking:
+                rows.append(f"{name:<20} {calls:>10} {inclusive * 1000:>10.2f} {exclusive * 1000:>10.2f}")
+        return '\n'.join(rows) + '\n'
+
+    def collapsed_stacks(self):
+        lines = []
+        for path, seconds in sorted(self.stacks.items()):
+            microseconds = round(seconds * 1e6)
+            if microseconds:
+                lines.append(f"{path} {microseconds}")
+        return ''.join(line + '\n' for line in lines)
+
+
+# Subclases con medición, sin atributos propios (el nodo cambia de clase y tiene
+# que ocupar lo mismo). El Profiler se encuentra en el intérprete del frame.
+
+class ProfiledBlock(Block):
+    __slots__ = ()
+
+    def execute(self, frame):
+        profiler = frame.interpreter.profiler
+        for stmt in self.statements:
+            result = profiler.statement(stmt, frame)
+            if isinstance(result, Return):
+                return result
+        return None
+
+
+class ProfiledWhileLoop(WhileLoop):
+    __slots__ = ()
+
+    def execute(self, frame):
+        profiler = frame.interpreter.profiler
+        line = getattr(self, 'line', 0)
+        while self.condition.evaluate(frame):
+            profiler.iteration(line)
+            result = self.block.execute(frame)
+            if isinstance(result, Return):
+                return result
+
+
+class ProfiledForLoop(ForLoop):
+    __slots__ = ()
+
+    def execute(self, frame):
+        profiler = frame.interpreter.profiler
+        line = getattr(self, 'line', 0)
+        self.init.execute(frame)
+        while self.condition.evaluate(frame):
+            profiler.iteration(line)
+            result = self.block.execute(frame)
+            if isinstance(result, Return):
+                return result
+            self.update.execute(frame)
+
+
+class ProfiledFunctionCall(FunctionCall):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        return frame.interpreter.profiler.call(self, frame)
+
+
+class ProfiledBinOp(BinOp):
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        operations = frame.interpreter.profiler.operations
+        line = getattr(self, 'line', 0)
+        operations[line] = operations.get(line, 0) + 1
+        return BinOp.evaluate(self, frame)
+
+
+class ProfiledConcat(Concat):
+    # Se cuenta como cualquier operación, pero sigue armando la Rope
+    __slots__ = ()
+
+    def evaluate(self, frame):
+        operations = frame.interpreter.profiler.operations
+        line = getattr(self, 'line', 0)
+        operations[line] = operations.get(line, 0) + 1
+        return Concat.evaluate(self, frame)
+
+
+class ProfiledReturn(Return):
+    # answer calcula su valor en la sentencia, no después de salir del bloque, para
+    # que el tiempo de la expresión cuente en su línea. Solo dentro de funciones:
+    # un answer del nivel superior termina el programa sin evaluar nada.
+    __slots__ = ()
+
+    def execute(self, frame):
+        return Return(Number(self.expression.evaluate(frame)))
+
+
+PROFILED = {
+    Block: ProfiledBlock, WhileLoop: ProfiledWhileLoop, ForLoop: ProfiledForLoop,
+    # Un bucle contado se mide como el for común que era: cuenta las vueltas igual
+    CountedLoop: ProfiledForLoop,
+    FunctionCall: ProfiledFunctionCall, BinOp: ProfiledBinOp, Concat: ProfiledConcat,
+    # Las operaciones especializadas por tipos (ver tipos.py) se miden como la general
+    **{kind: ProfiledBinOp for kind in INT_OPERATIONS.values()},
+}
+
+
+def instrument(program):
+    # Cambia la clase de cada nodo medible; devuelve [(nodo, clase original)]
+    changed = []
+    for roots, classes in ((program.statements, PROFILED),
+                           ([function.block for function in program.functions.values()],
+                            {**PROFILED, Return: ProfiledReturn})):
+        for root in roots:
+            for node in walk(root):
+                profiled = classes.get(type(node))
+                if profiled is not None:
+                    changed.append((node, type(node)))
+                    node.__class__ = profiled
+    return changed
@@ -0,0 +1,203 @@
+import argparse
+import io
+import sys
+import time
+
+from compilador import compile_program
+from interprete import Interpreter
+from lexico import get_lexer
+from optimizador import TEMP_PREFIX
+from parser import Assign, ExpressionStatement, ListOperation, Variable, WRITE_OPERATIONS
+from transpilador import transpile_program
+
+# Intérprete interactivo. Las variables y las funciones quedan vivas entre una
+# entrada y la siguiente, y cada entrada se analiza sola, con el mismo lexer y
+# parser del Interpreter (cargados una vez, al arrancar).
+#
+#   python repl.py [--engine tree|vm|py]
+#
+# Una entrada puede ocupar varias líneas: se sigue leyendo mientras haya llaves,
+# paréntesis o corchetes abiertos o falte el ; final. Después de la } de un if se
+# espera una línea más por si sigue un else (una línea vacía termina). Una
+# expresión suelta (1 + 2;) muestra su valor, que queda en la variable _.
+
+PROMPT = '>>> '
+CONTINUATION = '... '
+
+OPENING = {'LKEY', 'LPAREN', 'LBRACKET'}
+CLOSING = {'RKEY', 'RPAREN', 'RBRACKET'}
+
+HELP = """Comandos:
+  :time   mostrar (o dejar de mostrar) cuánto tarda en ejecutarse cada entrada
+  :vars   variables definidas
+  :funcs  funciones definidas
+  :help   esta ayuda
+  :quit   salir (también con fin de archivo, Ctrl-D)"""
+
+
+def scan(lexer, code):
+    # Estado de una entrada: 'incompleta', 'else' (termina con la } de un if y
+    # puede seguir un else) o 'completa'
+    lexer.input(code)
+    depth = 0
+    first = None      # tipo del primer token de la sentencia en curso
+    ended = False     # la última sentencia del nivel superior terminó
+    last = None
+    for token in iter(lexer.token, None):
+        if ended and token.type != 'ELSE':
+            first = None
+        if first is None:
+            first = token.type
+        if token.type in OPENING:
+            depth += 1
+        elif token.type in CLOSING:
+            depth -= 1
+        ended = depth <= 0 and token.type in ('SEMICOLON', 'RKEY')
+        last = token.type
+    if last is None:
+        return 'completa'
+    if depth > 0 or not ended:
+        return 'incompleta'
+    if last == 'RKEY' and first == 'IF':
+        return 'else'
+    return 'completa'
+
+
+class Repl:
+    def __init__(self, interpreter, engine='tree', interactive=True):
+        self.interpreter = interpreter
+        self.engine = engine
+        self.interactive = interactive
+        self.timing = False
+        # El lexer que decide si una entrada está completa; sus errores los
+        # reporta después el análisis de verdad
+        self.scanner = get_lexer().clone()
+        self.scanner.output = io.StringIO()
+        # Carga las tablas y deja listos el lexer y el parser del intérprete
+        interpreter.parse('_ = 0;')
+
+    def read(self, prompt):
+        return input(prompt if self.interactive else '')
+
+    def loop(self):
+        if self.interactive:
+            print("Intérprete interactivo (:help para ver los comandos)")
+        pending = None  # línea leída de más al esperar un else
+        while True:
+            try:
+                line = pending if pending is not None else self.read(PROMPT)
+                pending = None
+                if not line.strip():
+                    continue
+                if line.strip().startswith(':'):
+                    if not self.command(line.strip()):
+                        return
+                    continue
+                lines = [line]
+                state = scan(self.scanner, line)
+                while state != 'completa':
+                    line = self.read(CONTINUATION)
+                    if state == 'else':
+                        if not line.strip():
+                            break
+                        if not line.lstrip().startswith('else'):
+                            pending = line
+                            break
+                    lines.append(line)
+                    state = scan(self.scanner, '\n'.join(lines))
+            except EOFError:
+                if self.interactive:
+                    print()
+                return
+            except KeyboardInterrupt:
+                print("\nInterrumpido")
+                continue
+            self.execute('\n'.join(lines))
+
+    def command(self, text):
+        # Devuelve False para salir
+        name = text.split()[0]
+        if name in (':quit', ':q', ':exit'):
+            return False
+        if name == ':time':
+            self.timing = not self.timing
+            print(f"Tiempos de ejecución: {'sí' if self.timing else 'no'}")
+        elif name == ':vars':
+            for variable, value in self.interpreter.variables.items():
+                if not variable.startswith(TEMP_PREFIX):
+                    print(f"{variable} = {value}")
+        elif name == ':funcs':
+            for function in self.interpreter.functions.values():
+                print(f"mission {function.name}({', '.join(function.parameters)})")
+        elif name == ':help':
+            print(HELP)
+        else:
+            print(f"Comando desconocido '{name}' (:help para ver los comandos)")
+        return True
+
+    def execute(self, code):
+        interpreter = self.interpreter
+        program = interpreter.parse(code)
+        if program is None or program.syntax_errors:
+            # Con errores de sintaxis la entrada no se ejecuta: se puede volver a escribir
+            return
+        echo = echoed(program)
+        if echo:
+            program.statements[0] = Assign(Variable('_'), program.statements[0].expression)
+        # El bytecode o el módulo de Python se arman antes, fuera del tiempo medido, y
+        # con las funciones de las entradas anteriores, que la entrada puede llamar
+        if self.engine in ('vm', 'py'):
+            functions = {**interpreter.functions, **program.functions}
+            if self.engine == 'vm':
+                program.bytecode = compile_program(program.statements, functions)
+            else:
+                program.python = transpile_program(program.statements, functions)
+        start = time.perf_counter()
+        try:
+            interpreter.run(program, self.engine)
+        except KeyboardInterrupt:
+            print("\nInterrumpido")
+        except Exception as e:
+            print(f"Error: {e}")
+        else:
+            if echo and interpreter.variables.get('_') is not None:
+                interpreter.write(interpreter.variables['_'])
+                interpreter.sink.flush()
+        elapsed = time.perf_counter() - start
+        if self.timing:
+            print(f"({elapsed * 1000:.3f} ms)")
+
+
+def echoed(program):
+    # Una expresión sola se muestra, salvo los métodos que modifican la lista o el
+    # diccionario (insert, explode, put, remove), que se usan por el efecto
+    if len(program.statements) != 1 or program.functions:
+        return False
+    statement = program.statements[0]
+    return (isinstance(statement, ExpressionStatement) and
+            not (isinstance(statement.expression, ListOperation) and
+                 statement.expression.operation in WRITE_OPERATIONS))
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Intérprete interactivo del lenguaje')
+    arguments.add_argument('--engine', choices=['tree', 'vm', 'py'], default='tree')
+    arguments.add_argument('--no-optimize', action='store_true', help='no optimizar el árbol antes de ejecutar')
+    arguments.add_argument('--no-memo', action='store_true', help='no memoizar las funciones puras')
+    arguments.add_argument('-v', '--verbose', action='count', default=0,
+                           help='mostrar los mensajes de depuración de input() y de las listas')
+    args = arguments.parse_args(argv)
+
+    interpreter = Interpreter(verbose=args.verbose, optimize=not args.no_optimize, memoize=not args.no_memo)
+    interactive = sys.stdin.isatty()
+    if interactive:
+        try:
+            import readline  # noqa: F401  (historial y edición de línea, si está)
+        except ImportError:
+            pass
+    Repl(interpreter, args.engine, interactive).loop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
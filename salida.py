@@ -0,0 +1,40 @@
+import sys
+
+# Niveles de verbosidad del intérprete
+QUIET = 0   # solo la salida del programa
+TRACE = 1   # además, los mensajes de depuración de input() y de las listas
+
+BUFFER_SIZE = 64 * 1024
+
+
+class OutputSink:
+    # Destino de la salida de show. Acumula el texto en memoria y lo escribe en
+    # bloques, en lugar de una escritura (y una llamada al sistema) por línea.
+    # El intérprete vacía el buffer antes de leer la entrada, para que se vean los
+    # mensajes previos, y al terminar cada ejecución.
+    #
+    # Cualquier objeto con write(*values) y flush() puede usarse como destino.
+    #
+    # stream: archivo de destino (None: la salida estándar del momento de vaciar)
+    # buffer_size: caracteres acumulados antes de escribir (0: escribir cada línea)
+    def __init__(self, stream=None, buffer_size=BUFFER_SIZE):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.size = 0
+
+    def write(self, *values):
+        # Mismo formato que print(*values)
+        text = ' '.join(map(str, values)) + '\n'
+        self.buffer.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        stream = self.stream if self.stream is not None else sys.stdout
+        if self.buffer:
+            stream.write(''.join(self.buffer))
+            self.buffer.clear()
+            self.size = 0
+        stream.flush()
@@ -0,0 +1,50 @@
+import argparse
+import importlib
+import os
+import sys
+
+import lexico
+import parser
+
+# Regenera las tablas precalculadas que se cargan al arrancar: lextab.py (las
+# expresiones regulares del lexer) y parsetab.pickle (las tablas LALR del parser).
+# Hay que correrlo después de cambiar las reglas de lexico.py o la gramática
+# de parser.py; sin tablas al día todo sigue funcionando, pero cada ejecución
+# vuelve a armarlas en memoria.
+#
+#   python tablas.py            # --debug además escribe parser.out
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def remove_table(path):
+    # Sin borrar la tabla vieja, lex y yacc la leerían en lugar de regenerarla
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description='Regenera lextab.py y parsetab.pickle')
+    arguments.add_argument('--debug', action='store_true',
+                           help='escribir también parser.out, con los estados y conflictos de la gramática')
+    args = arguments.parse_args(argv)
+
+    import ply.lex as lex
+    import ply.yacc as yacc
+
+    remove_table(os.path.join(HERE, 'lextab.py'))
+    sys.modules.pop('lextab', None)
+    importlib.invalidate_caches()
+    lex.lex(module=lexico, optimize=True, lextab='lextab', outputdir=HERE)
+    # La firma permite que lexico.py detecte tablas de una versión anterior de las reglas
+    with open(os.path.join(HERE, 'lextab.py'), 'a') as file:
+        file.write(f"_lexsignature = {lexico.rules_signature()!r}\n")
+
+    remove_table(parser.PARSETAB)
+    yacc.yacc(module=parser, start='program', debug=args.debug, picklefile=parser.PARSETAB,
+              outputdir=HERE, debugfile='parser.out')
+    print('lextab.py y parsetab.pickle regenerados' + (' (y parser.out)' if args.debug else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine):
+    output = io.StringIO()
+    try:
+        Interpreter(output=output, check=False).execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_list_keys_are_positions(engine):
+    # has, remove y put usan la misma clave en una lista: la posición
+    code = """
+l = [10, 20, 30];
+show(l.has(0), l.has(2), l.has(3), l.has(-1), l.has(20), l.has("a"));
+l.remove(1);
+show(l, l.has(2));
+l.put(1, 5);
+show(l);
+"""
+    assert run(code, engine) == "True True False True False False\n[10, 30] False\n[10, 5]\n"
+
+
+PROGRAMS = {
+    'operaciones': """
+d = {"ana": 3, "luis": 5};
+d["eva"] = 7;
+d.put("ana", 4);
+show(d.pick("ana"), d.size(), d.has("eva"), d.keys());
+d.remove("luis");
+show(d, d.has("luis"));
+""",
+    'claves iguales': 'd = {1: "a"};\nd[1.0] = "b";\nd[true] = "c";\nshow(d, d.size());',
+    'alias': 'd = {"a": 1};\ne = d;\ne["b"] = 2;\nshow(d.keys());',
+    'en funcion': 'mission cuenta(d, k) { d[k] = d.pick(k) + 1; answer d.pick(k); }\nc = {"x": 0};\nshow(cuenta(c, "x"), cuenta(c, "x"));',
+    'clave que falta': 'd = {"a": 1};\nshow(1);\nshow(d.pick("b"));',
+    'quitar la que falta': 'd = {"a": 1};\nd.remove("b");',
+    'keys de una lista': 'show([1, 2].keys());',
+}
+
+
+# Los diccionarios se comportan igual en los tres motores
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_dictionaries_match_across_engines(name):
+    code = PROGRAMS[name]
+    assert run(code, 'vm') == run(code, 'tree') == run(code, 'py')
@@ -0,0 +1,43 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+from repl import Repl
+
+# h llama a g: al redefinir g, el resultado guardado de h(3) ya no vale
+DEFINITIONS = ["mission g(x) { answer x + 1; }", "mission h(x) { answer g(x) * 2 - 1; }"]
+REDEFINITION = "mission g(x) { answer x * 5; }"
+
+
+def test_stream_redefinition_clears_callers():
+    output = io.StringIO()
+    code = '\n'.join([*DEFINITIONS, "show(h(3));", REDEFINITION, "show(h(3));"])
+    Interpreter(output=output).stream(code)
+    assert output.getvalue() == "7\n29\n"
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_repl_redefinition_clears_callers(engine):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output)
+    repl = Repl(interpreter, engine, interactive=False)
+    for entry in [*DEFINITIONS, "show(h(3));", REDEFINITION, "show(h(3));"]:
+        repl.execute(entry)
+    assert output.getvalue() == "7\n29\n"
+    assert 'h' in interpreter.pure
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_repl_keeps_assignments_before_an_error(engine):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, warnings=io.StringIO())
+    repl = Repl(interpreter, engine, interactive=False)
+    for entry in ["x = 1; y = 1/0;", "show(x);"]:
+        repl.execute(entry)
+    assert output.getvalue() == "1\n"
+    assert 'y' not in interpreter.variables
@@ -0,0 +1,30 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lote
+
+# Una lista más larga que CHUNK_SIZE (ver paralelo.py), con una función pura: con
+# más de un proceso, map la repartiría entre los de un pool
+POOLED_MAP = """
+mission cuadrado(x) { answer x * x; }
+numeros = [0];
+for (i = 1; i < 3000; i = i + 1;) { numeros.insert(i); }
+show(numeros.map(cuadrado).sum());
+"""
+
+
+def test_pooled_map_in_batch(tmp_path, monkeypatch):
+    # Los procesos de lote.py son daemon: no pueden crear los del pool de map
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    script = tmp_path / 'mapa.txt'
+    script.write_text(POOLED_MAP, encoding='utf-8')
+    report = tmp_path / 'reporte.jsonl'
+    for engine in ('tree', 'vm', 'py'):
+        status = lote.main([str(script), '--report', str(report), '--jobs', '2', '--engine', engine,
+                            '--no-cache'])
+        [result] = [json.loads(line) for line in report.read_text(encoding='utf-8').splitlines()]
+        assert status == 0, result['error']
+        assert result['output'] == f"{sum(x * x for x in range(3000))}\n"
@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine, optimize=True):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, input=io.StringIO("ana\nluis\n"), optimize=optimize, check=False)
+    try:
+        interpreter.execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+PROGRAMS = {
+    'aritmetica': """
+suma = 0;
+for (i = 0; i < 200; i = i + 1;) { suma = (suma + i * 3 % 7) % 101; }
+show(suma, 7 / 2, 7 - 10, 2.5 * 4, "a" + "b", 3 == 3.0, !(1 < 2));
+""",
+    'ramas': """
+x = 5;
+while (x > 0) {
+    if (x % 2 == 0) { show("par", x); } else { show("impar", x); }
+    x = x - 1;
+}
+""",
+    'funciones': """
+mission fib(n) { if (n < 2) { answer n; } answer fib(n - 1) + fib(n - 2); }
+mission suma(n, total) { if (n == 0) { answer total; } answer suma(n - 1, total + n); }
+show(fib(15), suma(300, 0));
+""",
+    'listas': """
+l = [3, 1];
+l.insert(4);
+l[0] = 9;
+show(l, l.size(), l.pick(2), l + [1], l * 2);
+l.explode(1);
+show(l);
+""",
+    'entrada': """
+input(nombre);
+show("hola " + nombre);
+input(otro);
+show(otro);
+""",
+    'error variable': 'show(1);\nx = y + 1;\nshow(2);',
+    'error division': 'mission f(x) { answer 10 / x; }\nshow(f(2));\nshow(f(0));',
+    'error indice': 'l = [1, 2];\nshow(l.pick(5));',
+    'error tipos': 'show("a" - 1);',
+    'error funcion': 'show(nof(1));',
+}
+
+
+# La VM tiene que mostrar lo mismo que el árbol, también hasta el error
+@pytest.mark.parametrize('name', PROGRAMS)
+@pytest.mark.parametrize('optimize', [True, False])
+def test_vm_matches_tree(name, optimize):
+    code = PROGRAMS[name]
+    assert run(code, 'vm', optimize) == run(code, 'tree', optimize)
@@ -0,0 +1,29 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine):
+    output = io.StringIO()
+    Interpreter(output=output).execute(code, engine)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_missing_parameter_reads_current_global(engine):
+    # f(1) no pasa b: ve la global, que cambia entre las dos llamadas
+    code = """
+mission f(a, b) { answer a + b; }
+b = 1;
+show(f(1));
+b = 5;
+show(f(1));
+show(f(1, 2));
+"""
+    assert run(code, engine) == "2\n6\n3\n"
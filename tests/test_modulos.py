@@ -0,0 +1,61 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+FILES = {
+    'geometria.txt': 'import "util/base.txt";\nmission area(a, b) { answer doble(a * b) / 2; }\nshow("no se ejecuta");\n',
+    'util/base.txt': 'mission doble(x) { answer x * 2; }\nmission tipo(x) { answer "base"; }\n',
+    'otra.txt': 'mission tipo(x) { answer "otra"; }\n',
+    'a.txt': 'import "b.txt";\nmission fa(x) { answer x; }\n',
+    'b.txt': 'import "a.txt";\nmission fb(x) { answer x; }\n',
+    'mal.txt': 'mission rota(x) { answer x +; }\n',
+}
+
+PROGRAMS = {
+    'funciones': 'import "geometria.txt";\nshow(area(3, 4), doble(5), tipo(0));',
+    'ultimo gana': 'import "geometria.txt";\nimport "otra.txt";\nshow(tipo(0));',
+    'el programa gana': 'import "otra.txt";\nmission tipo(x) { answer "programa"; }\nshow(tipo(0));',
+    'ciclo': 'import "a.txt";\nshow(1);',
+    'no existe': 'import "nada.txt";\nshow(1);',
+    'errores de sintaxis': 'import "mal.txt";\nshow(1);',
+}
+
+
+def run(code, engine, directory):
+    output = io.StringIO()
+    interpreter = Interpreter(output=output, check=False)
+    try:
+        program = interpreter.parse(code, directory)
+        if program is not None:
+            interpreter.run(program, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for name, code in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code, encoding='utf-8')
+    return str(tmp_path)
+
+
+# Las funciones importadas (y los errores de import) son las mismas en los tres motores
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_imports_match_across_engines(name, directory):
+    code = PROGRAMS[name]
+    assert run(code, 'vm', directory) == run(code, 'tree', directory) == run(code, 'py', directory)
+
+
+def test_imported_functions(directory):
+    assert run(PROGRAMS['funciones'], 'tree', directory) == "12.0 10 base\n"
+    assert run(PROGRAMS['ultimo gana'], 'tree', directory) == "otra\n"
+    assert run(PROGRAMS['el programa gana'], 'tree', directory) == "programa\n"
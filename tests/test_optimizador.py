@@ -0,0 +1,83 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine, optimize=True):
+    output = io.StringIO()
+    try:
+        Interpreter(output=output, optimize=optimize, check=False).execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_hoisted_temporaries_do_not_clobber_program_names(engine):
+    # l.size() sale del bucle a una variable del optimizador, que no es __inv0
+    code = """
+__inv0 = 5;
+l = [1, 2, 3];
+i = 0;
+while (i < l.size()) { i = i + 1; }
+show(__inv0);
+mission f(n) { __inv0 = 5; k = 0; while (k < n.size()) { k = k + 1; } answer __inv0; }
+show(f(l));
+"""
+    assert run(code, engine) == "5\n5\n"
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+@pytest.mark.parametrize('optimize', [True, False])
+def test_folding_to_non_finite_floats(engine, optimize):
+    # Optimizado, cada línea es una constante: inf, -inf y nan
+    big = ' * '.join(['10000000000.0'] * 32)
+    code = f"show({big});\nshow(0 - {big});\nshow(({big}) - ({big}));"
+    assert run(code, engine, optimize) == "inf\n-inf\nnan\n"
+
+
+PROGRAMS = {
+    'constantes': 'show(2 * 3 + 1, !true, "a" + "b" * 1 == "ab", 7 / 2 - 0.5);',
+    'ramas muertas': """
+if (true) { show("si"); } else { show("no"); }
+while (false) { show("nunca"); }
+if (1 > 2) { show("no"); }
+""",
+    'menos unario': 'x = 4;\nshow(-x, 0 - x, 1 - -x);',
+    'invariantes': """
+l = [1, 2, 3];
+n = 0;
+i = 0;
+while (i < l.size()) { n = n + l.pick(i) * l.size(); i = i + 1; }
+show(n);
+mission f(l, k) { t = 0; while (t < l.size() + k) { t = t + 1; } answer t; }
+show(f(l, 2));
+""",
+    'contados': """
+for (i = 0; i < 5; i = i + 2;) { show(i); }
+show(i);
+for (j = 10; j > 7; j = j - 1;) { j = j; }
+show(j);
+""",
+    'textos': """
+s = "";
+for (i = 0; i < 5; i = i + 1;) { s = s + "ab" + ","; if (i == 2) { s = s + "|"; } }
+show(s, s.size());
+""",
+    'error plegado': 'show(1);\nshow(1 / 0);',
+    'error en invariante': 'l = 5;\ni = 0;\nshow(i);\nwhile (i < l.size()) { i = i + 1; }',
+}
+
+
+# Optimizado o no, cada motor muestra lo mismo, también hasta el error
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_optimized_matches_unoptimized(engine, name):
+    code = PROGRAMS[name]
+    assert run(code, engine) == run(code, engine, optimize=False) == run(code, 'tree', optimize=False)
@@ -0,0 +1,63 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine, optimize=True):
+    output = io.StringIO()
+    try:
+        Interpreter(output=output, optimize=optimize, check=False).execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+PROGRAMS = {
+    'bucle': """
+s = "";
+t = ">";
+i = 0;
+while (i < 6) { s = s + "ab"; if (i % 2 == 0) { t = t + "-"; s = s + "|"; } i = i + 1; }
+show(s, s.size(), t);
+""",
+    'anidados': """
+s = "";
+for (i = 0; i < 3; i = i + 1;) { for (j = 0; j < 2; j = j + 1;) { s = s + "x"; } s = s + ";"; }
+show(s);
+""",
+    'en funcion': """
+mission repetir(x, n) { r = ""; k = 0; while (k < n) { r = r + x; if (k == 2) { answer r; } k = k + 1; } answer r; }
+show(repetir("ab", 2), repetir("c", 5));
+""",
+    'funcion que lee la global': """
+mission largo(x) { answer s.size(); }
+s = "";
+i = 0;
+while (i < 3) { s = s + "ab"; show(largo(0)); i = i + 1; }
+""",
+    'falla a la mitad': """
+s = "a";
+i = 0;
+while (i < 3) { s = s + "b"; if (i == 1) { s = s + "c" + 1; } i = i + 1; }
+""",
+    'falla en funcion': """
+mission f(x) { r = "a"; k = 0; while (k < 3) { r = r + "b" + x; k = k + 1; } answer r; }
+show(f("z"));
+show(f(1));
+""",
+}
+
+
+# Con Rope (optimizado) o sin ella, los tres motores muestran lo mismo
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_string_building_matches_across_engines(name):
+    code = PROGRAMS[name]
+    expected = run(code, 'tree', optimize=False)
+    for engine in ('tree', 'vm', 'py'):
+        assert run(code, engine) == expected
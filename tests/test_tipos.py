@@ -0,0 +1,27 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+# f(0) divide por cero antes de llegar a la línea de zz
+CODE = """mission f(x) { answer 10 / x; }
+show("start");
+y = f(0);
+show(zz);
+"""
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_check_warns_without_stopping(engine):
+    output = io.StringIO()
+    warnings = io.StringIO()
+    interpreter = Interpreter(output=output, warnings=warnings)
+    with pytest.raises(ZeroDivisionError):
+        interpreter.run(interpreter.parse(CODE), engine)
+    assert output.getvalue() == "start\n"
+    assert warnings.getvalue() == "Warning: línea 4: Undefined variable 'zz'\n"
@@ -0,0 +1,72 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine):
+    # Sin el análisis previo (check=False): el error tiene que aparecer al ejecutar
+    output = io.StringIO()
+    try:
+        Interpreter(output=output, check=False).execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+@pytest.mark.parametrize('code, expected', [
+    ('x = "a";\nshow(false && (x - 1));', "Error: unsupported operand type(s) for -: 'str' and 'int'\n"),
+    ('show(true || zz);', "Error: Undefined variable 'zz'\n"),
+    ('x = 3;\nshow(x > 1 && x == 3, x < 1 || false, true && x);', "True False 3\n"),
+])
+def test_logical_operators_evaluate_both_sides(engine, code, expected):
+    assert run(code, engine) == expected
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_repeated_parameter_is_a_syntax_error(engine):
+    # def f(v_x, v_x) no compila en Python: el parser lo rechaza en todos los motores
+    output = run('mission f(x, y, x) { answer x + y; }\nshow(f(1, 2, 3));', engine)
+    assert output == "Syntax error: parámetro 'x' repetido en 'f' on line 1\n3\n"
+
+
+# 32 factores de 1e10: el optimizador pliega el producto a inf, y la resta a nan
+BIG = ' * '.join(['10000000000.0'] * 32)
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm', 'py'])
+def test_non_finite_constants(engine):
+    code = f"big = {BIG};\nshow(big, -big, big - big, ({BIG}) - ({BIG}));"
+    assert run(code, engine) == "inf -inf nan nan\n"
+
+
+PROGRAMS = {
+    'globales y locales': """
+x = 10;
+mission f(y) { z = y + x; answer z; }
+mission g(x) { x = x * 2; answer x; }
+show(f(1), g(3), x);
+""",
+    'parametro que falta': 'y = 7;\nmission f(x, y) { answer y; }\nshow(f(1));',
+    'listas': """
+l = [1, 2];
+m = l.insert(3);
+show(l, m, l.explode(0), l.size());
+for (i = 0; i < l.size(); i = i + 1;) { show(l.pick(i)); }
+""",
+    'error en funcion': 'mission f(x) { answer x + w; }\nshow(1);\nshow(f(1));',
+    'error indice': 'l = [1];\nl[4] = 2;',
+    'error funcion': 'mission f(x) { answer g(x); }\nshow(f(1));',
+}
+
+
+# El motor py tiene que mostrar lo mismo que el árbol, también hasta el error
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_py_matches_tree(name):
+    assert run(PROGRAMS[name], 'py') == run(PROGRAMS[name], 'tree')
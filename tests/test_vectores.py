@@ -0,0 +1,45 @@
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interprete import Interpreter
+
+
+def run(code, engine):
+    output = io.StringIO()
+    try:
+        Interpreter(output=output, check=False).execute(code, engine)
+    except Exception as e:
+        return output.getvalue() + f"Error: {e}\n"
+    return output.getvalue()
+
+
+PROGRAMS = {
+    'elemento a elemento': """
+l = [1, 2, 3];
+show(l * 2, 10 - l, l % 2, l / 2, l > 1, 2 == l);
+""",
+    'reales': 'r = [0.5, 1.5];\nshow(r + 1, r.sum(), r.min(), r.max());',
+    'entre listas': 'l = [1, 2];\nshow(l + [3], l == [1, 2], [1, "a"] * 2);',
+    'pasa a mixta': """
+l = [1, 2];
+m = l;
+l.insert("x");
+m[0] = 1.5;
+show(l, m, l.size(), m.pick(2));
+""",
+    'enteros grandes': 'l = [9223372036854775807];\nshow(l + 1, [99999999999999999999, 1].sum());',
+    'lista vacia': 'l = [1];\nl.explode(0);\nshow(l.sum());\nshow(l.max());',
+    'error elemento': 'show([1, 2] / 0);',
+}
+
+
+# Las listas numéricas se comportan igual en los tres motores
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_numeric_lists_match_across_engines(name):
+    code = PROGRAMS[name]
+    assert run(code, 'vm') == run(code, 'tree') == run(code, 'py')
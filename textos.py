@@ -0,0 +1,52 @@
+# Textos armados por partes. s = s + x con textos de Python copia s entero en
+# cada vuelta de un bucle: armar un texto largo así tarda un tiempo cuadrático
+# en su largo. El optimizador (Optimizer.builders) cambia esos + por Concat
+# cuando el bucle no lee s de ninguna otra forma; Concat arma una Rope, que
+# agrega x sin copiar nada, y al salir del bucle (Materialize en parser.py) la
+# variable vuelve a ser un str, con un solo join. Show, las comparaciones, pick
+# y el resto del programa nunca ven una Rope.
+#
+# Una Rope no se modifica: cada + arma una nueva que apunta a la anterior. Así
+# s = s + a + b, si b falla, deja s como estaba, igual que con textos comunes.
+
+
+class Rope:
+    # left + right, donde left es un str u otra Rope y right un str: una cadena
+    # hacia la izquierda, un nodo por cada parte agregada
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def text(self):
+        parts = []
+        node = self
+        while node.__class__ is Rope:
+            parts.append(node.right)
+            node = node.left
+        parts.append(node)
+        parts.reverse()
+        return ''.join(parts)
+
+
+def concat(left, right):
+    # left + right, con el mismo resultado y los mismos errores que el + común
+    if right.__class__ is str:
+        if left.__class__ is Rope or left.__class__ is str:
+            return Rope(left, right)
+    elif left.__class__ is Rope:
+        left = left.text()
+    return left + right
+
+
+def text(value):
+    return value.text() if value.__class__ is Rope else value
+
+
+def finish(variables):
+    # Las variables que quedaron a mitad de armarse (un error, o un answer dentro
+    # del bucle) vuelven a ser textos
+    for name, value in variables.items():
+        if value.__class__ is Rope:
+            variables[name] = value.text()
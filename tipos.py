@@ -0,0 +1,466 @@
+import operator
+from collections import deque
+from functools import cache
+from itertools import product
+
+from parser import (
+    Number, Boolean, Variable, Local, BinOp, Concat, Assign, FunctionCall, ListOperation, INT_OPERATIONS,
+    CALL_OPERATIONS, DefinedVariable, DefinedLocal, kind_name, walk,
+)
+
+# Análisis estático de tipos, antes de ejecutar. Sigue, para cada variable, qué
+# tipos puede tener (int, float, str, bool, list, dict o none, el valor de una
+# función que no responde nada) y si seguro tiene valor, a través de las asignaciones, las
+# ramas, los bucles (hasta que nada cambie), los parámetros de las funciones (la
+# unión de los argumentos de sus llamadas en el programa) y sus resultados. Sirve
+# para dos cosas:
+#
+# - especializar el árbol (specialize, la última pasada del optimizador): un BinOp
+#   cuyos operandos son seguro enteros pasa a ser IntAdd, IntLess... y una variable
+#   que seguro ya tiene valor deja de verificarlo (ver parser.py); un Concat
+#   sin un operando que seguro sea un texto vuelve a ser el + común (ver textos.py)
+# - avisar antes de ejecutar los errores seguros (check_program): una variable
+#   que se lee sin haberse asignado nunca, una función que no existe o una
+#   operación con tipos que no la admiten (1 + "a"). Solo en el nivel superior y
+#   hasta el primer answer que podría terminar el programa. Son seguros si la
+#   ejecución llega a esa línea: antes puede fallar otra cosa (una división por
+#   cero en una llamada), así que el programa se ejecuta igual.
+#
+# Los tipos de una función salen de las llamadas de este programa; si después se
+# la llama con otros (desde otra entrada del REPL), los nodos especializados
+# siguen calculando lo mismo, porque solo evitan buscar el operador.
+
+INT, FLOAT, STR, BOOL, LIST, DICT, NONE = 'int', 'float', 'str', 'bool', 'list', 'dict', 'none'
+
+ANY = frozenset((INT, FLOAT, STR, BOOL, LIST, DICT, NONE))
+EMPTY = frozenset()
+
+# Valores de ejemplo para calcular el resultado de una operación entre dos tipos
+SAMPLES = {INT: 2, FLOAT: 2.5, STR: 'a', BOOL: True, DICT: {}, NONE: None}
+
+TAGS = {int: INT, float: FLOAT, str: STR, bool: BOOL, dict: DICT, type(None): NONE}
+
+OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '%': operator.mod, '<': operator.lt, '>': operator.gt, '<=': operator.le,
+    '>=': operator.ge, '==': operator.eq, '!=': operator.ne,
+}
+
+INTEGERS = frozenset((INT, BOOL))
+
+TEXT = frozenset((STR,))
+
+# Resultado de los métodos de listas y diccionarios que no dependen de los elementos
+OPERATION_TYPES = {'size': frozenset((INT,)), 'has': frozenset((BOOL,)), 'keys': frozenset((LIST,)),
+                   'map': frozenset((LIST,)), 'filter': frozenset((LIST,))}
+
+# Si una variable tiene valor: seguro, tal vez o seguro que no
+UNDEFINED, MAYBE, DEFINED = 0, 1, 2
+
+
+def type_of(value):
+    # Las listas (list, NumericList, MixedList) no tienen un tipo fijo de elementos
+    tag = TAGS.get(type(value))
+    if tag is not None:
+        return frozenset((tag,))
+    return frozenset((LIST,)) if hasattr(value, '__getitem__') else ANY
+
+
+@cache
+def outcome(op, left, right):
+    # (tipos del resultado, mensaje de error) de op entre un valor de cada tipo
+    if op == '%' and left == STR:
+        # Formato de texto: si falla depende del texto
+        return ANY, None
+    try:
+        value = OPERATORS[op](SAMPLES[left], SAMPLES[right])
+    except TypeError as e:
+        return EMPTY, str(e)
+    return type_of(value), None
+
+
+class TypeInference:
+    # variables, functions: las globales y las funciones que ya existen al ejecutar
+    # (las de las entradas anteriores del REPL)
+    def __init__(self, program, variables=None, functions=()):
+        self.program = program
+        self.known = variables or {}
+        self.known_functions = set(functions) | set(program.functions)
+        self.parameters = {}  # función -> tipos de cada parámetro (None: no se la llama en el programa)
+        self.returns = {name: EMPTY for name in program.functions}
+        self.recording = False
+        self.errors = []       # [(línea, excepción)] de los errores seguros, en orden
+        self.operands = {}     # id(BinOp) -> (nodo, tipos de los operandos en todas las pasadas)
+        self.reads = {}        # id(variable) -> (nodo, si tuvo valor en todas las lecturas)
+        self.concats = {}      # id(Concat) -> (nodo, tipos de la izquierda, tipos de la derecha)
+
+    def run(self):
+        # Analiza cada parte (None es el nivel superior) hasta que los parámetros y
+        # los resultados de las funciones dejan de cambiar; después, una pasada más
+        # que guarda lo que necesitan specialize y check_program
+        functions = self.program.functions
+        # Los parámetros de una función que el programa llama empiezan sin tipos y
+        # crecen con cada llamada analizada; los de una que no llama, cualquiera
+        called = {node.name for root in (*self.program.statements, *functions.values())
+                  for node in walk(root) if isinstance(node, FunctionCall)}
+        self.parameters = {name: (EMPTY,) * len(function.parameters) if name in called else None
+                           for name, function in functions.items()}
+        sites = {name: {} for name in functions}  # función -> {parte que la llama: [argumentos]}
+        callees = {}                              # parte -> funciones que llama
+        # En orden de llegada: quien llama a muchas funciones se vuelve a analizar una
+        # vez después de todas, no después de cada una
+        pending = deque([None, *functions])
+        queued = set(pending)
+
+        def enqueue(unit):
+            if unit not in queued:
+                queued.add(unit)
+                pending.append(unit)
+
+        while pending:
+            unit = pending.popleft()
+            queued.discard(unit)
+            calls, returned = self.unit(unit)
+            if unit is not None and returned != self.returns[unit]:
+                self.returns[unit] = returned
+                for caller in sites[unit]:
+                    enqueue(caller)
+            previous = callees.get(unit, ())
+            callees[unit] = calls.keys()
+            for callee in previous:
+                sites[callee].pop(unit, None)
+            for callee, arguments in calls.items():
+                sites[callee][unit] = arguments
+            for callee in set(previous) | calls.keys():
+                parameters = self.parameter_types(callee, sites[callee])
+                if parameters != self.parameters[callee]:
+                    self.parameters[callee] = parameters
+                    enqueue(callee)
+        self.recording = True
+        for unit in (None, *functions):
+            self.unit(unit)
+        return self
+
+    def parameter_types(self, name, sites):
+        # Unión de los argumentos de todas las llamadas; un argumento que falta
+        # deja el parámetro con la global del mismo nombre, de tipo desconocido
+        count = len(self.program.functions[name].parameters)
+        calls = [arguments for unit_calls in sites.values() for arguments in unit_calls]
+        return tuple(frozenset().union(*(arguments[i] if i < len(arguments) else ANY for arguments in calls))
+                     for i in range(count))
+
+    def unit(self, name):
+        # Devuelve ({función llamada: [tipos de los argumentos de cada llamada]}, tipos del resultado)
+        self.calls = {}
+        self.returned = EMPTY
+        self.function = name
+        self.certain = name is None
+        self.answered = False  # se encontró un answer del nivel superior
+        self.line = None
+        if name is None:
+            env = {}
+            for statement in self.program.statements:
+                self.line = getattr(statement, 'line', None)
+                env = self.statement(statement, env)
+                if env is None:
+                    break
+                # Desde un answer que puede ejecutarse, lo que sigue tal vez no se ejecute
+                if self.answered:
+                    self.certain = False
+            return self.calls, EMPTY
+        function = self.program.functions[name]
+        parameters = self.parameters[name]
+        # Un parámetro puede quedar sin argumento, y una local que se lee antes de
+        # asignarse ve la global del mismo nombre: al empezar, ninguna tiene valor seguro
+        env = {slot: (ANY if parameters is None or slot >= len(parameters) else parameters[slot], MAYBE)
+               for slot in range(len(function.locals))}
+        if self.statement(function.block, env) is not None:
+            self.returned |= {NONE}
+        return self.calls, self.returned
+
+    # Variables
+
+    def key(self, node):
+        return node.slot if isinstance(node, Local) else node.name
+
+    def lookup(self, env, key):
+        entry = env.get(key)
+        if entry is not None:
+            return entry
+        if key in self.known:
+            return type_of(self.known[key]), DEFINED
+        return EMPTY, UNDEFINED
+
+    def join(self, first, second):
+        if first is None:
+            return second
+        if second is None:
+            return first
+        env = {}
+        for key in first.keys() | second.keys():
+            types, state = self.lookup(first, key)
+            other_types, other_state = self.lookup(second, key)
+            env[key] = (types | other_types, state if state == other_state else MAYBE)
+        return env
+
+    def error(self, exception):
+        if self.recording and self.certain:
+            self.errors.append((self.line, exception))
+
+    # Sentencias: devuelven las variables al terminar, o None si no se sigue después
+
+    def statement(self, node, env):
+        return getattr(self, 'statement_' + kind_name(node))(node, env)
+
+    def statement_Assign(self, node, env):
+        target = node.target
+        if isinstance(target, ListOperation):
+            self.expression(target.list_expr, env)
+            self.expression(target.argument, env)
+            self.expression(node.expression, env)
+        else:
+            env[self.key(target)] = (self.expression(node.expression, env), DEFINED)
+        return env
+
+    def statement_Input(self, node, env):
+        # Si la lectura falla, la variable queda como estaba
+        key = self.key(node.target)
+        types, state = self.lookup(env, key)
+        env[key] = (types | {STR}, DEFINED if state == DEFINED else MAYBE)
+        return env
+
+    def statement_Print(self, node, env):
+        for expression in node.expressions:
+            self.expression(expression, env)
+        return env
+
+    def statement_ExpressionStatement(self, node, env):
+        self.expression(node.expression, env)
+        return env
+
+    def statement_ListOperation(self, node, env):
+        self.expression(node, env)
+        return env
+
+    def statement_Materialize(self, node, env):
+        # No cambia el tipo: una Rope es un str a medio armar
+        return env
+
+    def statement_Block(self, node, env):
+        for statement in node.statements:
+            env = self.statement(statement, env)
+            if env is None:
+                return None
+        return env
+
+    def statement_IfElse(self, node, env):
+        self.expression(node.condition, env)
+        certain, self.certain = self.certain, False
+        then = self.statement(node.if_block, dict(env))
+        otherwise = self.statement(node.else_block, dict(env)) if node.else_block else env
+        self.certain = certain
+        return self.join(then, otherwise)
+
+    def statement_WhileLoop(self, node, env):
+        return self.loop(node.condition, [node.block], env)
+
+    def statement_ForLoop(self, node, env):
+        env = self.statement(node.init, env)
+        if env is None:
+            return None
+        return self.loop(node.condition, [node.block, node.update], env)
+
+    # Un bucle contado recorre los mismos valores que el for que era
+    statement_CountedLoop = statement_ForLoop
+
+    def statement_Return(self, node, env):
+        if self.function is not None:
+            self.returned |= self.expression(node.expression, env)
+        else:
+            self.answered = True
+        return None
+
+    def loop(self, condition, body, env):
+        # Las variables al volver a la condición son la unión de todas las vueltas
+        self.expression(condition, env)
+        certain, self.certain = self.certain, False
+        head = env
+        while True:
+            after = dict(head)
+            for statement in body:
+                after = self.statement(statement, after)
+                if after is None:
+                    break
+            joined = self.join(head, after)
+            if joined == head:
+                break
+            head = joined
+            self.expression(condition, head)
+        self.certain = certain
+        if isinstance(condition, (Number, Boolean)) and condition.value:
+            # while (true): solo se sale con answer (o con un error)
+            return None
+        return head
+
+    # Expresiones: devuelven los tipos que puede tener el valor (EMPTY: ninguno,
+    # la expresión no termina o todavía no se sabe)
+
+    def expression(self, node, env):
+        if node is None:
+            return EMPTY
+        return getattr(self, 'expression_' + kind_name(node))(node, env)
+
+    def expression_Number(self, node, env):
+        return type_of(node.value)
+
+    expression_String = expression_Number
+    expression_Boolean = expression_Number
+
+    def expression_Local(self, node, env):
+        types, state = self.lookup(env, node.slot)
+        self.read(node, state)
+        return types
+
+    def expression_Variable(self, node, env):
+        if self.function is not None:
+            # Una global leída desde una función: depende de cuándo se la llame
+            self.read(node, MAYBE)
+            return ANY
+        types, state = self.lookup(env, node.name)
+        self.read(node, state)
+        if state == UNDEFINED:
+            self.error(ValueError(f"Undefined variable '{node.name}'"))
+        return types
+
+    def expression_BinOp(self, node, env):
+        left = self.expression(node.left, env)
+        right = self.expression(node.right, env)
+        if self.recording:
+            _, seen = self.operands.get(id(node), (node, EMPTY))
+            self.operands[id(node)] = (node, seen | left | right)
+            if type(node) is Concat:
+                _, seen_left, seen_right = self.concats.get(id(node), (node, EMPTY, EMPTY))
+                self.concats[id(node)] = (node, seen_left | left, seen_right | right)
+        return self.operation(node.op, left, right)
+
+    expression_Concat = expression_BinOp
+
+    def expression_NotOp(self, node, env):
+        self.expression(node.expression, env)
+        return frozenset((BOOL,))
+
+    def expression_Negate(self, node, env):
+        return self.operation('-', frozenset((INT,)), self.expression(node.expression, env))
+
+    def expression_FunctionCall(self, node, env):
+        # Como al ejecutar: primero se busca la función y después se evalúan los argumentos
+        if node.name not in self.known_functions:
+            self.error(ValueError(f"Undefined function '{node.name}'"))
+            return EMPTY
+        arguments = [self.expression(argument, env) for argument in node.arguments]
+        if node.name not in self.program.functions:
+            return ANY
+        self.calls.setdefault(node.name, []).append(arguments)
+        return self.returns[node.name]
+
+    def expression_List(self, node, env):
+        for element in node.elements:
+            self.expression(element, env)
+        return frozenset((LIST,))
+
+    def expression_Dict(self, node, env):
+        for key, value in zip(node.keys, node.values):
+            self.expression(key, env)
+            self.expression(value, env)
+        return frozenset((DICT,))
+
+    def expression_ListOperation(self, node, env):
+        self.expression(node.list_expr, env)
+        if node.operation in CALL_OPERATIONS:
+            # El argumento es el nombre de la función, que recibe cada elemento
+            name = node.argument.value
+            if name not in self.known_functions:
+                self.error(ValueError(f"Undefined function '{name}'"))
+                return EMPTY
+            if name in self.program.functions:
+                self.calls.setdefault(name, []).append([ANY])
+            return OPERATION_TYPES[node.operation]
+        self.expression(node.argument, env)
+        self.expression(node.value, env)
+        return OPERATION_TYPES.get(node.operation, ANY)
+
+    def read(self, node, state):
+        if self.recording:
+            _, defined = self.reads.get(id(node), (node, True))
+            self.reads[id(node)] = (node, defined and state == DEFINED)
+
+    def operation(self, op, left, right):
+        if op in ('&&', '||'):
+            # El resultado es uno de los operandos
+            return left | right
+        if not left or not right:
+            return EMPTY
+        if LIST in left or LIST in right:
+            # Las operaciones con listas dependen de sus elementos
+            return ANY
+        types = set()
+        messages = []
+        for pair in product(left, right):
+            result, message = outcome(op, *pair)
+            types |= result
+            if message is not None:
+                messages.append(message)
+        if not types and len(messages) == 1:
+            # Un solo tipo de cada lado y no se pueden operar: el mismo error que al ejecutar
+            self.error(TypeError(messages[0]))
+        return frozenset(types)
+
+
+def specialize(program):
+    # Cambia la clase de los nodos que pueden especializarse. Guarda en el programa
+    # los errores seguros, para no volver a analizarlo al ejecutarlo (check_program).
+    inference = TypeInference(program).run()
+    for root in (program.statements, *(function.block for function in program.functions.values())):
+        for chain in concat_chains(root):
+            # Sin un lado que seguro sea un texto, lo más probable es que sume
+            # números: el + común, que también puede especializarse
+            if not any(TEXT in inference.concats.get(id(node), (node,))[1:] for node in chain):
+                for node in chain:
+                    node.__class__ = BinOp
+    for node, types in inference.operands.values():
+        if types and types <= INTEGERS and node.op in INT_OPERATIONS and type(node) is BinOp:
+            node.__class__ = INT_OPERATIONS[node.op]
+    for node, defined in inference.reads.values():
+        if defined and type(node) is Variable:
+            node.__class__ = DefinedVariable
+        elif defined and type(node) is Local:
+            node.__class__ = DefinedLocal
+    program.type_errors = inference.errors
+    return program
+
+
+def concat_chains(root):
+    # Los Concat de cada variable (ver Optimizer.builders), juntos: vuelven a ser +
+    # todos o ninguno, porque un + común no puede recibir una Rope
+    chains = {}
+    for statement in (root if isinstance(root, list) else [root]):
+        for node in walk(statement):
+            if isinstance(node, Assign) and type(node.expression) is Concat:
+                chain = chains.setdefault(node.target.name, [])
+                operation = node.expression
+                while type(operation) is Concat:
+                    chain.append(operation)
+                    operation = operation.left
+    return chains.values()
+
+
+def check_program(program, variables=None, functions=()):
+    # Los errores seguros del programa, en orden y con su línea. variables y
+    # functions son las que ya existen al ejecutarlo.
+    fresh = not variables and set(functions) <= set(program.functions)
+    errors = program.type_errors if fresh else None
+    if errors is None:
+        errors = TypeInference(program, variables, functions).run().errors
+        if fresh:
+            program.type_errors = errors
+    return [error if line is None else type(error)(f"línea {line}: {error}") for line, error in errors]
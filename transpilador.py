@@ -0,0 +1,469 @@
+import functools
+import math
+import re
+
+from parser import (
+    Number, String, Boolean, Variable, Local, ListOperation, Assign, Input, FunctionCall, DefinedVariable,
+    DefinedLocal, CALL_OPERATIONS, counted_values, kind_name, walk,
+)
+from memoizacion import memoized
+from salida import TRACE
+from diccionarios import has_key, keys_of, missing_key, put_key, remove_key
+from paralelo import apply_function
+from textos import Rope, concat
+from vectores import REDUCTIONS, numeric_list, reduce_list
+
+# Traduce el árbol a un módulo de Python y lo ejecuta con compile()/exec(), así
+# los bucles y las llamadas corren como código nativo de CPython.
+#
+# Los nombres del programa se prefijan para no chocar con los de Python ni con
+# los del runtime: la variable x es v_x y la función f es f_f. Las funciones
+# del programa son funciones de Python; sus locales (parámetros y variables
+# asignadas) son locales de Python, y el resto de los nombres son globales del
+# módulo. El programa principal es la función _main, que declara 'global' las
+# variables que asigna.
+#
+# Los nombres que empiezan con '_' son del runtime (ver runtime()):
+#   _write, _read, _trace   salida, entrada y mensajes de depuración del intérprete
+#   _G                      las globales del módulo, para iniciar las locales
+#   _and, _or               && y || evaluando ambos lados, como el árbol
+#   _insert, _explode       insert y explode usados como expresión
+#   _has, _remove, _put,    métodos de diccionario (ver diccionarios.py) y el error
+#   _keys, _missing_key     de una clave que no está
+#   _list, _reduce          literales [..] y sum/min/max (ver vectores.py)
+#   _counted                valores de un bucle contado (CountedLoop en parser.py)
+#   _concat, _Rope          textos armados en un bucle (ver textos.py)
+#   _apply                  map y filter (ver paralelo.py)
+#   _i, _s, _l, _r          temporales de las operaciones de lista
+#   _MISSING                valor por defecto de un parámetro no pasado
+
+# Mensajes de Python para índices inválidos -> método de lista que los produce
+INDEX_ERRORS = (
+    ('assignment index out of range', 'set'),
+    ('pop', 'explode'),
+    ('index out of range', 'get'),
+)
+
+
+class Transpiler:
+    def __init__(self, functions):
+        # Funciones del programa: las llamadas se verifican contra sus parámetros
+        self.functions = functions
+
+    def emit(self, line):
+        self.lines.append('    ' * self.depth + line)
+
+    def transpile_program(self, statements):
+        self.lines = []
+        self.depth = 0
+        # Menor cantidad de argumentos con que se llama a cada función
+        self.fewest = {}
+        for node in [*statements, *self.functions.values()]:
+            for child in walk(node):
+                if isinstance(child, FunctionCall):
+                    count = len(child.arguments)
+                    self.fewest[child.name] = min(count, self.fewest.get(child.name, count))
+                elif isinstance(child, ListOperation) and child.operation in CALL_OPERATIONS:
+                    # map y filter llaman con un argumento
+                    name = child.argument.value
+                    self.fewest[name] = min(1, self.fewest.get(name, 1))
+        self.emit('# Generado por transpilador.py')
+        self.emit('')
+        self.emit('_MISSING = object()  # parámetro que la llamada no pasó')
+        for function in self.functions.values():
+            self.emit('')
+            self.define_function(function)
+        self.emit('')
+        self.main(statements)
+        self.emit('')
+        self.emit("if __name__ == '__main__':")
+        self.emit('    from transpilador import run_module')
+        self.emit('    run_module(globals())')
+        return '\n'.join(self.lines) + '\n'
+
+    def define_function(self, function):
+        # Los parámetros que alguna llamada no pasa quedan como locales sin valor
+        required = min(self.fewest.get(function.name, len(function.parameters)), len(function.parameters))
+        parameters = ['v_' + name for name in function.parameters[:required]]
+        parameters += ['v_' + name + '=_MISSING' for name in function.parameters[required:]]
+        self.emit(f"def f_{function.name}({', '.join(parameters)}):")
+        self.depth += 1
+        for name in function.parameters[required:]:
+            self.emit(f"if v_{name} is _MISSING:")
+            self.emit(f"    if 'v_{name}' in _G: v_{name} = _G['v_{name}']")
+            self.emit(f"    else: del v_{name}")
+        # Una local que se lee antes de asignarse ve la global del mismo nombre
+        for name in function.locals[len(function.parameters):]:
+            self.emit(f"if 'v_{name}' in _G: v_{name} = _G['v_{name}']")
+        self.function = function
+        self.body(function.block.statements)
+        self.depth -= 1
+
+    def main(self, statements):
+        self.emit('def _main():')
+        self.depth += 1
+        assigned = []
+        for statement in statements:
+            for node in walk(statement):
+                if isinstance(node, (Assign, Input)) and isinstance(node.target, Variable):
+                    if node.target.name not in assigned:
+                        assigned.append(node.target.name)
+        if assigned:
+            self.emit('global ' + ', '.join('v_' + name for name in assigned))
+        self.function = None
+        self.body(statements)
+        self.depth -= 1
+
+    def body(self, statements):
+        # Los índices inválidos se reportan con el mensaje del árbol. En 3.11 el
+        # try no cuesta nada mientras no haya excepción.
+        uses_lists = any(isinstance(node, ListOperation)
+                         for statement in statements for node in walk(statement))
+        if not uses_lists:
+            self.block(statements)
+            return
+        self.emit('_i = _s = None')
+        self.emit('try:')
+        self.depth += 1
+        self.block(statements)
+        self.depth -= 1
+        self.emit('except IndexError as _e:')
+        self.emit('    raise _index_error(_e, _i, _s) from None')
+        # Solo pick() de un diccionario llega acá con KeyError: put y remove ya
+        # traducen el suyo
+        self.emit('except KeyError as _e:')
+        self.emit("    raise _missing_key('get', _e.args[0]) from None")
+
+    def block(self, statements):
+        before = len(self.lines)
+        for statement in statements:
+            self.statement(statement)
+        if len(self.lines) == before:
+            self.emit('pass')
+
+    # Sentencias
+
+    def statement(self, node):
+        if node is None:
+            return
+        method = getattr(self, 'statement_' + type(node).__name__, None)
+        if method is None:
+            raise ValueError(f"El transpilador no soporta la sentencia '{type(node).__name__}'")
+        method(node)
+
+    def variable(self, node):
+        if isinstance(node, Variable) and self.function is not None:
+            raise ValueError(f"La variable global '{node.name}' no puede asignarse dentro de una función")
+        return 'v_' + node.name
+
+    def statement_ExpressionStatement(self, node):
+        expression = node.expression
+        # insert y explode como sentencia no necesitan devolver la lista
+        if isinstance(expression, ListOperation) and expression.operation == 'insert':
+            self.emit(f"_l = {self.expression(expression.list_expr)}")
+            self.emit(f"_l.append({self.expression(expression.argument)})")
+            self.emit('if _trace: _trace(f"Elemento insertado: {_l[-1]}")')
+        elif isinstance(expression, ListOperation) and expression.operation == 'explode':
+            self.emit(f"_l = {self.expression(expression.list_expr)}")
+            self.emit(f"_r = _l.pop((_i := {self.expression(expression.argument)}))")
+            self.emit('if _trace: _trace(f"Elemento removido en posición {_i}: {_r}")')
+        else:
+            self.emit(self.expression(expression))
+
+    def statement_Assign(self, node):
+        target = node.target
+        if isinstance(target, (Variable, Local)):
+            self.emit(f"{self.variable(target)} = {self.expression(node.expression)}")
+        elif isinstance(target, ListOperation) and target.operation == 'set':
+            # Mismo orden que el árbol: lista, índice y después el valor
+            self.emit(f"_l = {self.expression(target.list_expr)}")
+            self.emit(f"_s = {self.expression(target.argument)}")
+            self.emit(f"_l[_s] = {self.expression(node.expression)}")
+            self.emit('if _trace: _trace(f"Elemento en posición {_s} actualizado a: {_l[_s]}")')
+        else:
+            raise ValueError("Invalid assignment target")
+
+    def statement_Print(self, node):
+        self.emit(f"_write({', '.join(self.expression(expression) for expression in node.expressions)})")
+
+    def statement_Input(self, node):
+        if not isinstance(node.target, (Variable, Local)):
+            raise ValueError("input() solo admite variables como destino")
+        name = self.variable(node.target)
+        self.emit('try:')
+        self.emit(f"    {name} = _read()")
+        self.emit(f'    if _trace: _trace(f"Asignado: {node.target.name} = {{{name}}}")')
+        self.emit('except Exception as _e:')
+        self.emit('    _write(f"Error al leer la entrada: {_e}")')
+
+    def statement_Block(self, node):
+        for statement in node.statements:
+            self.statement(statement)
+
+    def statement_Materialize(self, node):
+        # Si el bucle no dio vueltas la variable puede no existir todavía
+        for target in node.targets:
+            name = self.variable(target)
+            self.emit('try:')
+            self.emit(f"    if {name}.__class__ is _Rope: {name} = {name}.text()")
+            self.emit('except NameError:')
+            self.emit('    pass')
+
+    def statement_IfElse(self, node):
+        self.emit(f"if {self.expression(node.condition)}:")
+        self.indented(node.if_block)
+        if node.else_block:
+            self.emit('else:')
+            self.indented(node.else_block)
+
+    def statement_WhileLoop(self, node):
+        self.emit(f"while {self.expression(node.condition)}:")
+        self.indented(node.block)
+
+    def statement_ForLoop(self, node):
+        self.statement(node.init)
+        self.emit(f"while {self.expression(node.condition)}:")
+        self.depth += 1
+        self.statement(node.block)
+        self.statement(node.update)
+        self.depth -= 1
+
+    def statement_CountedLoop(self, node):
+        # Un for de Python sobre un range; después, como en el bucle común, la
+        # variable termina con el primer valor que no cumple la condición
+        self.statement(node.init)
+        variable = self.variable(node.condition.left)
+        stop = self.expression(node.condition.right)
+        self.emit(f"for {variable} in _counted({variable}, {stop}, {node.step}, {node.condition.op!r}):")
+        self.indented(node.block)
+        self.emit(f"if {self.expression(node.condition)}:")
+        self.indented(node.update)
+
+    def statement_Return(self, node):
+        # Un 'answer' fuera de una función termina el programa sin evaluar su expresión
+        if self.function is None:
+            self.emit('return')
+        else:
+            self.emit(f"return {self.expression(node.expression)}")
+
+    def indented(self, statement):
+        self.depth += 1
+        before = len(self.lines)
+        self.statement(statement)
+        if len(self.lines) == before:
+            self.emit('pass')
+        self.depth -= 1
+
+    # Expresiones: devuelven el código de Python, siempre entre paréntesis
+
+    def expression(self, node):
+        method = getattr(self, 'expression_' + kind_name(node), None)
+        if method is None:
+            raise ValueError(f"El transpilador no soporta la expresión '{type(node).__name__}'")
+        return method(node)
+
+    def expression_Number(self, node):
+        value = node.value
+        if type(value) is float and not math.isfinite(value):
+            # repr da inf o nan (el optimizador pliega 1e308 * 10), que en Python
+            # serían nombres de variables
+            return f"(float('{value!r}'))"
+        return f"({value!r})"
+
+    def expression_String(self, node):
+        return f"({node.value!r})"
+
+    expression_Boolean = expression_String
+
+    def expression_Variable(self, node):
+        return 'v_' + node.name
+
+    expression_Local = expression_Variable
+
+    def expression_BinOp(self, node):
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        if node.op in ('&&', '||'):
+            # El árbol evalúa ambos lados; si el derecho no puede fallar ni tener
+            # efectos, cortocircuitar da el mismo resultado
+            if not safe(node.right):
+                return f"{'_and' if node.op == '&&' else '_or'}({left}, {right})"
+            return f"({left} {'and' if node.op == '&&' else 'or'} {right})"
+        if node.op not in ('+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!='):
+            raise ValueError(f"Operador desconocido '{node.op}'")
+        return f"({left} {node.op} {right})"
+
+    def expression_Concat(self, node):
+        return f"_concat({self.expression(node.left)}, {self.expression(node.right)})"
+
+    def expression_NotOp(self, node):
+        return f"(not {self.expression(node.expression)})"
+
+    def expression_Negate(self, node):
+        return f"(0 - {self.expression(node.expression)})"
+
+    def expression_List(self, node):
+        return f"_list([{', '.join(self.expression(element) for element in node.elements)}])"
+
+    def expression_Dict(self, node):
+        # Un dict de Python evalúa cada clave y después su valor, como el árbol
+        entries = ', '.join(f"{self.expression(key)}: {self.expression(value)}"
+                            for key, value in zip(node.keys, node.values))
+        return f"{{{entries}}}"
+
+    def expression_ListOperation(self, node):
+        list_val = self.expression(node.list_expr)
+        if node.operation == 'size':
+            return f"len({list_val})"
+        if node.operation in REDUCTIONS:
+            return f"_reduce({node.operation!r}, {list_val})"
+        if node.operation == 'keys':
+            return f"_keys({list_val})"
+        if node.operation in CALL_OPERATIONS:
+            name = node.argument.value
+            return f"_apply({node.operation!r}, {name!r}, {list_val}, f_{name})"
+        if node.operation == 'put':
+            return f"_put({list_val}, {self.expression(node.argument)}, {self.expression(node.value)})"
+        if node.operation not in ('get', 'insert', 'explode', 'has', 'remove'):
+            raise ValueError(f"Método de lista desconocido '{node.operation}'")
+        if node.argument is None:
+            raise ValueError(f"{node.operation}() requiere un argumento")
+        argument = self.expression(node.argument)
+        if node.operation == 'get':
+            return f"{list_val}[(_i := {argument})]"
+        if node.operation == 'insert':
+            return f"_insert({list_val}, {argument})"
+        if node.operation == 'has':
+            return f"_has({list_val}, {argument})"
+        if node.operation == 'remove':
+            return f"_remove({list_val}, {argument})"
+        return f"_explode({list_val}, (_i := {argument}))"
+
+    def expression_FunctionCall(self, node):
+        function = self.functions.get(node.name)
+        arguments = ', '.join(self.expression(argument) for argument in node.arguments)
+        if function is not None and len(node.arguments) > len(function.parameters):
+            # Los argumentos de más se evalúan y se descartan
+            return f"f_{node.name}(*({arguments},)[:{len(function.parameters)}])"
+        return f"f_{node.name}({arguments})"
+
+
+def safe(node):
+    # Un literal o una variable que seguro tiene valor (ver tipos.py): evaluarla o
+    # no da igual. Cualquier operación puede fallar con otros tipos (x - 1 con un
+    # texto) y cualquier otra variable puede no estar definida.
+    return isinstance(node, (Number, String, Boolean, DefinedVariable, DefinedLocal))
+
+
+def transpile_program(statements, functions):
+    return Transpiler(functions).transpile_program(statements)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_module(source):
+    return compile(source, '<programa>', 'exec')
+
+
+def runtime(interpreter, namespace):
+    trace = interpreter.trace if interpreter.verbose >= TRACE else None
+
+    def insert(list_val, value):
+        list_val.append(value)
+        if trace:
+            trace(f"Elemento insertado: {value}")
+        return list_val
+
+    def explode(list_val, index):
+        removed_element = list_val.pop(index)
+        if trace:
+            trace(f"Elemento removido en posición {index}: {removed_element}")
+        return list_val
+
+    def remove(collection, key):
+        removed_element = remove_key(collection, key)
+        if trace:
+            trace(f"Elemento removido en {key!r}: {removed_element}")
+        return collection
+
+    def put(collection, key, value):
+        put_key(collection, key, value)
+        if trace:
+            trace(f"Elemento en {key!r} actualizado a: {value}")
+        return collection
+
+    return {
+        '_write': interpreter.write, '_read': interpreter.read_line, '_trace': trace,
+        '_G': namespace, '_and': lambda left, right: left and right,
+        '_or': lambda left, right: left or right,
+        '_insert': insert, '_explode': explode, '_index_error': index_error,
+        '_list': numeric_list, '_reduce': reduce_list, '_counted': counted_values,
+        '_has': has_key, '_remove': remove, '_put': put, '_keys': keys_of, '_missing_key': missing_key,
+        '_concat': concat, '_Rope': Rope,
+        '_apply': lambda operation, name, collection, function:
+            apply_function(interpreter, operation, name, collection, 'py', function),
+    }
+
+
+def index_error(error, index, set_index):
+    message = str(error)
+    for text, operation in INDEX_ERRORS:
+        if text in message:
+            return IndexError(f"{operation}(): Índice {set_index if operation == 'set' else index} fuera de rango")
+    return error  # ya viene traducido de otra función
+
+
+def name_error(error):
+    # NameError trae el nombre; UnboundLocalError solo lo menciona en el mensaje
+    name = error.name or re.search(r"'(\w+)'", str(error)).group(1)
+    if name.startswith('f_'):
+        return ValueError(f"Undefined function '{name[2:]}'")
+    return ValueError(f"Undefined variable '{name[2:]}'")
+
+
+def run(source, interpreter):
+    namespace = load(source, interpreter)
+    try:
+        namespace['_main']()
+    except NameError as e:
+        raise name_error(e) from None
+    finally:
+        # Las variables globales quedan visibles para el resto del intérprete
+        for name, value in namespace.items():
+            if name.startswith('v_'):
+                interpreter.variables[name[2:]] = value
+
+
+def load(source, interpreter):
+    # El módulo listo para ejecutar, con el runtime y lo que ya tiene el intérprete
+    namespace = {'__name__': '<programa>'}
+    exec(compile_module(source), namespace)
+    namespace.update(runtime(interpreter, namespace))
+    for name, value in interpreter.variables.items():
+        namespace['v_' + name] = value
+    # Funciones de ejecuciones anteriores del intérprete, que este módulo no define
+    for name, function in interpreter.functions.items():
+        if 'f_' + name not in namespace:
+            namespace['f_' + name] = functools.partial(call_tree_function, function, interpreter)
+    # Las funciones puras pasan por su caché; las llamadas recursivas también,
+    # porque buscan la función en las globales del módulo
+    for name, cache in interpreter.memo.items():
+        if 'f_' + name in namespace:
+            namespace['f_' + name] = memoized(namespace['f_' + name], cache)
+    return namespace
+
+
+def call_tree_function(function, interpreter, *args):
+    return function.execute(interpreter, list(args))
+
+
+def run_module(namespace):
+    # Ejecuta un módulo generado como script: python programa.py
+    from interprete import Interpreter
+    interpreter = Interpreter()
+    namespace.update(runtime(interpreter, namespace))
+    try:
+        namespace['_main']()
+    except NameError as e:
+        raise name_error(e) from None
+    finally:
+        interpreter.sink.flush()
@@ -0,0 +1,210 @@
+import operator
+from array import array
+from itertools import repeat
+
+# Listas numéricas homogéneas. Un literal [..] cuyos elementos son todos enteros
+# (o todos reales) se guarda en un array de C en lugar de una lista de objetos,
+# y las operaciones en bloque se hacen con una sola llamada nativa, sin pasar
+# por el intérprete en cada elemento:
+#
+# - lista + - * / % escalar (y escalar + - * / % lista): una lista nueva
+# - lista < > <= >= == != escalar: una lista de booleanos
+# - lista.sum(), lista.min(), lista.max()
+#
+# Con listas de tipos mezclados todo se comporta como siempre: + concatena,
+# * repite, == compara listas enteras. Entre dos listas también (lista + lista
+# concatena aunque ambas sean numéricas). Si una lista numérica recibe un
+# valor de otro tipo (insert o lista[i] = x) pasa a ser una MixedList, que
+# guarda los elementos en una lista común, sin dejar de ser el mismo objeto
+# para las demás variables que la referencian.
+
+INT = 'q'    # enteros de 64 bits; los que no entran quedan en una lista común
+FLOAT = 'd'
+
+ELEMENT_TYPES = {INT: int, FLOAT: float}
+
+REDUCTIONS = {'sum': sum, 'min': min, 'max': max}
+
+COMPARISONS = (operator.lt, operator.gt, operator.le, operator.ge, operator.eq, operator.ne)
+
+
+def numeric_list(values):
+    # Representación para los valores de una lista nueva: una NumericList si son
+    # todos enteros o todos reales (true y false no cuentan como números)
+    types = set(map(type, values))
+    if types == {int}:
+        try:
+            return NumericList(INT, values)
+        except OverflowError:
+            return values
+    if types == {float}:
+        return NumericList(FLOAT, values)
+    return values
+
+
+def reduce_list(operation, values):
+    if type(values) is MixedList:
+        values = values.values
+    if operation != 'sum' and not values:
+        raise ValueError(f"{operation}(): la lista está vacía")
+    return REDUCTIONS[operation](values)
+
+
+def plain(value):
+    # Los elementos de una lista numérica como lista común; cualquier otro valor, igual
+    if type(value) is NumericList:
+        return value.tolist()
+    if type(value) is MixedList:
+        return value.values
+    return value
+
+
+def scalar(value):
+    return type(value) is int or type(value) is float
+
+
+class NumericList(array):
+    # Leer (pick, size, explode, recorrer) es lo del array, sin pasar por Python;
+    # guardar verifica el tipo, porque el array convertiría 1 en 1.0 sin avisar
+    __slots__ = ('values',)
+
+    def __setitem__(self, index, value):
+        if type(value) is ELEMENT_TYPES[self.typecode]:
+            try:
+                array.__setitem__(self, index, value)
+                return
+            except OverflowError:
+                pass
+        self.mix()[index] = value
+
+    def append(self, value):
+        if type(value) is ELEMENT_TYPES[self.typecode]:
+            try:
+                array.append(self, value)
+                return
+            except OverflowError:
+                pass
+        self.mix().append(value)
+
+    def mix(self):
+        # Un valor de otro tipo (o un entero de más de 64 bits): desde ahora los
+        # elementos van en una lista común
+        self.values = self.tolist()
+        array.__delitem__(self, slice(None))
+        self.__class__ = MixedList
+        return self.values
+
+    def __str__(self):
+        return str(plain(self))
+
+    __repr__ = __str__
+
+    # Operaciones elemento a elemento con un escalar; con cualquier otra cosa, las
+    # de una lista común
+
+    def elementwise(self, function, other, reflected=False):
+        if type(self) is MixedList or not scalar(other):
+            result = function(other, plain(self)) if reflected else function(plain(self), plain(other))
+            return numeric_list(result) if type(result) is list else result
+        if reflected:
+            values = map(function, repeat(other), self)
+        else:
+            values = map(function, self, repeat(other))
+        if function in COMPARISONS:
+            return list(values)
+        if self.typecode == INT and type(other) is int and function is not operator.truediv:
+            values = list(values)
+            try:
+                return NumericList(INT, values)
+            except OverflowError:
+                # Algún resultado no entra en 64 bits
+                return values
+        return NumericList(FLOAT, values)
+
+    def __add__(self, other):
+        return self.elementwise(operator.add, other)
+
+    def __radd__(self, other):
+        return self.elementwise(operator.add, other, True)
+
+    def __sub__(self, other):
+        return self.elementwise(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self.elementwise(operator.sub, other, True)
+
+    def __mul__(self, other):
+        return self.elementwise(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self.elementwise(operator.mul, other, True)
+
+    def __truediv__(self, other):
+        return self.elementwise(operator.truediv, other)
+
+    def __rtruediv__(self, other):
+        return self.elementwise(operator.truediv, other, True)
+
+    def __mod__(self, other):
+        return self.elementwise(operator.mod, other)
+
+    def __rmod__(self, other):
+        return self.elementwise(operator.mod, other, True)
+
+    # Python prueba la comparación reflejada cuando el escalar está a la izquierda
+    # (3 < lista llama a lista > 3)
+
+    def __lt__(self, other):
+        return self.elementwise(operator.lt, other)
+
+    def __gt__(self, other):
+        return self.elementwise(operator.gt, other)
+
+    def __le__(self, other):
+        return self.elementwise(operator.le, other)
+
+    def __ge__(self, other):
+        return self.elementwise(operator.ge, other)
+
+    def __eq__(self, other):
+        return self.elementwise(operator.eq, other)
+
+    def __ne__(self, other):
+        return self.elementwise(operator.ne, other)
+
+    __hash__ = None
+
+
+class MixedList(NumericList):
+    # Una NumericList que recibió un valor de otro tipo: el array queda vacío y los
+    # elementos están en self.values
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __setitem__(self, index, value):
+        self.values[index] = value
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def append(self, value):
+        self.values.append(value)
+
+    def pop(self, index):
+        return self.values.pop(index)
+
+    def __reduce_ex__(self, protocol):
+        # pickle (ver paralelo.py): el array está vacío, los elementos van aparte
+        return (mixed_list, (self.typecode, self.values))
+
+
+def mixed_list(typecode, values):
+    result = NumericList(typecode)
+    result.values = values
+    result.__class__ = MixedList
+    return result